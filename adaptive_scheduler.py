@@ -0,0 +1,94 @@
+"""
+적응형 수집 주기 모듈 - 소스별 새 기사 발생률에 맞춘 상주 모드 스케줄러
+
+소스마다 새 기사가 발견된 시각으로 지수 감쇠 발생률(기사/초)을 추정하고,
+한 번 확인할 때 기대 새 기사 수가 target_articles_per_poll이 되도록 주기를 정합니다.
+속보가 몰리면 주기가 짧아지고 조용한 시간에는 길어지며, 주기는 항상
+지터를 더한 뒤 [min_interval, max_interval] 안으로 맞춥니다.
+수집 오류가 나면 직전 주기에서 두 배씩 늘립니다 (최대 max_interval).
+"""
+
+import math
+import random
+import time
+from collections import deque
+
+MAX_ARRIVALS = 200
+
+
+class SourceSchedule:
+    """소스 1개의 발견 이력과 다음 확인 시각"""
+
+    def __init__(self, name, next_due):
+        self.name = name
+        self.next_due = next_due
+        self.interval = 0.0
+        self.errors = 0
+        self.arrivals = deque(maxlen=MAX_ARRIVALS)
+
+
+class AdaptiveScheduler:
+    """소스별 적응형 확인 주기"""
+
+    def __init__(self, source_names, adaptive_config=None, default_interval_minutes=30):
+        adaptive_config = adaptive_config or {}
+        self.min_interval = adaptive_config.get('min_interval_minutes', 5) * 60
+        self.max_interval = adaptive_config.get(
+            'max_interval_minutes', max(default_interval_minutes, 60)
+        ) * 60
+        self.target_articles = adaptive_config.get('target_articles_per_poll', 1)
+        self.half_life = adaptive_config.get('half_life_minutes', 60) * 60
+        self.jitter = adaptive_config.get('jitter', 0.1)
+
+        # 시작 직후 모든 소스를 1회 확인
+        now = time.time()
+        self.sources = {name: SourceSchedule(name, now) for name in source_names}
+
+    def seed(self, arrivals):
+        """저장된 처리 시각으로 발생률 초기화 (arrivals: (소스 이름, epoch 초) 순회)"""
+        cutoff = time.time() - 8 * self.half_life
+        history = {}
+        for name, timestamp in arrivals:
+            if name in self.sources and timestamp and timestamp >= cutoff:
+                history.setdefault(name, []).append(timestamp)
+        for name, timestamps in history.items():
+            self.sources[name].arrivals.extend(sorted(timestamps)[-MAX_ARRIVALS:])
+
+    def rate(self, name, now=None):
+        """지수 감쇠 발생률 (기사/초)"""
+        now = now or time.time()
+        tau = self.half_life / math.log(2)
+        return sum(math.exp(-(now - t) / tau) for t in self.sources[name].arrivals) / tau
+
+    def due_sources(self, now=None):
+        """지금 확인할 소스 이름 목록"""
+        now = now or time.time()
+        return [name for name, schedule in self.sources.items() if schedule.next_due <= now]
+
+    def seconds_until_next(self, now=None):
+        now = now or time.time()
+        return max(0.0, min(schedule.next_due for schedule in self.sources.values()) - now)
+
+    def record(self, name, status, new_articles=0, now=None):
+        """확인 결과 반영 후 다음 확인 시각 결정 (status: ok / not_modified / error), 주기(초) 반환"""
+        now = now or time.time()
+        schedule = self.sources[name]
+
+        if status == 'error':
+            # 직전 주기에서 두 배로 (조용해서 주기가 긴 소스가 오류로 더 자주 확인되지 않도록)
+            schedule.errors += 1
+            interval = max(schedule.interval, self.min_interval) * 2
+        else:
+            schedule.errors = 0
+            schedule.arrivals.extend([now] * new_articles)
+            rate = self.rate(name, now)
+            interval = self.target_articles / rate if rate > 0 else self.max_interval
+
+        # 지터 뒤에 범위를 맞춰 min_interval보다 자주 확인하지 않음
+        if self.jitter:
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        interval = min(self.max_interval, max(self.min_interval, interval))
+
+        schedule.interval = interval
+        schedule.next_due = now + interval
+        return interval
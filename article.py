@@ -0,0 +1,152 @@
+"""
+기사 레코드 모듈 - 수집부터 중복 제거·전송까지 파이프라인을 지나는 기사 정보
+
+Article은 __slots__ 클래스라 기사마다 dict를 두는 것보다 메모리를 적게 쓰고 (대량 처리·재실행),
+게재 시각 문자열(published_time)은 만들 때 한 번만 파싱해 epoch 초(published_at)로 가집니다.
+기존 코드와 같이 article['title'], article.get('lead') 형태로 읽고 쓸 수 있어
+파이프라인은 Article과 일반 dict를 똑같이 다룹니다.
+
+게재 시각 파서는 문자열 모양을 보고 형식 하나만 골라 파싱하며 (여러 strptime 형식을 차례로 시도하지 않음),
+같은 문자열은 캐시된 결과를 씁니다. 시간대가 없는 시각은 한국 표준시로 봅니다.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+KST = timezone(timedelta(hours=9), 'KST')
+
+# 연도·날짜가 빠진 시각을 현재보다 이만큼 뒤까지는 그대로 두고, 더 뒤면 전년·전날로 봄
+MAX_FUTURE_SKEW = timedelta(hours=1)
+
+# [YYYY-]MM-DD HH:MM[:SS], HH:MM[:SS] (구분자 - . /, 연합뉴스 목록의 "08-09 10:30" 형식 포함)
+NUMERIC_PATTERN = re.compile(
+    r'(?:(?:(\d{4})\s*[-./]\s*)?(\d{1,2})\s*[-./]\s*(\d{1,2})\.?\s+)?(\d{1,2}):(\d{2})(?::(\d{2}))?'
+)
+
+# 연도·날짜가 빠진 시각의 임시 날짜 (2월 29일도 만들 수 있도록 윤년)
+_PLACEHOLDER_YEAR = 2000
+
+_MISSING_NONE, _MISSING_YEAR, _MISSING_DATE = 0, 1, 2
+
+
+@lru_cache(maxsize=4096)
+def _sniff(text):
+    """문자열 모양으로 형식을 골라 파싱: (시간대 있는 datetime, 빠진 부분) 또는 None"""
+    match = NUMERIC_PATTERN.fullmatch(text)
+    try:
+        if match:
+            year, month, day, hour, minute, second = match.groups()
+            missing = _MISSING_NONE if year else (_MISSING_YEAR if month else _MISSING_DATE)
+            return datetime(
+                int(year or _PLACEHOLDER_YEAR), int(month or 1), int(day or 1),
+                int(hour), int(minute), int(second or 0), tzinfo=KST
+            ), missing
+
+        if text[0].isalpha():
+            # RFC 2822 (Fri, 09 Aug 2024 10:30:00 +0900)
+            dt = parsedate_to_datetime(text)
+        else:
+            # ISO 8601 (2024-08-09T10:30:00Z, 2024-08-09T10:30:00+09:00)
+            dt = datetime.fromisoformat(text[:-1] + '+00:00' if text.endswith('Z') else text)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+    return (dt if dt.tzinfo else dt.replace(tzinfo=KST)), _MISSING_NONE
+
+
+def parse_datetime(text, now=None):
+    """게재 시각 문자열 → 시간대 있는 datetime (파싱할 수 없으면 None)
+
+    연도가 없으면 now(기본: 현재 한국 시각) 기준 가장 최근 연도, 날짜가 없으면 오늘(미래면 어제)로 봅니다.
+    """
+    if not text:
+        return None
+    parsed = _sniff(text.strip())
+    if parsed is None:
+        return None
+
+    dt, missing = parsed
+    if missing == _MISSING_NONE:
+        return dt
+
+    now = now or datetime.now(KST)
+    if missing == _MISSING_DATE:
+        dt = dt.replace(year=now.year, month=now.month, day=now.day)
+        return dt - timedelta(days=1) if dt - now > MAX_FUTURE_SKEW else dt
+
+    for year in range(now.year, now.year - 8, -1):
+        try:
+            candidate = dt.replace(year=year)
+        except ValueError:
+            # 2월 29일은 윤년까지 거슬러 올라감
+            continue
+        if candidate - now <= MAX_FUTURE_SKEW:
+            return candidate
+    return None
+
+
+def parse_timestamp(text, now=None):
+    """게재 시각 문자열 → epoch 초 (파싱할 수 없으면 None)"""
+    dt = parse_datetime(text, now)
+    return dt.timestamp() if dt else None
+
+
+def newest_first(article):
+    """게재 시각 최신순 정렬 키 (시각을 모르는 기사는 뒤로, Article과 dict 모두 가능)"""
+    published_at = article.get('published_at')
+    return (published_at is None, -(published_at or 0))
+
+
+class Article:
+    """헤드라인 기사 한 건 (dict처럼 article['title'], article.get('lead')로 접근 가능)"""
+
+    FIELDS = ('title', 'link', 'published_time', 'published_at', 'source', 'source_id',
+              'lead', 'hash', 'subscribers')
+    __slots__ = FIELDS
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, title, link, published_time='', source='연합뉴스', source_id=None,
+                 published_at=None, lead=None, now=None):
+        """now: 연도·날짜가 빠진 게재 시각의 기준 시각 (기본 현재, 재실행은 페이지 저장 시각)"""
+        self.title = title
+        self.link = link
+        self.published_time = published_time
+        self.published_at = parse_timestamp(published_time, now) if published_at is None else published_at
+        self.source = source
+        self.source_id = source_id
+        self.lead = lead
+        self.hash = None
+        self.subscribers = None
+
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._FIELD_SET and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in self._FIELD_SET else None
+        return default if value is None else value
+
+    def to_dict(self):
+        """값이 있는 항목만 dict로 (JSON 기록용)"""
+        return {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
+
+    def __eq__(self, other):
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Article({self.title!r}, {self.link!r}, published_time={self.published_time!r})"
@@ -0,0 +1,166 @@
+"""
+기사 본문 보강 모듈 - 새 기사 페이지에서 리드 문단 추출
+
+기사 페이지는 스레드 풀에서 동시 수집(동시 요청 수 제한)하며, 헤드라인 수집기(SourceFetcher)를
+거쳐 같은 호스트별 동시 요청 제한·회로 차단기·응답 캐시를 공유합니다.
+CPU 부담이 큰 trafilatura 추출은 프로세스 풀에서 실행합니다.
+결과는 URL 기준 TTL 캐시에 보관해 재시도나 여러 채팅 전송 시 다시 수집하지 않습니다.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import requests
+from fetch_policy import CircuitOpenError
+from utils import clean_text, truncate_text
+
+DEFAULT_LEAD_LENGTH = 200
+MIN_PARAGRAPH_LENGTH = 20  # 소제목, 사진 설명 등 짧은 줄은 건너뜀
+
+# 수집 스레드·SQLite 연결이 있는 프로세스를 fork하지 않도록 새 인터프리터로 시작 (sharding과 같음)
+_context = multiprocessing.get_context('spawn')
+
+
+def extract_lead(content, max_length=DEFAULT_LEAD_LENGTH):
+    """기사 HTML에서 첫 문단 추출 (프로세스 풀에서 실행)"""
+    import trafilatura
+
+    text = trafilatura.extract(content, include_comments=False, include_tables=False)
+    if not text:
+        return None
+
+    for paragraph in text.split('\n'):
+        paragraph = clean_text(paragraph)
+        if len(paragraph) >= MIN_PARAGRAPH_LENGTH:
+            return truncate_text(paragraph, max_length)
+    return None
+
+
+class TTLCache:
+    """URL 기준 TTL 캐시 (최대 개수 초과 시 오래된 항목부터 제거)"""
+
+    def __init__(self, ttl_seconds, max_entries=1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(찾음 여부, 값) 반환"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ArticleEnricher:
+    """새 기사에 리드 문단(lead) 추가"""
+
+    def __init__(self, enrichment_config, fetcher):
+        self.enabled = enrichment_config.get('enabled', False)
+        self.max_concurrency = enrichment_config.get('max_concurrency', 4)
+        self.process_workers = enrichment_config.get('process_workers', 2)
+        self.timeout = enrichment_config.get('timeout', 10)
+        self.lead_max_length = enrichment_config.get('lead_max_length', DEFAULT_LEAD_LENGTH)
+        self.cache = TTLCache(
+            enrichment_config.get('cache_ttl_minutes', 360) * 60,
+            enrichment_config.get('cache_max_entries', 1000)
+        )
+        self.fetcher = fetcher
+        self.article_ttl = enrichment_config.get('page_cache_ttl_minutes', 1440) * 60
+        self.logger = logging.getLogger(__name__)
+
+        self._fetch_pool = None
+        self._extract_pool = None
+
+    def _pools(self):
+        """풀은 처음 사용할 때 생성"""
+        if self._fetch_pool is None:
+            self._fetch_pool = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                  thread_name_prefix='article-fetch')
+        if self._extract_pool is None and self.process_workers > 0:
+            try:
+                self._extract_pool = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=_context)
+            except (OSError, NotImplementedError) as e:
+                self.logger.warning(f"프로세스 풀 생성 실패, 본문 추출을 현재 프로세스에서 실행: {e}")
+                self.process_workers = 0
+        return self._fetch_pool, self._extract_pool
+
+    def _fetch(self, url):
+        return self.fetcher.fetch_page(url, timeout=self.timeout, cache_ttl=self.article_ttl)
+
+    def enrich(self, articles):
+        """기사 목록에 lead 필드 추가 (캐시에 있으면 재사용)"""
+        if not self.enabled or not articles:
+            return articles
+
+        pending = {}
+        for article in articles:
+            found, lead = self.cache.get(article['link'])
+            if found:
+                if lead:
+                    article['lead'] = lead
+            else:
+                pending.setdefault(article['link'], []).append(article)
+
+        if not pending:
+            return articles
+
+        fetch_pool, extract_pool = self._pools()
+        fetches = {fetch_pool.submit(self._fetch, url): url for url in pending}
+        extractions = {}
+
+        # 수집이 끝나는 대로 추출 작업 제출
+        for future in as_completed(fetches):
+            url = fetches[future]
+            try:
+                content = future.result()
+            except (requests.exceptions.RequestException, CircuitOpenError) as e:
+                self.logger.warning(f"기사 본문 수집 실패 ({url}): {e}")
+                continue
+
+            if extract_pool is not None:
+                extractions[url] = extract_pool.submit(extract_lead, content, self.lead_max_length)
+            else:
+                extractions[url] = fetch_pool.submit(extract_lead, content, self.lead_max_length)
+
+        for url, future in extractions.items():
+            try:
+                lead = future.result()
+            except Exception as e:
+                self.logger.warning(f"기사 본문 추출 실패 ({url}): {e}")
+                continue
+
+            self.cache.set(url, lead)
+            if lead:
+                for article in pending[url]:
+                    article['lead'] = lead
+
+        enriched = sum(1 for article in articles if article.get('lead'))
+        self.logger.info(f"기사 본문 보강: {enriched}/{len(articles)}개")
+        return articles
+
+    def close(self):
+        if self._fetch_pool is not None:
+            self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        if self._extract_pool is not None:
+            self._extract_pool.shutdown(wait=False, cancel_futures=True)
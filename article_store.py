@@ -0,0 +1,361 @@
+"""
+처리된 기사 저장소 모듈 - SQLite(WAL) 기반 색인 저장소
+
+기존 dict 형태의 processed_articles와 같은 방식으로 사용할 수 있으며,
+새로 추가된 해시만 저장하고 보관 기간(TTL)과 최대 개수(LRU)를 적용합니다.
+중복 확인은 이번 실행에서 확인한 해시를 담은 압축 다이제스트 집합으로 먼저 처리하고,
+없으면 기본 키로 SQLite를 조회합니다. 저장소가 커져도 열기·실행 주기 비용이 늘지 않도록
+전체 해시를 미리 읽지 않으며, 행 수는 메모리에서 세어 최대 개수를 넘을 때만 정리합니다.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+from collections.abc import MutableMapping
+from datetime import datetime
+from digest_set import DigestSet
+from search_index import SearchIndex
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+def is_sqlite_path(filename):
+    """SQLite 저장소 경로인지 확인"""
+    return str(filename).lower().endswith(SQLITE_SUFFIXES)
+
+
+class ProcessedArticleStore(MutableMapping):
+    """처리된 기사 해시 저장소 (해시 -> 기사 메타데이터)"""
+
+    def __init__(self, filename, max_articles=None, ttl_days=None, bloom_bits_per_item=0,
+                 search_index=False, search_max_documents=None, search_ttl_days=None):
+        self.filename = filename
+        self.max_articles = max_articles
+        self.ttl_days = ttl_days
+
+        is_new = not os.path.exists(filename)
+        # 여러 프로세스가 함께 쓰면 쓰기 잠금을 기다림 (샤드 모드)
+        self.conn = sqlite3.connect(filename, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed_articles (
+                hash TEXT PRIMARY KEY,
+                title TEXT,
+                source TEXT,
+                processed_at TEXT,
+                last_seen REAL NOT NULL,
+                minhash TEXT,
+                source_id TEXT,
+                link TEXT
+            ) WITHOUT ROWID
+        """)
+        self._migrate()
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_processed_last_seen ON processed_articles (last_seen)"
+        )
+        # 실행 간에 유지할 부가 상태 (조건부 요청 검증자 등, JSON 값)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS store_metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+        # 제목 검색 색인 (선택, 처음 켜면 저장된 제목 전체 색인, 보관 정책은 색인 자체 설정)
+        self.search_index = SearchIndex(
+            self.conn, filename, max_documents=search_max_documents, ttl_days=search_ttl_days
+        ) if search_index else None
+        self.conn.commit()
+        if self.search_index is not None and self.search_index.created:
+            self.search_index.rebuild()
+
+        # 아직 저장되지 않은 변경 사항
+        self._pending = {}
+        self._touched = set()
+        self._pending_text = []
+
+        self._pending_new = set()  # _pending 중 저장소에 없던 해시 (행 수 계산용)
+
+        # 이번 실행에서 확인·추가한 해시 캐시 (없는 해시는 기본 키로 조회)
+        self._digests = DigestSet(bloom_bits_per_item=bloom_bits_per_item)
+        # 저장된 행 수 (열 때 한 번 세고 이후 추가·삭제로 갱신)
+        self._count = self.conn.execute("SELECT COUNT(*) FROM processed_articles").fetchone()[0]
+
+        if is_new:
+            self._import_legacy_json()
+
+    def _migrate(self):
+        """이전 버전 테이블에 없는 열 추가"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(processed_articles)")}
+        if 'minhash' not in columns:
+            self.conn.execute("ALTER TABLE processed_articles ADD COLUMN minhash TEXT")
+        if 'source_id' not in columns:
+            self.conn.execute("ALTER TABLE processed_articles ADD COLUMN source_id TEXT")
+        if 'link' not in columns:
+            self.conn.execute("ALTER TABLE processed_articles ADD COLUMN link TEXT")
+
+    def _import_legacy_json(self):
+        """같은 이름의 기존 JSON 파일이 있으면 가져오기"""
+        legacy_file = os.path.splitext(self.filename)[0] + '.json'
+        if not os.path.exists(legacy_file):
+            return
+
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"기존 처리 기사 파일 가져오기 실패 ({legacy_file}): {e}")
+            return
+
+        for article_hash, info in legacy.items():
+            self[article_hash] = info
+        logging.info(f"기존 처리 기사 {len(legacy)}개 가져옴: {legacy_file}")
+        self.flush()
+
+    def __contains__(self, article_hash):
+        if article_hash in self._digests:
+            return True
+        # 다른 프로세스가 기록했을 수 있으므로 없는 해시는 캐시하지 않음
+        if self.conn.execute(
+            "SELECT 1 FROM processed_articles WHERE hash = ?", (article_hash,)
+        ).fetchone() is None:
+            return False
+        self._digests.add(article_hash)
+        return True
+
+    def __getitem__(self, article_hash):
+        if article_hash in self._pending:
+            return self._pending[article_hash]
+
+        row = self.conn.execute(
+            "SELECT title, source, processed_at FROM processed_articles WHERE hash = ?",
+            (article_hash,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(article_hash)
+
+        return {'title': row[0], 'source': row[1], 'processed_at': row[2]}
+
+    def __setitem__(self, article_hash, info):
+        if article_hash not in self:
+            self._pending_new.add(article_hash)
+        self._pending[article_hash] = info
+        self._digests.add(article_hash)
+
+    def __delitem__(self, article_hash):
+        if article_hash not in self:
+            raise KeyError(article_hash)
+
+        self._pending.pop(article_hash, None)
+        self._pending_new.discard(article_hash)
+        self._pending_text = [(h, text) for h, text in self._pending_text if h != article_hash]
+        self._digests.discard(article_hash)
+        with self.conn:
+            self._count -= self.conn.execute(
+                "DELETE FROM processed_articles WHERE hash = ?", (article_hash,)
+            ).rowcount
+            if self.search_index is not None:
+                self.search_index.remove([article_hash])
+
+    def __iter__(self):
+        self.flush()
+        for (article_hash,) in self.conn.execute("SELECT hash FROM processed_articles"):
+            yield article_hash
+
+    def __len__(self):
+        return self._count + len(self._pending_new)
+
+    def iter_titles(self, since=None):
+        """(해시, 제목, 저장된 MinHash 서명, 처리 시각 epoch 초) 순회 (since 이후 처리한 기사만)"""
+        self.flush()
+        query = "SELECT hash, title, minhash, processed_at FROM processed_articles"
+        params = ()
+        if since is not None:
+            # processed_at은 datetime.now().isoformat() 문자열이므로 같은 형식끼리 비교
+            query += " WHERE processed_at >= ?"
+            params = (datetime.fromtimestamp(since).isoformat(),)
+        for article_hash, title, signature, processed_at in self.conn.execute(query, params):
+            yield article_hash, title, signature, self._timestamp(processed_at, None)
+
+    def iter_arrivals(self):
+        """(수집 소스 이름, 처리 시각 epoch 초) 순회"""
+        self.flush()
+        for source_id, processed_at in self.conn.execute(
+            "SELECT source_id, processed_at FROM processed_articles WHERE source_id IS NOT NULL"
+        ):
+            yield source_id, self._timestamp(processed_at, None)
+
+    def index_text(self, article_hash, text):
+        """기사 본문 등 제목 외 텍스트를 검색 색인에 추가 (다음 flush에 반영)"""
+        if self.search_index is not None and text:
+            self._pending_text.append((article_hash, text))
+
+    def search(self, query, limit=10):
+        """제목(및 색인한 본문) 검색, 색인이 꺼져 있으면 빈 목록"""
+        if self.search_index is None:
+            return []
+        return self.search_index.search(query, limit)
+
+    def get_metadata(self, key, default=None):
+        """부가 상태 조회 (없으면 default)"""
+        row = self.conn.execute("SELECT value FROM store_metadata WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return default
+
+    def set_metadata(self, key, value):
+        """부가 상태 기록 (즉시 커밋)"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO store_metadata (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, ensure_ascii=False))
+            )
+
+    def find_recorded(self, hashes):
+        """hashes 중 저장소 파일에 이미 기록된 해시 집합 (다른 프로세스가 기록한 것 포함)"""
+        hashes = list(hashes)
+        found = set()
+        # SQLite 변수 개수 제한 안에서 나눠 조회
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            found.update(row[0] for row in self.conn.execute(
+                f"SELECT hash FROM processed_articles WHERE hash IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return found
+
+    def claim(self, records):
+        """원자적 확인 후 추가 (여러 프로세스가 같은 저장소를 쓸 때)
+
+        records: {해시: 메타데이터}. 기본 키 충돌로 다른 프로세스가 먼저 기록한 해시는 건너뛰며,
+        이 호출에서 새로 기록한 해시 집합을 반환합니다. 결과는 바로 커밋됩니다.
+        """
+        claimed = set()
+        if not records:
+            return claimed
+
+        now = time.time()
+        with self.conn:
+            for h, info in records.items():
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO processed_articles "
+                    "(hash, title, source, processed_at, last_seen, minhash, source_id, link) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (h, info.get('title'), info.get('source'), info.get('processed_at'),
+                     self._timestamp(info.get('processed_at'), now), info.get('minhash'),
+                     info.get('source_id'), info.get('link'))
+                )
+                if cursor.rowcount:
+                    claimed.add(h)
+            self._count += len(claimed)
+            if self.search_index is not None and claimed:
+                self.search_index.add([(h, records[h].get('title')) for h in claimed], records)
+
+        for h in records:
+            self._digests.add(h)
+        return claimed
+
+    def touch(self, article_hash):
+        """최근 확인 시각 갱신 (LRU)"""
+        self._touched.add(article_hash)
+
+    def flush(self, now=None):
+        """새 해시만 기록하고 보관 정책 적용 (now: LRU·TTL 기준 epoch 초, 기본 현재, 재실행은 페이지 저장 시각)"""
+        now = now or time.time()
+
+        with self.conn:
+            if self._pending:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO processed_articles "
+                    "(hash, title, source, processed_at, last_seen, minhash, source_id, link) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (h, info.get('title'), info.get('source'), info.get('processed_at'),
+                         self._timestamp(info.get('processed_at'), now), info.get('minhash'),
+                         info.get('source_id'), info.get('link'))
+                        for h, info in self._pending.items()
+                    ]
+                )
+                self._count += len(self._pending_new)
+
+            if self.search_index is not None:
+                self.search_index.add(
+                    [(h, info.get('title')) for h, info in self._pending.items()] + self._pending_text,
+                    self._pending
+                )
+
+            touched = self._touched - self._pending.keys()
+            if touched:
+                self.conn.executemany(
+                    "UPDATE processed_articles SET last_seen = ? WHERE hash = ?",
+                    [(now, h) for h in touched]
+                )
+
+            evicted = self._evict(now)
+            if self.search_index is not None:
+                self.search_index.prune(now)
+
+        self._pending.clear()
+        self._pending_new.clear()
+        self._touched.clear()
+        self._pending_text.clear()
+
+        if evicted:
+            logging.info(f"처리된 기사 {evicted}개 정리")
+        return True
+
+    def _evict(self, now):
+        """TTL 만료 및 최대 개수 초과 항목 삭제
+
+        둘 다 last_seen 인덱스 범위만 읽으므로 비용은 삭제할 항목 수에 비례합니다.
+        """
+        expired = []
+
+        if self.ttl_days:
+            cutoff = now - self.ttl_days * 86400
+            expired += [row[0] for row in self.conn.execute(
+                "SELECT hash FROM processed_articles WHERE last_seen < ?", (cutoff,)
+            )]
+            self._delete(expired)
+
+        # 최대 개수를 넘었을 때만 가장 오래전에 확인한 항목부터 초과분 삭제
+        excess = self._count - self.max_articles if self.max_articles else 0
+        if excess > 0:
+            oldest = [row[0] for row in self.conn.execute(
+                "SELECT hash FROM processed_articles ORDER BY last_seen LIMIT ?", (excess,)
+            )]
+            self._delete(oldest)
+            expired += oldest
+
+        return len(expired)
+
+    def _delete(self, hashes):
+        """해시 목록 삭제 (호출 측 트랜잭션 안에서 실행)"""
+        if not hashes:
+            return
+        self.conn.executemany(
+            "DELETE FROM processed_articles WHERE hash = ?", [(h,) for h in hashes]
+        )
+        for article_hash in hashes:
+            self._digests.discard(article_hash)
+        self._count -= len(hashes)
+
+    @staticmethod
+    def _timestamp(iso_string, default):
+        """ISO 시각 문자열을 epoch 초로 변환"""
+        if not iso_string:
+            return default
+        try:
+            return datetime.fromisoformat(iso_string).timestamp()
+        except (TypeError, ValueError):
+            return default
+
+    def close(self):
+        """변경 사항 저장 후 WAL 체크포인트 및 연결 종료"""
+        self.flush()
+        if self.search_index is not None:
+            self.search_index.close()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.close()
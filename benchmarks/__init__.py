@@ -0,0 +1,3 @@
+"""
+벤치마크 모음 - 녹화된 픽스처와 텔레그램 대역 서버
+"""
@@ -0,0 +1,88 @@
+"""
+텔레그램 Bot API 대역 서버 - 벤치마크용 로컬 HTTP 서버
+
+getMe, sendMessage, getUpdates에 응답하며, 지정한 간격마다 429(retry_after)를 돌려줍니다.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockTelegramServer:
+    """로컬 텔레그램 API 서버 (with 문으로 시작/종료)"""
+
+    def __init__(self, throttle_every=0, retry_after=0, host='127.0.0.1', port=0):
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.messages = []
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, payload):
+                method = self.path.rsplit('/', 1)[-1].split('?')[0]
+                with server._lock:
+                    server.requests += 1
+                    throttle = server.throttle_every and server.requests % server.throttle_every == 0
+                    if throttle:
+                        server.throttled += 1
+                    elif method == 'sendMessage':
+                        server.messages.append(payload)
+
+                if throttle:
+                    return self._reply(429, {
+                        'ok': False, 'error_code': 429,
+                        'description': f'Too Many Requests: retry after {server.retry_after}',
+                        'parameters': {'retry_after': server.retry_after}
+                    })
+                if method == 'getMe':
+                    return self._reply(200, {'ok': True, 'result': {'id': 1, 'username': 'mock_bot'}})
+                if method == 'sendMessage':
+                    return self._reply(200, {'ok': True, 'result': {'message_id': server.requests}})
+                if method == 'getUpdates':
+                    return self._reply(200, {'ok': True, 'result': []})
+                return self._reply(404, {'ok': False, 'description': 'Not Found'})
+
+            def do_GET(self):
+                self._handle({})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length) if length else b'{}'
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    payload = {}
+                self._handle(payload)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def api_url(self):
+        """config['telegram']['api_url']에 넣을 주소"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
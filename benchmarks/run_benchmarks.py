@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+벤치마크 실행기 - 녹화된 연합뉴스 페이지와 텔레그램 대역 서버로 단계별 성능 측정
+
+측정 단계:
+- parse: 헤드라인 페이지 파싱 (픽스처 × 파서 백엔드, 두 백엔드 결과 일치 여부도 확인)
+- dedup: filter_new_articles (기존 기록 N개가 있는 저장소 기준)
+- send: send_article_notification (대역 서버, 단건)
+- send_batch: 일괄 전송 (대역 서버가 주기적으로 429 응답)
+- extract: 기사 본문 리드 문단 추출 (trafilatura)
+
+단계별 최소·p50/p95/p99 지연, 처리량, 최대 메모리 할당량과 프로세스 최대 RSS를 출력하고
+baseline.json과 비교해 기준을 넘게 느려지면 종료 코드 1을 반환합니다.
+지연 비교는 잡음이 적은 최소 지연(min-of-N)을 측정 반복마다 번갈아 실행한 보정 작업의
+최소 지연으로 나눈 상대값(relative_min)으로 하므로, 기준을 기록한 컴퓨터와 속도나 부하가 달라도
+비교할 수 있습니다.
+
+사용법 (저장소 최상위에서):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --update-baseline
+    python -m benchmarks.run_benchmarks --record   # 실제 페이지를 픽스처로 저장
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.mock_telegram import MockTelegramServer  # noqa: E402
+import headline_parser  # noqa: E402
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# 헤드라인 레이아웃별 픽스처 (기본 구조, 항목 div 정규식 fallback, article 태그 fallback, trafilatura fallback)
+HEADLINE_FIXTURES = ('headline_list', 'item_box', 'article_tags', 'text_only')
+ARTICLE_FIXTURE = 'article_page'
+
+RECORD_URLS = {
+    'headline_live': 'https://www.yna.co.kr/report/headline?site=wholemenu_headline',
+}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, f'{name}.html'), 'rb') as f:
+        return f.read()
+
+
+def percentile(values, pct):
+    """선형 보간 백분위수"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def calibration_workload():
+    """컴퓨터 속도 보정용 고정 작업 (순수 파이썬 문자열 처리·정렬·해시, 약 1~2ms)"""
+    words = [f'헤드라인 {i * 7919 % 10007}' for i in range(2000)]
+    words.sort()
+    return len({hash(word) for word in words})
+
+
+def measure(fn, iterations, warmup=2, items_per_call=1):
+    """fn 반복 실행 후 지연 백분위수, 처리량, 최대 메모리 할당량 계산
+
+    반복마다 보정 작업을 번갈아 실행해 두 최소 지연의 비율(relative_min)도 계산합니다.
+    """
+    for _ in range(warmup):
+        fn()
+        calibration_workload()
+
+    latencies = []
+    calibration = []
+    total = 0.0
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        t1 = time.perf_counter()
+        calibration_workload()
+        calibration.append((time.perf_counter() - t1) * 1000)
+        latencies.append((t1 - t0) * 1000)
+        total += t1 - t0
+
+    # 할당량은 시간 측정과 분리해 별도로 측정 (tracemalloc 부하 제외)
+    tracemalloc.start()
+    fn()
+    peak_alloc = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'min_ms': round(min(latencies), 3),
+        'relative_min': round(min(latencies) / min(calibration), 4),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'throughput_per_s': round(iterations * items_per_call / total, 1) if total else 0.0,
+        'peak_alloc_kb': round(peak_alloc / 1024, 1),
+    }
+
+
+def make_config(workdir, api_url):
+    """임시 디렉토리에 파일을 두는 벤치마크용 설정"""
+    return {
+        'telegram': {'bot_token': 'mock', 'chat_id': '1', 'api_url': api_url},
+        'monitoring': {'max_articles_per_run': 5},
+        # 대역 서버 오버헤드만 보도록 속도 제한은 사실상 해제
+        'delivery': {'global_per_second': 100000, 'per_chat_per_second': 100000,
+                     'max_retries': 5, 'backoff_seconds': 0.01, 'max_in_flight': 30},
+        'storage': {'processed_articles_file': os.path.join(workdir, 'processed.db'),
+                    'max_stored_articles': 100000},
+        'outbox': {'file': os.path.join(workdir, 'outbox.db')},
+        'dedup': {'near_duplicate': True},
+        'keywords': {'exclude': ['광고', '홍보', '이벤트']},
+    }
+
+
+def bench_parse(iterations):
+    results = {}
+    mismatches = []
+    fixtures = list(HEADLINE_FIXTURES)
+    # --record로 저장한 실제 페이지가 있으면 함께 측정
+    fixtures += [name for name in RECORD_URLS if os.path.exists(os.path.join(FIXTURE_DIR, f'{name}.html'))]
+
+    for fixture in fixtures:
+        content = load_fixture(fixture)
+        outputs = {}
+        for backend in headline_parser.BACKENDS:
+            outputs[backend] = headline_parser.parse_headlines(content, backend)
+            results[f'parse:{fixture}:{backend}'] = measure(
+                lambda: headline_parser.parse_headlines(content, backend), iterations
+            )
+        if outputs['strainer'] != outputs['soup']:
+            mismatches.append(fixture)
+    return results, mismatches
+
+
+def bench_dedup(monitor, iterations, history=10000):
+    """기존 기록 history개가 있는 저장소에서 10개씩(절반은 이미 본 기사) 필터링"""
+    from datetime import datetime
+    from utils import save_processed_articles
+    for i in range(history):
+        monitor.processed_articles[monitor.generate_article_hash(
+            {'title': f'기존 기사 {i}', 'link': f'https://www.yna.co.kr/view/OLD{i}'}
+        )] = {'title': f'기존 기사 {i}', 'source': '연합뉴스', 'processed_at': datetime.now().isoformat()}
+    save_processed_articles(monitor.processed_articles, monitor.processed_articles_file)
+
+    counter = iter(range(10 ** 9))
+
+    def run():
+        n = next(counter)
+        batch = [
+            {'title': f'기존 기사 {(n * 5 + i) % history}',
+             'link': f'https://www.yna.co.kr/view/OLD{(n * 5 + i) % history}', 'source': '연합뉴스'}
+            for i in range(5)
+        ] + [
+            {'title': f'새로운 헤드라인 {n}-{i} 정부 발표 관련 소식',
+             'link': f'https://www.yna.co.kr/view/NEW{n}-{i}', 'source': '연합뉴스'}
+            for i in range(5)
+        ]
+        monitor.filter_new_articles(batch)
+
+    return {'dedup:filter_new_articles': measure(run, iterations, items_per_call=10)}
+
+
+def bench_send(monitor, server, iterations):
+    article = headline_parser.parse_headlines(load_fixture('headline_list'))[0]
+    results = {'send:send_article_notification': measure(
+        lambda: monitor.send_article_notification(article), iterations
+    )}
+
+    # 30개 일괄 전송, 10번째 요청마다 429
+    server.throttle_every = 10
+    deliveries = [{'chat_id': str(i % 3), 'text': f'메시지 {i}', 'priority': i % 2} for i in range(30)]
+    results['send:batch_30_with_429'] = measure(
+        lambda: monitor.telegram_bot.send_batch(deliveries), max(3, iterations // 10), items_per_call=30
+    )
+    server.throttle_every = 0
+    return results
+
+
+def bench_extract(iterations):
+    from article_enricher import extract_lead
+    content = load_fixture(ARTICLE_FIXTURE)
+    return {'extract:lead': measure(lambda: extract_lead(content), iterations)}
+
+
+def compare(results, baseline, threshold):
+    """기준 대비 보정한 최소 지연(relative_min) 또는 메모리 할당량이 threshold 비율 이상 늘어난 단계 목록"""
+    regressions = []
+    for stage, current in results.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        if not base.get('relative_min'):
+            regressions.append(f"{stage}: 기준에 relative_min 없음 (--update-baseline으로 다시 기록하세요)")
+        elif current['relative_min'] > base['relative_min'] * (1 + threshold):
+            regressions.append(
+                f"{stage} relative_min: {base['relative_min']} → {current['relative_min']} "
+                f"(+{(current['relative_min'] / base['relative_min'] - 1) * 100:.0f}%, "
+                f"min_ms {base['min_ms']} → {current['min_ms']})"
+            )
+        if base.get('peak_alloc_kb') and current['peak_alloc_kb'] > base['peak_alloc_kb'] * (1 + threshold):
+            regressions.append(
+                f"{stage} peak_alloc_kb: {base['peak_alloc_kb']} → {current['peak_alloc_kb']} "
+                f"(+{(current['peak_alloc_kb'] / base['peak_alloc_kb'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def median_results(rounds):
+    """단계마다 relative_min이 중앙값인 회차의 결과 (여러 회차 실행 시)"""
+    merged = {}
+    for stage in rounds[0]:
+        ordered = sorted((r[stage] for r in rounds if stage in r), key=lambda result: result['relative_min'])
+        merged[stage] = ordered[len(ordered) // 2]
+    return merged
+
+
+def run_suite(iterations):
+    """전체 단계 1회 측정: (결과, 파서 백엔드 불일치 목록)"""
+    from yonhap_news_monitor import YonhapNewsMonitor
+
+    results, mismatches = bench_parse(iterations)
+
+    with tempfile.TemporaryDirectory() as workdir, MockTelegramServer() as server:
+        monitor = YonhapNewsMonitor(make_config(workdir, server.api_url))
+        try:
+            results.update(bench_dedup(monitor, iterations))
+            results.update(bench_send(monitor, server, iterations))
+        finally:
+            monitor.close()
+
+    results.update(bench_extract(max(5, iterations // 5)))
+    return results, mismatches
+
+
+def record_fixtures():
+    """실제 페이지를 받아 픽스처로 저장"""
+    import requests
+    from news_sources import USER_AGENT
+    for name, url in RECORD_URLS.items():
+        response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=30)
+        response.raise_for_status()
+        path = os.path.join(FIXTURE_DIR, f'{name}.html')
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        print(f"저장: {path} ({len(response.content)} bytes)")
+
+
+def print_table(results):
+    print(f"{'stage':45} {'rel':>7} {'min':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'ops/s':>10} {'alloc KB':>10}")
+    for stage, r in results.items():
+        print(f"{stage:45} {r['relative_min']:7.2f} {r['min_ms']:9.2f} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f} "
+              f"{r['throughput_per_s']:10.1f} {r['peak_alloc_kb']:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='연합뉴스 모니터 벤치마크')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help='허용하는 성능 저하 비율 (기본 0.5 = 50%%, 보정한 최소 지연 기준)')
+    parser.add_argument('--rounds', type=int,
+                        help='전체 측정 반복 횟수, 단계별 중앙값 사용 (기본: 기준 갱신 시 3, 비교 시 1)')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--record', action='store_true', help='실제 페이지를 픽스처로 저장하고 종료')
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+        return 0
+
+    # 모니터 로그는 측정 결과를 가리므로 끔
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    rounds = []
+    mismatches = set()
+    for _ in range(args.rounds or (3 if args.update_baseline else 1)):
+        results, round_mismatches = run_suite(args.iterations)
+        rounds.append(results)
+        mismatches.update(round_mismatches)
+    results = median_results(rounds)
+    mismatches = sorted(mismatches)
+
+    print_table(results)
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"\n프로세스 최대 RSS: {peak_rss_kb / 1024:.1f} MB")
+
+    report = {'results': results, 'peak_rss_kb': peak_rss_kb, 'parser_mismatches': mismatches}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    exit_code = 0
+    if mismatches:
+        print(f"\n❌ 파서 백엔드 결과 불일치: {', '.join(mismatches)}")
+        exit_code = 1
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n기준 갱신: {args.baseline}")
+        return exit_code
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ 성능 저하 ({args.threshold * 100:.0f}% 초과):")
+            for line in regressions:
+                print(f"  - {line}")
+            exit_code = 1
+        else:
+            print("\n✅ 기준 대비 성능 저하 없음")
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+다이제스트 집합 모듈 - 기사 해시 중복 확인용 압축 집합
+
+16바이트 MD5 다이제스트를 bytearray 기반 개방 주소법(선형 탐사) 테이블에 저장합니다.
+항목당 약 16~32바이트만 사용하며, 선택적으로 Bloom 필터를 앞단에 둘 수 있습니다.
+"""
+
+import hashlib
+
+DIGEST_SIZE = 16
+EMPTY_SLOT = bytes(DIGEST_SIZE)
+MIN_CAPACITY = 64
+MAX_LOAD_FACTOR = 0.7
+
+
+def to_digest(article_hash):
+    """16진수 해시 문자열(또는 임의 문자열)을 16바이트 다이제스트로 변환"""
+    if isinstance(article_hash, (bytes, bytearray)) and len(article_hash) == DIGEST_SIZE:
+        return bytes(article_hash)
+    if isinstance(article_hash, str) and len(article_hash) == DIGEST_SIZE * 2:
+        try:
+            return bytes.fromhex(article_hash)
+        except ValueError:
+            pass
+    if isinstance(article_hash, str):
+        article_hash = article_hash.encode('utf-8')
+    return hashlib.md5(article_hash).digest()
+
+
+class BloomFilter:
+    """다이제스트 비트를 그대로 해시로 사용하는 Bloom 필터"""
+
+    def __init__(self, capacity, bits_per_item=10, num_hashes=7):
+        self.num_bits = max(8, capacity * bits_per_item)
+        self.num_hashes = num_hashes
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, digest):
+        # 이중 해싱: h1 + i * h2
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, digest):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest):
+        for pos in self._positions(digest):
+            if not self.bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class DigestSet:
+    """16바이트 다이제스트 개방 주소법 집합"""
+
+    def __init__(self, capacity=MIN_CAPACITY, bloom_bits_per_item=0):
+        self.capacity = MIN_CAPACITY
+        while self.capacity * MAX_LOAD_FACTOR < capacity:
+            self.capacity *= 2
+
+        self.table = bytearray(self.capacity * DIGEST_SIZE)
+        self.size = 0
+        self.has_empty_digest = False  # 모두 0인 다이제스트는 빈 슬롯과 구분해 별도 보관
+
+        self.bloom_bits_per_item = bloom_bits_per_item
+        self.bloom = BloomFilter(self.capacity, bloom_bits_per_item) if bloom_bits_per_item else None
+
+    @classmethod
+    def from_hashes(cls, hashes, capacity=MIN_CAPACITY, bloom_bits_per_item=0):
+        """해시 목록으로 집합 생성"""
+        digest_set = cls(capacity, bloom_bits_per_item)
+        for article_hash in hashes:
+            digest_set.add(article_hash)
+        return digest_set
+
+    def _slot(self, digest):
+        return int.from_bytes(digest[:8], 'little') & (self.capacity - 1)
+
+    def _find(self, digest):
+        """다이제스트가 있는 슬롯 또는 삽입할 빈 슬롯 번호"""
+        mask = self.capacity - 1
+        slot = self._slot(digest)
+        table = self.table
+        while True:
+            offset = slot * DIGEST_SIZE
+            current = table[offset:offset + DIGEST_SIZE]
+            if current == EMPTY_SLOT or current == digest:
+                return slot, current == digest
+            slot = (slot + 1) & mask
+
+    def __contains__(self, article_hash):
+        digest = to_digest(article_hash)
+        if digest == EMPTY_SLOT:
+            return self.has_empty_digest
+        if self.bloom is not None and digest not in self.bloom:
+            return False
+        return self._find(digest)[1]
+
+    def __len__(self):
+        return self.size
+
+    def add(self, article_hash):
+        """다이제스트 추가 (새로 추가되면 True)"""
+        digest = to_digest(article_hash)
+        if digest == EMPTY_SLOT:
+            added = not self.has_empty_digest
+            self.has_empty_digest = True
+            self.size += added
+            return added
+
+        slot, found = self._find(digest)
+        if found:
+            return False
+
+        offset = slot * DIGEST_SIZE
+        self.table[offset:offset + DIGEST_SIZE] = digest
+        self.size += 1
+        if self.bloom is not None:
+            self.bloom.add(digest)
+
+        if self.size > self.capacity * MAX_LOAD_FACTOR:
+            self._resize(self.capacity * 2)
+        return True
+
+    def discard(self, article_hash):
+        """다이제스트 제거 (선형 탐사 역방향 이동 삭제)"""
+        digest = to_digest(article_hash)
+        if digest == EMPTY_SLOT:
+            if self.has_empty_digest:
+                self.has_empty_digest = False
+                self.size -= 1
+            return
+
+        slot, found = self._find(digest)
+        if not found:
+            return
+
+        mask = self.capacity - 1
+        table = self.table
+        hole = slot
+        nxt = (hole + 1) & mask
+        while True:
+            offset = nxt * DIGEST_SIZE
+            current = bytes(table[offset:offset + DIGEST_SIZE])
+            if current == EMPTY_SLOT:
+                break
+            home = self._slot(current)
+            # 다음 항목의 원래 위치가 (hole, nxt] 구간 밖이면 hole로 당김
+            if (nxt - home) & mask >= (nxt - hole) & mask:
+                hole_offset = hole * DIGEST_SIZE
+                table[hole_offset:hole_offset + DIGEST_SIZE] = current
+                hole = nxt
+            nxt = (nxt + 1) & mask
+
+        hole_offset = hole * DIGEST_SIZE
+        table[hole_offset:hole_offset + DIGEST_SIZE] = EMPTY_SLOT
+        self.size -= 1
+        # Bloom 필터는 제거를 지원하지 않으므로 다음 재구성 때까지 거짓 양성만 늘어남
+
+    def _resize(self, capacity):
+        old_table = self.table
+        self.capacity = capacity
+        self.table = bytearray(capacity * DIGEST_SIZE)
+        if self.bloom is not None:
+            self.bloom = BloomFilter(capacity, self.bloom_bits_per_item)
+
+        for offset in range(0, len(old_table), DIGEST_SIZE):
+            digest = bytes(old_table[offset:offset + DIGEST_SIZE])
+            if digest != EMPTY_SLOT:
+                slot = self._find(digest)[0]
+                new_offset = slot * DIGEST_SIZE
+                self.table[new_offset:new_offset + DIGEST_SIZE] = digest
+                if self.bloom is not None:
+                    self.bloom.add(digest)
+
+    def __iter__(self):
+        if self.has_empty_digest:
+            yield EMPTY_SLOT
+        table = self.table
+        for offset in range(0, len(table), DIGEST_SIZE):
+            digest = bytes(table[offset:offset + DIGEST_SIZE])
+            if digest != EMPTY_SLOT:
+                yield digest
+
+    def memory_usage(self):
+        """테이블과 Bloom 필터가 사용하는 바이트 수"""
+        usage = len(self.table)
+        if self.bloom is not None:
+            usage += len(self.bloom.bits)
+        return usage
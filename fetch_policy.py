@@ -0,0 +1,153 @@
+"""
+수집 요청 정책 모듈 - 헤지 요청 시점, 재시도 간격, 호스트별 회로 차단기
+
+- 헤지 요청: 첫 요청이 그 호스트의 최근 응답 지연 p95 안에 끝나지 않으면 같은 요청을 한 번 더 보내고
+  먼저 온 응답을 씁니다. 정상일 때는 느린 약 5%의 요청에만 추가 요청이 생기며,
+  헤지 예산(요청마다 max_ratio개씩 쌓임)을 넘으면 보내지 않습니다.
+- 재시도: 지수 간격의 절반에서 전체 사이 무작위 시간만큼 기다린 뒤 다시 시도합니다.
+- 회로 차단기: 호스트에서 연속 failure_threshold번 실패하면 open_seconds 동안 요청하지 않고(열림),
+  그 뒤 요청 하나만 보내 회복을 확인합니다(반열림). 확인 요청도 실패하면 열림 시간을 두 배로 늘립니다.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 요청하지 않음"""
+
+
+def backoff_delay(attempt, base, cap):
+    """attempt번째(1부터) 재시도 전 대기 초 (지수 간격의 절반 ~ 전체 사이 무작위)"""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class LatencyTracker:
+    """호스트별 최근 응답 지연으로 헤지 요청 시점 결정 (스레드 안전)"""
+
+    def __init__(self, percentile=95, window=100, min_samples=20, initial_delay=3.0,
+                 min_delay=0.2, max_ratio=0.1):
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self._samples = {}  # 호스트 -> 최근 응답 지연(초)
+        self._budget = {}  # 호스트 -> 남은 헤지 요청 수
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, hedge_config):
+        return cls(
+            percentile=hedge_config.get('percentile', 95),
+            window=hedge_config.get('window', 100),
+            min_samples=hedge_config.get('min_samples', 20),
+            initial_delay=hedge_config.get('initial_delay_seconds', 3.0),
+            min_delay=hedge_config.get('min_delay_seconds', 0.2),
+            max_ratio=hedge_config.get('max_ratio', 0.1),
+        )
+
+    def record(self, host, seconds):
+        with self._lock:
+            if host not in self._samples:
+                self._samples[host] = deque(maxlen=self.window)
+            self._samples[host].append(seconds)
+
+    def hedge_delay(self, host):
+        """요청 1건 시작: 헤지 요청까지 기다릴 초 반환 (표본이 부족하면 initial_delay), 헤지 예산 적립"""
+        with self._lock:
+            # 처음 요청에도 헤지 1번은 할 수 있도록 예산 1에서 시작, 최대 1 + window × max_ratio
+            budget = self._budget.get(host, 1.0)
+            self._budget[host] = min(1 + self.window * self.max_ratio, budget + self.max_ratio)
+
+            samples = self._samples.get(host)
+            if not samples or len(samples) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, len(ordered) * self.percentile // 100)
+            return max(self.min_delay, ordered[index])
+
+    def take_hedge(self, host):
+        """헤지 예산이 남았으면 1 사용하고 True"""
+        with self._lock:
+            budget = self._budget.get(host, 1.0)
+            if budget < 1:
+                return False
+            self._budget[host] = budget - 1
+            return True
+
+
+class CircuitBreaker:
+    """호스트 하나의 회로 차단기 (스레드 안전, failure_threshold가 0이면 항상 닫힘)"""
+
+    def __init__(self, failure_threshold=5, open_seconds=60, max_open_seconds=600):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._open_for = open_seconds
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, breaker_config):
+        return cls(
+            failure_threshold=breaker_config.get('failure_threshold', 5),
+            open_seconds=breaker_config.get('open_seconds', 60),
+            max_open_seconds=breaker_config.get('max_open_seconds', 600),
+        )
+
+    def allow(self, now=None):
+        """요청해도 되면 True (열림 시간이 지나면 확인 요청 하나만 허용)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = now or time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self._open_for:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def retry_after(self, now=None):
+        """열림 상태가 끝날 때까지 남은 초"""
+        now = now or time.monotonic()
+        return max(0.0, self.opened_at + self._open_for - now)
+
+    def record_success(self):
+        """응답 받음 (상태 코드와 무관하게 서버가 응답하면 성공), 회로가 다시 닫혔으면 True"""
+        with self._lock:
+            reopened = self.state != CLOSED
+            self.state = CLOSED
+            self.failures = 0
+            self._open_for = self.open_seconds
+            self._probing = False
+            return reopened
+
+    def record_failure(self, now=None):
+        """연결 오류·시간 초과·5xx, 이번 실패로 회로가 열렸으면 True"""
+        with self._lock:
+            if self.failure_threshold <= 0 or self.state == OPEN:
+                return False
+            if self.state == HALF_OPEN:
+                # 확인 요청 실패: 더 오래 쉼
+                self._open_for = min(self.max_open_seconds, self._open_for * 2)
+            else:
+                self.failures += 1
+                if self.failures < self.failure_threshold:
+                    return False
+            self.state = OPEN
+            self.opened_at = now or time.monotonic()
+            self._probing = False
+            return True
@@ -0,0 +1,202 @@
+"""
+헤드라인 API 모듈 - 상주 모드에서 수집한 기사를 다른 도구에 JSON으로 제공하는 로컬 HTTP 서버
+
+엔드포인트:
+- GET /headlines: 최근 수집한 현재 헤드라인 목록 (소스별 최신 결과, 링크 중복 제거)
+- GET /articles?since=<cursor>[&wait=<초>]: cursor 이후 새로 발견된 기사 (wait를 주면 새 기사가 나올 때까지 대기)
+- GET /events: 새 기사를 Server-Sent Events로 전송 (Last-Event-ID 또는 ?since=로 이어받기)
+
+응답 본문은 기사가 바뀔 때 한 번만 만들고 ETag를 붙이므로, 같은 내용을 다시 요청하면 304로 응답합니다.
+cursor는 밀리초 단위로 증가하므로 재시작 후에도 이전 cursor를 그대로 쓸 수 있습니다.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+ARTICLE_FIELDS = ('title', 'link', 'published_time', 'published_at', 'source', 'source_id', 'lead')
+MAX_WAIT_SECONDS = 60
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class HeadlineFeed:
+    """현재 헤드라인 목록과 새 기사 이력 (스레드 안전)"""
+
+    def __init__(self, max_items=1000):
+        self._cond = threading.Condition()
+        self.items = deque(maxlen=max_items)  # (cursor, 미리 인코딩한 기사 JSON)
+        self.last_cursor = 0
+        self._since_cache = {}
+
+        self._current = {}  # 소스 이름 -> 기사 목록
+        self._current_json = None
+        self.current_body = b'{"articles":[]}'
+        self.current_etag = '"0"'
+
+    @staticmethod
+    def _article_data(article):
+        return {field: article[field] for field in ARTICLE_FIELDS if article.get(field)}
+
+    def _next_cursor(self):
+        return max(self.last_cursor + 1, int(time.time() * 1000))
+
+    def set_current(self, source_name, articles):
+        """소스의 최신 헤드라인 목록 교체 (내용이 같으면 ETag 유지)"""
+        with self._cond:
+            self._current[source_name] = [self._article_data(article) for article in articles]
+            seen = set()
+            merged = []
+            for source_articles in self._current.values():
+                for article in source_articles:
+                    if article['link'] not in seen:
+                        seen.add(article['link'])
+                        merged.append(article)
+            articles_json = _encode(merged)
+            if articles_json != self._current_json:
+                # updated_at은 목록이 바뀐 시각
+                self._current_json = articles_json
+                self.current_body = b'{"updated_at":%d,"articles":%s}' % (int(time.time()), articles_json)
+                self.current_etag = f'"{self._next_cursor()}"'
+
+    def publish(self, articles):
+        """새 기사 추가 후 대기 중인 요청 깨우기"""
+        if not articles:
+            return
+        with self._cond:
+            for article in articles:
+                cursor = self._next_cursor()
+                data = self._article_data(article)
+                data['cursor'] = cursor
+                self.items.append((cursor, _encode(data)))
+                self.last_cursor = cursor
+            self._since_cache.clear()
+            self._cond.notify_all()
+
+    def since(self, cursor):
+        """cursor 이후 기사 응답 (본문, ETag)"""
+        with self._cond:
+            cached = self._since_cache.get(cursor)
+            if cached is None:
+                entries = [data for item_cursor, data in self.items if item_cursor > cursor]
+                next_cursor = max(cursor, self.last_cursor)
+                body = b'{"cursor":%d,"articles":[%s]}' % (next_cursor, b','.join(entries))
+                cached = (body, f'"{self.last_cursor}-{cursor}"')
+                if len(self._since_cache) > 1000:
+                    self._since_cache.clear()
+                self._since_cache[cursor] = cached
+            return cached
+
+    def entries_since(self, cursor):
+        with self._cond:
+            return [(item_cursor, data) for item_cursor, data in self.items if item_cursor > cursor]
+
+    def wait(self, cursor, timeout):
+        """cursor 이후 기사가 생길 때까지 최대 timeout초 대기, 새 기사가 있으면 True"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.last_cursor > cursor, timeout)
+
+
+class HeadlineApiServer:
+    """HeadlineFeed를 제공하는 HTTP 서버 (백그라운드 스레드)"""
+
+    def __init__(self, feed, host='127.0.0.1', port=8080):
+        self.feed = feed
+        self.running = True
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, body, etag, status=200):
+                if etag and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-cache')
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _cursor(self, query, default):
+                """?since= 또는 Last-Event-ID (없으면 default, 정수가 아니면 None)"""
+                value = query.get('since', [self.headers.get('Last-Event-ID')])[0]
+                if not value:
+                    return default
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+
+                if url.path == '/headlines':
+                    return self._reply(server.feed.current_body, server.feed.current_etag)
+
+                if url.path in ('/articles', '/events'):
+                    # /events는 cursor가 없으면 지금 이후 기사만 전송
+                    cursor = self._cursor(query, server.feed.last_cursor if url.path == '/events' else 0)
+                    if cursor is None:
+                        return self._reply(_encode({'error': 'since는 정수여야 합니다'}), None, 400)
+                    if url.path == '/events':
+                        return self._stream(cursor)
+                    try:
+                        wait = min(float(query.get('wait', [0])[0]), MAX_WAIT_SECONDS)
+                    except ValueError:
+                        wait = 0
+                    if wait > 0:
+                        server.feed.wait(cursor, wait)
+                    return self._reply(*server.feed.since(cursor))
+
+                return self._reply(_encode({'error': 'not found'}), None, 404)
+
+            def _stream(self, cursor):
+                """Server-Sent Events: 새 기사마다 id(cursor)와 data(JSON) 전송"""
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    while server.running:
+                        if server.feed.wait(cursor, SSE_KEEPALIVE_SECONDS):
+                            for item_cursor, data in server.feed.entries_since(cursor):
+                                self.wfile.write(b'id: %d\nevent: article\ndata: %s\n\n' % (item_cursor, data))
+                                cursor = item_cursor
+                        else:
+                            self.wfile.write(b': keepalive\n\n')
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        host, port = self.httpd.server_address[:2]
+        logging.info(f"헤드라인 API: http://{host}:{port}/headlines")
+
+    def close(self):
+        self.running = False
+        self.httpd.shutdown()
+        self.httpd.server_close()
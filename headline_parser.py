@@ -0,0 +1,191 @@
+"""
+헤드라인 파서 모듈 - 연합뉴스 헤드라인 페이지에서 기사 목록 추출
+
+백엔드:
+- strainer: 헤드라인 컨테이너만 파싱 (lxml이 있으면 XPath로 찾은 컨테이너만 BeautifulSoup 변환,
+  없으면 SoupStrainer). 컨테이너가 없는 레이아웃도 같은 lxml 트리에서 soup 백엔드와 같은 순서로
+  fallback 선택자를 찾으므로 문서를 다시 파싱하지 않습니다.
+- soup: 전체 문서를 html.parser로 파싱 (기존 방식, fallback)
+"""
+
+import logging
+import re
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+from article import Article
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = None
+    lxml_html = None
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = 'https://www.yna.co.kr'
+MAX_ITEMS = 10
+MIN_TITLE_LENGTH = 10
+
+# 미리 컴파일된 선택자
+ITEM_CLASS_PATTERN = re.compile(r'.*item.*|.*news.*|.*article.*')
+TIME_CLASS_PATTERN = re.compile(r'.*time.*|.*date.*')
+HEADLINE_STRAINER = SoupStrainer('div', class_='headline-list')
+HEADLINE_XPATH = etree.XPath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' headline-list ')]"
+) if etree is not None else None
+# parse_with_soup의 fallback 선택자 (article 태그, class에 item/news/article이 들어간 div)
+FALLBACK_XPATHS = (
+    etree.XPath("//article"),
+    etree.XPath("//div[contains(@class, 'item') or contains(@class, 'news') or contains(@class, 'article')]"),
+) if etree is not None else ()
+
+BACKENDS = ('strainer', 'soup')
+
+
+def extract_article(item, now=None):
+    """헤드라인 항목 요소에서 기사 정보 추출 (now: 게재 시각 해석 기준, 기본 현재)"""
+    # 제목 추출
+    title_elem = item.find('a') or item.find('h2') or item.find('h3')
+    if not title_elem:
+        return None
+
+    title = title_elem.get_text(strip=True)
+    if not title or len(title) < MIN_TITLE_LENGTH:
+        return None
+
+    # 링크 추출
+    link = title_elem.get('href', '')
+    if link and not link.startswith('http'):
+        link = BASE_URL + link
+
+    # 시간 정보 추출
+    time_elem = item.find('time') or item.find('span', {'class': TIME_CLASS_PATTERN})
+    published_time = ''
+    if time_elem:
+        published_time = time_elem.get_text(strip=True)
+
+    if not (title and link):
+        return None
+
+    return Article(title, link, published_time, now=now)
+
+
+def extract_articles(items, now=None):
+    """항목 목록에서 기사 목록 생성 (최대 MAX_ITEMS개 항목 검사)"""
+    articles = []
+    for item in items[:MAX_ITEMS]:
+        try:
+            article = extract_article(item, now)
+            if article:
+                articles.append(article)
+        except Exception as e:
+            logger.warning(f"기사 파싱 오류: {e}")
+            continue
+    return articles
+
+
+def parse_with_soup(content, now=None):
+    """전체 문서 파싱 (기존 방식)"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # 헤드라인 기사 추출
+    headline_items = soup.find_all('div', class_='headline-list')
+
+    if not headline_items:
+        # 다른 구조 시도
+        headline_items = soup.find_all('article')
+        if not headline_items:
+            headline_items = soup.find_all('div', {'class': ITEM_CLASS_PATTERN})
+
+    return extract_articles(headline_items, now)
+
+
+def find_headline_items(content):
+    """lxml로 문서를 한 번 파싱해 헤드라인 항목을 찾고, 검사할 MAX_ITEMS개만 BeautifulSoup 요소로 변환
+
+    헤드라인 컨테이너가 없으면 같은 트리에서 fallback 선택자를 차례로 찾습니다.
+    빈 문서면 None 반환.
+    """
+    markup = UnicodeDammit(content, is_html=True).unicode_markup
+    if not markup or not markup.strip():
+        return None
+
+    root = lxml_html.document_fromstring(markup)
+    for xpath in (HEADLINE_XPATH, *FALLBACK_XPATHS):
+        elements = xpath(root)
+        if elements:
+            return [
+                BeautifulSoup(lxml_html.tostring(element, encoding='unicode', with_tail=False),
+                              'html.parser').find(element.tag)
+                for element in elements[:MAX_ITEMS]
+            ]
+    return []
+
+
+def parse_with_strainer(content, now=None):
+    """헤드라인 컨테이너만 파싱 (lxml이 없으면 컨테이너가 없을 때, 있으면 빈 문서일 때 None 반환)"""
+    if HEADLINE_XPATH is not None:
+        headline_items = find_headline_items(content)
+        if headline_items is None:
+            return None
+        return extract_articles(headline_items, now)
+    else:
+        soup = BeautifulSoup(content, 'html.parser', parse_only=HEADLINE_STRAINER)
+        headline_items = soup.find_all('div', class_='headline-list')
+
+    if not headline_items:
+        return None
+
+    return extract_articles(headline_items, now)
+
+
+def parse_with_trafilatura(content):
+    """일반 텍스트에서 기사 추출 (fallback)"""
+    # 무거운 trafilatura는 fallback이 필요할 때만 로드
+    import trafilatura
+
+    articles = []
+    text_content = trafilatura.extract(content)
+    if not text_content:
+        return articles
+
+    current_title = None
+    current_link = None
+
+    for line in text_content.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        # 헤드라인 패턴 찾기
+        if '[연합뉴스 이 시각 헤드라인]' in line or '■' in line:
+            if current_title and current_link:
+                articles.append(Article(current_title, current_link))
+            current_title = line.replace('■', '').strip()
+            current_link = None
+
+        elif line.startswith('전문보기:') or line.startswith('https://'):
+            current_link = line.replace('전문보기:', '').strip()
+
+    return articles
+
+
+def parse_headlines(content, backend='strainer', now=None):
+    """헤드라인 페이지 파싱 (선택한 백엔드 → 전체 문서 → 텍스트 순으로 fallback)
+
+    now: 연도·날짜가 빠진 게재 시각을 해석할 기준 시각 (기본 현재, 재실행은 페이지 저장 시각)
+    """
+    articles = None
+
+    if backend == 'strainer':
+        articles = parse_with_strainer(content, now)
+    elif backend != 'soup':
+        logger.warning(f"알 수 없는 파서 백엔드: {backend} (soup 사용)")
+
+    if articles is None:
+        articles = parse_with_soup(content, now)
+
+    if not articles:
+        articles = parse_with_trafilatura(content)
+
+    return articles
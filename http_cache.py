@@ -0,0 +1,248 @@
+"""
+HTTP 응답 캐시 모듈 - 헤드라인 페이지와 기사 본문 수집이 함께 쓰는 응답 캐시
+
+URL별 200 응답을 메모리 LRU에 두고, 파일을 지정하면 SQLite에도 저장해 재시작 후에도 씁니다.
+Cache-Control(no-store, no-cache, max-age)을 따르며, 신선도가 지난 항목은
+저장된 ETag / Last-Modified로 조건부 요청을 보내 304 응답이면 저장된 본문을 그대로 씁니다.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from requests.structures import CaseInsensitiveDict
+
+# 캐시 조회 결과
+HIT = 'hit'                  # 신선한 항목, 네트워크 요청 없음
+REVALIDATED = 'revalidated'  # 조건부 요청 후 304, 저장된 본문 사용
+MISS = 'miss'                # 새로 받음
+BYPASS = 'bypass'            # 캐시하지 않는 응답 (no-store, 200 외 상태)
+
+
+def parse_cache_control(value):
+    """Cache-Control 헤더를 {지시어: 값} dict로 변환"""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') or True
+    return directives
+
+
+class CachedResponse:
+    """캐시에서 꺼낸 응답 (requests.Response에서 쓰는 속성만 제공)"""
+
+    def __init__(self, url, content, headers, cache_status):
+        self.url = url
+        self.status_code = 200
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers)
+        self.cache_status = cache_status
+
+    def raise_for_status(self):
+        pass
+
+
+class CacheEntry:
+    """저장된 응답 본문과 검증자"""
+
+    def __init__(self, content, headers, expires_at, stored_at):
+        self.content = content
+        self.headers = headers
+        self.expires_at = expires_at
+        self.stored_at = stored_at
+
+
+class HttpCache:
+    """메모리 LRU + SQLite 응답 캐시 (스레드 안전)"""
+
+    # 재검증과 응답 해석에 필요한 헤더만 저장
+    STORED_HEADERS = ('ETag', 'Last-Modified', 'Content-Type', 'Cache-Control')
+
+    def __init__(self, cache_config=None, metrics=None):
+        cache_config = cache_config or {}
+        self.memory_entries = cache_config.get('memory_entries', 256)
+        self.memory_bytes = cache_config.get('memory_mb', 32) * 1024 * 1024
+        self.disk_bytes = cache_config.get('disk_mb', 64) * 1024 * 1024
+        self.max_ttl = cache_config.get('max_ttl_minutes', 1440) * 60
+        self.metrics = metrics
+
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self.stats = {HIT: 0, REVALIDATED: 0, MISS: 0, BYPASS: 0}
+
+        self.filename = cache_config.get('file')
+        self.conn = None
+        if self.filename:
+            try:
+                self.conn = sqlite3.connect(self.filename, timeout=30, check_same_thread=False)
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS http_cache (
+                        url TEXT PRIMARY KEY,
+                        headers TEXT NOT NULL,
+                        body BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        stored_at REAL NOT NULL,
+                        expires_at REAL NOT NULL
+                    )
+                """)
+                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_stored ON http_cache (stored_at)")
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logging.error(f"HTTP 캐시 파일 열기 실패 ({self.filename}), 메모리 캐시만 사용: {e}")
+                self.conn = None
+
+    def _freshness(self, headers, default_ttl):
+        """응답 헤더로 신선 유지 시간(초) 결정, 저장하지 않을 응답이면 None"""
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0
+        try:
+            ttl = int(directives['max-age'])
+        except (KeyError, TypeError, ValueError):
+            ttl = default_ttl
+        return max(0, min(ttl, self.max_ttl))
+
+    def _lookup(self, url):
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+                return entry
+            if self.conn is None:
+                return None
+            row = self.conn.execute(
+                "SELECT headers, body, stored_at, expires_at FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(row[1], json.loads(row[0]), row[3], row[2])
+        self._remember(url, entry)
+        return entry
+
+    def _remember(self, url, entry):
+        """메모리 LRU에 추가 (개수·크기 제한 초과분은 오래된 것부터 제거)"""
+        size = len(entry.content)
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(url, None)
+            if previous is not None:
+                self._memory_size -= len(previous.content)
+            self._memory[url] = entry
+            self._memory_size += size
+            while len(self._memory) > self.memory_entries or self._memory_size > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted.content)
+
+    def _store(self, url, response, ttl):
+        now = time.time()
+        headers = {name: response.headers[name] for name in self.STORED_HEADERS if name in response.headers}
+        entry = CacheEntry(response.content, headers, now + ttl, now)
+        self._remember(url, entry)
+        if self.conn is None:
+            return
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, headers, body, size, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, json.dumps(headers), entry.content, len(entry.content), now, entry.expires_at)
+            )
+            self._evict_disk()
+
+    def _refresh(self, url, entry, response, ttl):
+        """304 응답 후 항목의 만료 시각과 검증자 갱신"""
+        now = time.time()
+        for name in self.STORED_HEADERS:
+            if name in response.headers:
+                entry.headers[name] = response.headers[name]
+        entry.expires_at = now + ttl
+        if self.conn is None:
+            return
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE http_cache SET headers = ?, expires_at = ?, stored_at = ? WHERE url = ?",
+                (json.dumps(entry.headers), entry.expires_at, now, url)
+            )
+
+    def _evict_disk(self):
+        """디스크 용량 제한 초과 시 오래된 항목부터 삭제 (호출 측에서 잠금)"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.disk_bytes:
+            return
+        removed = 0
+        for url, size in self.conn.execute("SELECT url, size FROM http_cache ORDER BY stored_at").fetchall():
+            if total <= self.disk_bytes:
+                break
+            self.conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            total -= size
+            removed += 1
+        if removed:
+            logging.info(f"HTTP 캐시 {removed}개 정리")
+
+    def _count(self, result):
+        with self._lock:
+            self.stats[result] += 1
+        if self.metrics is not None:
+            self.metrics.inc('http_cache_total', result=result)
+
+    def get(self, session, url, timeout=30, headers=None, default_ttl=0):
+        """캐시를 거쳐 GET 요청
+
+        신선한 항목이 있으면 네트워크 없이, 지난 항목은 조건부 요청으로 재검증합니다.
+        캐시 항목이 없을 때 headers의 조건부 요청 헤더는 그대로 보내므로 304 응답이 그대로 반환될 수 있습니다.
+        반환값에는 cache_status (hit / revalidated / miss / bypass)가 붙습니다.
+        """
+        entry = self._lookup(url)
+        if entry is not None and entry.expires_at > time.time():
+            self._count(HIT)
+            return CachedResponse(url, entry.content, entry.headers, HIT)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            # 저장된 본문에 맞는 검증자로 재검증
+            request_headers.pop('If-None-Match', None)
+            request_headers.pop('If-Modified-Since', None)
+            if entry.headers.get('ETag'):
+                request_headers['If-None-Match'] = entry.headers['ETag']
+            if entry.headers.get('Last-Modified'):
+                request_headers['If-Modified-Since'] = entry.headers['Last-Modified']
+
+        response = session.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            ttl = self._freshness(response.headers, default_ttl)
+            self._refresh(url, entry, response, ttl or 0)
+            self._count(REVALIDATED)
+            return CachedResponse(url, entry.content, entry.headers, REVALIDATED)
+
+        ttl = self._freshness(response.headers, default_ttl) if response.status_code == 200 else None
+        if ttl is None:
+            self._count(BYPASS)
+            response.cache_status = BYPASS
+            return response
+
+        self._store(url, response, ttl)
+        self._count(MISS)
+        response.cache_status = MISS
+        return response
+
+    def hit_ratio(self):
+        """네트워크 본문 전송 없이 응답한 비율 (hit + revalidated)"""
+        with self._lock:
+            total = sum(self.stats.values())
+            return (self.stats[HIT] + self.stats[REVALIDATED]) / total if total else 0.0
+
+    def close(self):
+        if self.conn is not None:
+            with self._lock:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self.conn.close()
+            self.conn = None
@@ -0,0 +1,120 @@
+"""
+키워드 필터 모듈 - Aho-Corasick 자동자 기반 포함/제외 키워드 매칭
+
+모든 구독자의 포함(include)·제외(exclude) 키워드를 하나의 자동자로 컴파일해
+제목(필요하면 본문까지)을 한 번만 훑고, 구독자별로 전송 여부를 결정합니다.
+"""
+
+from collections import deque
+
+DEFAULT_SUBSCRIBER = 'default'
+
+
+class AhoCorasick:
+    """Aho-Corasick 다중 문자열 매칭 자동자"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]       # 노드별 전이
+        self.fail = [0]        # 실패 링크
+        self.outputs = [[]]    # 노드에서 끝나는 패턴 번호
+        self.patterns = list(patterns)
+
+        for index, pattern in enumerate(self.patterns):
+            if pattern:
+                self._insert(pattern, index)
+        self._build_failure_links()
+
+    def _insert(self, pattern, index):
+        node = 0
+        for char in pattern:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = next_node
+        self.outputs[node].append(index)
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(char, 0)
+                self.fail[child] = fallback if fallback != child else 0
+                # 실패 링크 쪽 출력도 미리 합쳐 매칭 시 따라갈 필요 없게 함
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def search(self, text):
+        """텍스트에 나타난 패턴 번호 집합"""
+        found = set()
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return found
+
+
+class KeywordFilter:
+    """구독자별 포함/제외 키워드 필터"""
+
+    def __init__(self, rules):
+        """rules: {구독자: {'include': [...], 'exclude': [...]}}"""
+        self.subscribers = list(rules)
+        self.includes = {}
+        keyword_ids = {}
+        owners = []  # 키워드 번호 -> [(구독자, 종류)]
+
+        for subscriber, keywords in rules.items():
+            keywords = keywords or {}
+            self.includes[subscriber] = bool(keywords.get('include'))
+            for kind in ('include', 'exclude'):
+                for keyword in keywords.get(kind, []):
+                    keyword = keyword.strip().lower()
+                    if not keyword:
+                        continue
+                    if keyword not in keyword_ids:
+                        keyword_ids[keyword] = len(owners)
+                        owners.append([])
+                    owners[keyword_ids[keyword]].append((subscriber, kind))
+
+        self.owners = owners
+        self.automaton = AhoCorasick(keyword_ids)
+
+    @classmethod
+    def from_config(cls, config):
+        """config의 keywords(기본 채팅)와 subscribers[].keywords로 필터 생성"""
+        rules = {DEFAULT_SUBSCRIBER: config.get('keywords', {})}
+        for subscriber in config.get('subscribers', []):
+            chat_id = str(subscriber.get('chat_id', ''))
+            if chat_id:
+                rules[chat_id] = subscriber.get('keywords', config.get('keywords', {}))
+        return cls(rules)
+
+    def route(self, text):
+        """텍스트를 받아야 하는 구독자 집합"""
+        included = set()
+        excluded = set()
+        for keyword_id in self.automaton.search((text or '').lower()):
+            for subscriber, kind in self.owners[keyword_id]:
+                (included if kind == 'include' else excluded).add(subscriber)
+
+        return {
+            subscriber for subscriber in self.subscribers
+            if subscriber not in excluded
+            and (not self.includes[subscriber] or subscriber in included)
+        }
+
+    def allows(self, text, subscriber=DEFAULT_SUBSCRIBER):
+        """구독자가 텍스트를 받아야 하는지 확인"""
+        return subscriber in self.route(text)
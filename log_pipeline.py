@@ -0,0 +1,193 @@
+"""
+로깅 파이프라인 모듈 - 파일 쓰기를 별도 스레드로 넘기는 비동기 로깅
+
+로그 호출은 QueueHandler로 큐에 넣기만 하고, 파일·콘솔 출력은 QueueListener 스레드가 처리하므로
+수집·전송 중에 디스크 I/O를 기다리지 않습니다.
+
+- 회전: 크기(rotation.max_mb, backup_count) 또는 시간(rotation.when, backup_count) 기준
+- 형식: text(기존 형식) 또는 json(한 줄에 JSON 하나, 모니터링 1회마다 바뀌는 cycle_id 포함)
+- 표본 추출: 같은 위치에서 반복되는 경고는 window_seconds마다 burst개까지만 기록하고 생략한 개수를 알림
+- 샤드 작업 프로세스는 상위 프로세스의 큐로 기록을 보내 로그 파일 하나를 함께 씁니다
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime, timezone
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_cycle_id = '-'
+_listener = None
+_output_handlers = []
+
+
+def new_cycle_id():
+    """모니터링 1회의 상관 ID 발급 (이후 모든 로그 기록에 cycle_id로 붙음)"""
+    global _cycle_id
+    _cycle_id = uuid.uuid4().hex[:12]
+    return _cycle_id
+
+
+def current_cycle_id():
+    return _cycle_id
+
+
+class CycleContextFilter(logging.Filter):
+    """로그 호출 시점의 cycle_id를 기록에 추가 (큐에 넣기 전, 호출 스레드에서 실행)"""
+
+    def filter(self, record):
+        if not hasattr(record, 'cycle_id'):
+            record.cycle_id = _cycle_id
+        return True
+
+
+class WarningSampler(logging.Filter):
+    """같은 호출 위치(파일, 줄)의 WARNING 기록을 window_seconds마다 burst개까지만 통과"""
+
+    def __init__(self, burst=5, window_seconds=60):
+        super().__init__()
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._windows = {}  # (파일, 줄) -> [구간 시작, 통과 수, 생략 수]
+
+    def filter(self, record):
+        if record.levelno != logging.WARNING:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    # 지난 구간에서 생략한 개수를 이번 기록에 덧붙임
+                    record.msg = f"{record.getMessage()} (지난 {self.window_seconds}초 동안 같은 경고 {suppressed}건 생략)"
+                    record.args = None
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON Lines 형식 (시각, 수준, 로거, 메시지, cycle_id, 프로세스, 예외)"""
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'cycle_id': getattr(record, 'cycle_id', '-'),
+            'process': record.processName,
+        }
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """메시지와 예외 추적을 따로 보존해 큐에 넣음 (JSON 형식에서 exception 항목으로 기록)"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        # 다른 프로세스 큐로도 보낼 수 있도록 피클할 수 없는 값 제거
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _file_handler(log_file, rotation):
+    """회전 설정에 맞는 파일 핸들러 (when이 있으면 시간 기준, 아니면 크기 기준)"""
+    backup_count = rotation.get('backup_count', 5)
+    if rotation.get('when'):
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when=rotation['when'], backupCount=backup_count, encoding='utf-8'
+        )
+    max_bytes = int(rotation.get('max_mb', 10) * 1024 * 1024)
+    return logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+
+
+def _install_queue_handler(log_queue, level, sample_config):
+    """루트 로거에 QueueHandler 하나만 연결 (cycle_id 추가, 경고 표본 추출은 호출 스레드에서)"""
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(CycleContextFilter())
+    if sample_config and sample_config.get('burst'):
+        queue_handler.addFilter(WarningSampler(sample_config['burst'], sample_config.get('window_seconds', 60)))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+
+def start_logging(logging_config):
+    """큐 기반 로깅 시작 (파일·콘솔 출력은 QueueListener 스레드에서), 종료 시 남은 기록을 모두 씀"""
+    global _listener, _output_handlers
+
+    level = getattr(logging, logging_config.get('level', 'INFO').upper())
+    log_file = logging_config.get('file', 'news_monitor.log')
+    log_dir = os.path.dirname(log_file)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = _file_handler(log_file, logging_config.get('rotation', {}))
+    if logging_config.get('format', 'text') == 'json':
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+    _output_handlers = [file_handler, console_handler]
+
+    stop_logging()
+    log_queue = queue.SimpleQueue()
+    _install_queue_handler(log_queue, level, logging_config.get('sample_warnings'))
+    _listener = logging.handlers.QueueListener(log_queue, *_output_handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """QueueListener 정지 (큐에 남은 기록을 모두 쓴 뒤 반환)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def listen(log_queue):
+    """다른 프로세스가 보낸 기록을 현재 출력 핸들러로 쓰는 리스너 (샤드 모드 상위 프로세스)"""
+    if not _output_handlers:
+        return None
+    listener = logging.handlers.QueueListener(log_queue, *_output_handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def start_worker_logging(log_queue, logging_config):
+    """작업 프로세스: 모든 기록을 상위 프로세스의 큐로 보냄"""
+    level = getattr(logging, logging_config.get('level', 'INFO').upper())
+    _install_queue_handler(log_queue, level, logging_config.get('sample_warnings'))
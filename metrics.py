@@ -0,0 +1,184 @@
+"""
+지표 모듈 - 단계별 소요 시간과 카운터 수집 및 내보내기
+
+수집, 파싱, 중복 제거, 본문 보강, 전송 단계의 소요 시간과 텔레그램 API 응답을 모아
+상주 모드에서는 Prometheus 텍스트 형식 HTTP 엔드포인트로, 단일 실행에서는 JSON 요약 파일로 내보냅니다.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = 'yonhap_'
+
+HELP = {
+    'stage_seconds': '모니터링 단계별 소요 시간',
+    'cycle_seconds': '모니터링 1회 전체 소요 시간',
+    'fetch_seconds': '페이지별 수집 소요 시간',
+    'fetch_results_total': '페이지별 수집 결과 (ok / not_modified / error)',
+    'fetch_retries_total': '호스트별 페이지 요청 재시도 수',
+    'fetch_hedges_total': '호스트별 헤지 요청 수 (먼저 응답한 쪽: primary / hedge / none)',
+    'circuit_state': '호스트별 회로 차단기 상태 (0 닫힘, 1 반열림, 2 열림)',
+    'articles_total': '단계별 기사 수 (collected / new / near_duplicate / keyword_filtered / claimed_elsewhere / expired)',
+    'messages_total': '발신함 전송 결과 (enqueued / sent / failed)',
+    'telegram_request_seconds': '텔레그램 API 호출 지연',
+    'telegram_responses_total': '텔레그램 API 응답 상태 코드',
+    'http_cache_total': 'HTTP 응답 캐시 조회 결과 (hit / revalidated / miss / bypass)',
+    'search_seconds': '/search 명령 검색 소요 시간',
+    'store_articles': '처리된 기사 저장소의 기사 수',
+    'store_bytes': '처리된 기사 저장소 파일 크기',
+    'outbox_pending': '발신함 대기 메시지 수',
+    'poll_interval_seconds': '적응형 스케줄러가 정한 소스별 다음 확인 주기',
+    'last_run_timestamp_seconds': '마지막 모니터링 완료 시각 (유닉스 시간)',
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in key) + '}'
+
+
+class Metrics:
+    """스레드 안전한 카운터·게이지·소요 시간 수집기"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.counters = {}  # 이름 -> {라벨: 값}
+        self.gauges = {}    # 이름 -> {라벨: 값}
+        self.timings = {}   # 이름 -> {라벨: [횟수, 합계, 최대]}
+        self.last_cycle = {}  # 최근 모니터링 1회의 단계별 소요 시간
+
+    def inc(self, name, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name, seconds, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self.timings.setdefault(name, {})
+            stats = series.setdefault(key, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def begin_cycle(self):
+        with self._lock:
+            self.last_cycle = {}
+
+    @contextmanager
+    def stage(self, name):
+        """모니터링 단계 소요 시간 기록 (stage_seconds와 최근 1회 소요 시간에 반영)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe('stage_seconds', elapsed, stage=name)
+            with self._lock:
+                self.last_cycle[name] = self.last_cycle.get(name, 0) + elapsed
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines += self._header(name, 'counter')
+                for key, value in sorted(series.items()):
+                    lines.append(f"{PREFIX}{name}{_format_labels(key)} {value}")
+            for name, series in sorted(self.gauges.items()):
+                lines += self._header(name, 'gauge')
+                for key, value in sorted(series.items()):
+                    lines.append(f"{PREFIX}{name}{_format_labels(key)} {value}")
+            for name, series in sorted(self.timings.items()):
+                lines += self._header(name, 'summary')
+                for key, (count, total, _) in sorted(series.items()):
+                    labels = _format_labels(key)
+                    lines.append(f"{PREFIX}{name}_count{labels} {count}")
+                    lines.append(f"{PREFIX}{name}_sum{labels} {total:.6f}")
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _header(name, kind):
+        lines = []
+        if name in HELP:
+            lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        return lines
+
+    def summary(self):
+        """JSON 요약 ({이름: {라벨 문자열: 값}}, 소요 시간은 횟수·합계·최대)"""
+        def flatten(series, convert=lambda v: v):
+            return {_format_labels(key) or 'total': convert(value) for key, value in sorted(series.items())}
+
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'generated_at': time.time(),
+                'last_cycle_seconds': {name: round(value, 6) for name, value in self.last_cycle.items()},
+                'counters': {name: flatten(series) for name, series in self.counters.items()},
+                'gauges': {name: flatten(series) for name, series in self.gauges.items()},
+                'timings': {
+                    name: flatten(series, lambda v: {
+                        'count': v[0], 'sum_seconds': round(v[1], 6), 'max_seconds': round(v[2], 6)
+                    })
+                    for name, series in self.timings.items()
+                },
+            }
+
+    def write_summary(self, filename):
+        """JSON 요약 파일 저장"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+
+class MetricsServer:
+    """/metrics (Prometheus 텍스트)와 /metrics.json을 제공하는 HTTP 서버 (백그라운드 스레드)"""
+
+    def __init__(self, metrics, host='127.0.0.1', port=9108):
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path == '/metrics':
+                    body = metrics.render_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/metrics.json':
+                    body = json.dumps(metrics.summary(), ensure_ascii=False).encode('utf-8')
+                    content_type = 'application/json; charset=utf-8'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        host, port = self.httpd.server_address[:2]
+        logging.info(f"지표 엔드포인트: http://{host}:{port}/metrics")
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,154 @@
+"""
+유사 기사 감지 모듈 - 제목 MinHash LSH 색인
+
+제목을 정규화한 뒤 한글 음절 bigram shingle로 MinHash 서명을 만들고,
+서명을 구간(band)으로 나눈 LSH 버킷에서 후보만 골라 유사도를 확인합니다.
+제목이 한두 단어 바뀌거나 다른 URL로 다시 올라온 기사를 걸러냅니다.
+
+짧은 헤드라인에서는 SimHash 해밍 거리로 유사/비유사 제목이 잘 구분되지 않아
+Jaccard 유사도를 추정하는 MinHash를 사용합니다.
+"""
+
+import hashlib
+import random
+import re
+import time
+from array import array
+
+SHINGLE_SIZE = 2
+NUM_BANDS = 10
+ROWS_PER_BAND = 3
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+# 0.55 정도면 '상승'/'하락'처럼 한 단어만 다른 반대 소식(약 0.7)도 같은 기사로 봄
+DEFAULT_THRESHOLD = 0.8
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# 실행마다 같은 서명이 나오도록 고정 시드 사용 (저장된 서명과 호환)
+_rng = random.Random(20250809)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+# 한글, 영문, 숫자 외 문자 제거 (따옴표, 말줄임표, 기호 등)
+NORMALIZE_PATTERN = re.compile(r'[^0-9a-z가-힣一-龥]+')
+# [속보], (1보), <그래픽> 같은 머리말
+PREFIX_PATTERN = re.compile(r'^\s*[\[(〈<【][^\])〉>】]{1,10}[\])〉>】]')
+
+
+def normalize_title(title):
+    """머리말과 기호, 공백을 제거한 소문자 제목"""
+    title = PREFIX_PATTERN.sub('', title or '')
+    return NORMALIZE_PATTERN.sub('', title.lower())
+
+
+def shingles(title, size=SHINGLE_SIZE):
+    """정규화한 제목의 문자 n-gram 집합"""
+    text = normalize_title(title)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(title):
+    """제목의 MinHash 서명 (array('I'), 빈 제목이면 None)"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+        for s in shingles(title)
+    ]
+    if not hashes:
+        return None
+
+    return array('I', (
+        min((a * h + b) % MERSENNE_PRIME for h in hashes) & MAX_HASH
+        for a, b in PERMUTATIONS
+    ))
+
+
+def signature_to_hex(signature):
+    return signature.tobytes().hex() if signature is not None else None
+
+
+def signature_from_hex(value):
+    """저장된 16진수 서명 복원 (형식이 맞지 않으면 None)"""
+    try:
+        signature = array('I', bytes.fromhex(value))
+    except (TypeError, ValueError):
+        return None
+    return signature if len(signature) == NUM_PERM else None
+
+
+def estimate_similarity(a, b):
+    """두 서명의 Jaccard 유사도 추정값"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+class MinHashLSHIndex:
+    """MinHash LSH 색인 (추정 유사도 threshold 이상 검색, 항목마다 추가 시각 보관)"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.signatures = array('I')  # 모든 서명을 연속 배열에 보관
+        self.timestamps = array('d')  # 항목별 처리 시각 (epoch 초)
+        self.keys = []
+        self.buckets = [{} for _ in range(NUM_BANDS)]
+
+    def _band_keys(self, signature):
+        for band in range(NUM_BANDS):
+            start = band * ROWS_PER_BAND
+            yield band, hash(tuple(signature[start:start + ROWS_PER_BAND]))
+
+    def _signature_at(self, position):
+        start = position * NUM_PERM
+        return self.signatures[start:start + NUM_PERM]
+
+    def add(self, signature, key=None, timestamp=None):
+        """서명 추가 (timestamp: 처리 시각 epoch 초, 기본 현재)"""
+        if signature is None:
+            return
+        position = len(self.keys)
+        self.signatures.extend(signature)
+        self.timestamps.append(timestamp if timestamp is not None else time.time())
+        self.keys.append(key)
+
+        for band, band_key in self._band_keys(signature):
+            bucket = self.buckets[band]
+            existing = bucket.get(band_key)
+            if existing is None:
+                bucket[band_key] = position
+            elif isinstance(existing, list):
+                existing.append(position)
+            else:
+                bucket[band_key] = [existing, position]
+
+    def find(self, signature, since=None):
+        """유사도가 threshold 이상인 가장 비슷한 항목의 (키, 유사도), 없으면 None
+
+        since(epoch 초)를 주면 그 이후에 추가된 항목만 비교합니다.
+        """
+        if signature is None:
+            return None
+
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            positions = self.buckets[band].get(band_key)
+            if positions is None:
+                continue
+            if isinstance(positions, list):
+                candidates.update(positions)
+            else:
+                candidates.add(positions)
+
+        best = None
+        for position in candidates:
+            if since is not None and self.timestamps[position] < since:
+                continue
+            similarity = estimate_similarity(signature, self._signature_at(position))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (self.keys[position], similarity)
+        return best
+
+    def __len__(self):
+        return len(self.keys)
@@ -0,0 +1,295 @@
+"""
+뉴스 소스 모듈 - 설정된 뉴스 페이지 목록과 동시 수집
+
+config.json의 news_sources 항목은 URL 문자열 또는
+{"url": ..., "timeout": ...} 형태로 지정할 수 있습니다.
+
+요청은 fetching.retry(지터를 둔 재시도), fetching.hedge(느린 요청에 헤지 요청),
+fetching.circuit_breaker(호스트별 회로 차단기) 설정을 따릅니다 (fetch_policy 참고).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import HttpCache, HIT
+from fetch_policy import CircuitBreaker, CircuitOpenError, LatencyTracker, CLOSED, STATE_VALUES, backoff_delay
+
+DEFAULT_HEADLINE_URL = "https://www.yna.co.kr/report/headline?site=wholemenu_headline"
+DEFAULT_TIMEOUT = 30
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+class NewsSource:
+    """수집 대상 페이지 (cache_ttl: 응답 캐시 기본 보관 초, 없으면 fetching.cache.page_ttl_minutes)"""
+
+    def __init__(self, name, url, timeout=DEFAULT_TIMEOUT, cache_ttl=None):
+        self.name = name
+        self.url = url
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.host = urlparse(url).netloc
+
+    def __repr__(self):
+        return f"NewsSource({self.name!r}, {self.url!r})"
+
+
+class FetchResult:
+    """소스별 수집 결과 (status: ok / not_modified / error)"""
+
+    def __init__(self, source, status, content=None, error=None, elapsed=0.0):
+        self.source = source
+        self.status = status
+        self.content = content
+        self.error = error
+        self.elapsed = elapsed
+
+
+def load_news_sources(config):
+    """설정에서 뉴스 소스 목록 생성"""
+    fetching = config.get('fetching', {})
+    default_timeout = fetching.get('timeout', DEFAULT_TIMEOUT)
+    sources = []
+
+    for name, value in config.get('news_sources', {}).items():
+        if isinstance(value, str):
+            sources.append(NewsSource(name, value, default_timeout))
+        elif isinstance(value, dict) and value.get('url'):
+            sources.append(NewsSource(name, value['url'], value.get('timeout', default_timeout)))
+        else:
+            logging.warning(f"뉴스 소스 설정 오류: {name}")
+
+    if not sources:
+        sources.append(NewsSource('yonhap_headlines', DEFAULT_HEADLINE_URL, default_timeout))
+
+    return sources
+
+
+class SourceFetcher:
+    """keep-alive 세션을 공유하며 여러 소스를 동시에 수집 (재시도, 헤지 요청, 호스트별 회로 차단기)"""
+
+    def __init__(self, fetching_config=None, metrics=None):
+        fetching_config = fetching_config or {}
+        self.max_workers = fetching_config.get('max_workers', 8)
+        self.per_host_limit = fetching_config.get('per_host_limit', 4)
+        self.metrics = metrics
+        self.logger = logging.getLogger(__name__)
+
+        # 재시도 (기본: 재시도 없음)
+        retry_config = fetching_config.get('retry', {})
+        self.max_attempts = max(1, retry_config.get('attempts', 1))
+        self.backoff_seconds = retry_config.get('backoff_seconds', 0.5)
+        self.max_backoff_seconds = retry_config.get('max_backoff_seconds', 5)
+
+        # 헤지 요청 (선택, 요청은 별도 풀에서 실행하고 수집 스레드는 먼저 온 응답을 기다림)
+        hedge_config = fetching_config.get('hedge', {})
+        self.latency = LatencyTracker.from_config(hedge_config) if hedge_config.get('enabled', False) else None
+        self.hedge_executor = ThreadPoolExecutor(
+            max_workers=self.max_workers * 2, thread_name_prefix='news-hedge'
+        ) if self.latency is not None else None
+
+        # 호스트별 회로 차단기
+        self.breaker_config = fetching_config.get('circuit_breaker', {})
+        self._breakers = {}
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        pool_size = self.max_workers * 2 if self.latency is not None else self.max_workers
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                           thread_name_prefix='news-fetch')
+
+        # 조건부 요청용 검증자 (URL -> ETag / Last-Modified / 마지막으로 받은 본문 해시)
+        self.http_validators = {}
+
+        # 응답 캐시 (헤드라인 페이지와 기사 본문 수집이 공유, 선택)
+        cache_config = fetching_config.get('cache', {})
+        self.cache = HttpCache(cache_config, metrics) if cache_config.get('enabled', False) else None
+        self.page_ttl = cache_config.get('page_ttl_minutes', 0) * 60
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, host):
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def _breaker(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker.from_config(self.breaker_config)
+            return self._breakers[host]
+
+    def _inc(self, name, **labels):
+        if self.metrics is not None:
+            self.metrics.inc(name, **labels)
+
+    def _get(self, source, headers, timeout):
+        """요청 1회 (호스트별 동시 요청 제한, 캐시 경유), 네트워크 응답 지연은 헤지 시점 계산에 기록"""
+        with self._host_semaphore(source.host):
+            started = time.monotonic()
+            if self.cache is not None:
+                ttl = self.page_ttl if source.cache_ttl is None else source.cache_ttl
+                response = self.cache.get(self.session, source.url, timeout=timeout,
+                                          headers=headers, default_ttl=ttl)
+            else:
+                response = self.session.get(source.url, headers=headers, timeout=timeout)
+        if self.latency is not None and getattr(response, 'cache_status', None) != HIT:
+            self.latency.record(source.host, time.monotonic() - started)
+        return response
+
+    def _request(self, source, headers, deadline, hedge):
+        """요청 (hedge면 첫 요청이 p95 지연 안에 끝나지 않을 때 한 번 더 보내고 먼저 온 응답 사용)"""
+        timeout = max(0.1, deadline - time.monotonic())
+        if self.latency is None or not hedge:
+            return self._get(source, headers, timeout)
+
+        hedge_delay = self.latency.hedge_delay(source.host)
+        primary = self.hedge_executor.submit(self._get, source, headers, timeout)
+        try:
+            return primary.result(timeout=min(hedge_delay, timeout))
+        except FutureTimeoutError:
+            pass
+
+        if time.monotonic() >= deadline or not self.latency.take_hedge(source.host):
+            # 헤지 없이 기다리다 제한 시간을 넘기면 헤지하지 않은 요청과 같은 Timeout으로 (재시도·회로 차단기 반영)
+            try:
+                return primary.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                raise requests.exceptions.Timeout(f"{source.timeout}초 안에 응답 없음") from None
+
+        backup = self.hedge_executor.submit(self._get, source, headers, max(0.1, deadline - time.monotonic()))
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    # 늦은 쪽 응답은 버림 (진행 중인 요청은 취소할 수 없음)
+                    self._inc('fetch_hedges_total', host=source.host,
+                              winner='hedge' if future is backup else 'primary')
+                    return future.result()
+                error = future.exception()
+
+        self._inc('fetch_hedges_total', host=source.host, winner='none')
+        raise error or requests.exceptions.Timeout(f"{source.timeout}초 안에 응답 없음")
+
+    def _get_with_retry(self, source, headers, deadline):
+        """회로 차단기를 확인하며 요청, 연결 오류·시간 초과·5xx·429는 지터를 둔 간격으로 재시도"""
+        breaker = self._breaker(source.host)
+        attempt = 1
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"{source.host} 연속 실패로 요청 중단 "
+                                       f"({breaker.retry_after():.0f}초 후 다시 확인)")
+            try:
+                response = self._request(source, headers, deadline, hedge=breaker.state == CLOSED)
+                if response.status_code in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                if breaker.record_failure():
+                    self.logger.warning(f"[{source.host}] 연속 실패로 회로 열림, "
+                                        f"{breaker.retry_after():.0f}초 동안 요청하지 않음: {e}")
+                    self._set_breaker_gauge(source.host, breaker)
+                    raise
+                delay = backoff_delay(attempt, self.backoff_seconds, self.max_backoff_seconds)
+                if attempt >= self.max_attempts or time.monotonic() + delay >= deadline:
+                    raise
+                self._inc('fetch_retries_total', host=source.host)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if breaker.record_success():
+                self.logger.info(f"[{source.host}] 응답 확인, 회로 닫힘")
+                self._set_breaker_gauge(source.host, breaker)
+            return response
+
+    def _set_breaker_gauge(self, host, breaker):
+        if self.metrics is not None:
+            self.metrics.set_gauge('circuit_state', STATE_VALUES[breaker.state], host=host)
+
+    def fetch(self, source):
+        """소스 1개 수집 (이전 응답의 검증자로 조건부 요청, source.timeout 안에서 재시도·헤지)"""
+        started = time.monotonic()
+        headers = {}
+        validators = self.http_validators.get(source.url, {})
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        try:
+            response = self._get_with_retry(source, headers, started + source.timeout)
+
+            if response.status_code == 304:
+                return FetchResult(source, 'not_modified', elapsed=time.monotonic() - started)
+
+            response.raise_for_status()
+
+            # 캐시에서 꺼냈거나 검증자 없이 같은 본문을 다시 받았으면 변경 없음으로 처리
+            content_hash = hashlib.md5(response.content).hexdigest()
+            if content_hash == validators.get('content_hash'):
+                return FetchResult(source, 'not_modified', elapsed=time.monotonic() - started)
+
+            self.http_validators[source.url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_hash': content_hash
+            }
+            return FetchResult(source, 'ok', content=response.content,
+                               elapsed=time.monotonic() - started)
+
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
+            return FetchResult(source, 'error', error=e, elapsed=time.monotonic() - started)
+
+    def fetch_page(self, url, timeout=DEFAULT_TIMEOUT, cache_ttl=None):
+        """기사 본문 등 소스 목록 밖의 페이지 1개 수집 (본문 반환)
+
+        헤드라인 수집과 같은 호스트별 동시 요청 제한·회로 차단기·재시도를 거치며,
+        실패하면 requests 예외 또는 CircuitOpenError를 냅니다.
+        """
+        source = NewsSource(url, url, timeout, cache_ttl)
+        response = self._get_with_retry(source, {}, time.monotonic() + timeout)
+        response.raise_for_status()
+        return response.content
+
+    def fetch_all(self, sources):
+        """여러 소스를 동시에 수집 (소스별 제한 시간을 넘기면 이번 주기에서 제외)"""
+        if not sources:
+            return []
+
+        started = time.monotonic()
+        futures = [(source, self.executor.submit(self.fetch, source)) for source in sources]
+
+        results = []
+        for source, future in futures:
+            remaining = max(0, started + source.timeout - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                future.cancel()
+                results.append(FetchResult(source, 'error', error=TimeoutError(
+                    f"{source.timeout}초 안에 응답 없음"), elapsed=time.monotonic() - started))
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.hedge_executor is not None:
+            self.hedge_executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
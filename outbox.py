@@ -0,0 +1,196 @@
+"""
+발신함 모듈 - SQLite 기반 영속 메시지 큐 (최소 1회 전송)
+
+보낼 메시지를 먼저 기록한 뒤 일괄 전송하고, 메시지마다 pending / sending / sent / failed
+상태를 남깁니다. (채팅, 기사 해시)로 만든 멱등 키가 같은 메시지는 다시 넣지 않으며,
+전송 성공은 메시지마다 바로 기록하므로 중간에 중단돼도 보낸 메시지를 다시 보내지 않습니다.
+"""
+
+import logging
+import sqlite3
+import time
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+class Outbox:
+    """텔레그램 발신함"""
+
+    def __init__(self, filename, max_attempts=5, retention_days=7, recover=True):
+        self.filename = filename
+        self.max_attempts = max_attempts
+        self.retention_days = retention_days
+
+        # 여러 프로세스가 함께 쓰면 쓰기 잠금을 기다림 (샤드 모드)
+        self.conn = sqlite3.connect(filename, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                chat_id TEXT NOT NULL,
+                text TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 1,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, priority, id)"
+        )
+        self.conn.commit()
+
+        # 이전 실행이 전송 도중 중단됐으면 결과를 알 수 없으므로 다시 대기 상태로 (최소 1회 전송)
+        # 전송하지 않는 프로세스(샤드 작업 프로세스)는 전송 중인 상태를 건드리지 않음
+        if not recover:
+            return
+        with self.conn:
+            recovered = self.conn.execute(
+                "UPDATE outbox SET status = ? WHERE status = ?", (PENDING, SENDING)
+            ).rowcount
+        if recovered:
+            logging.warning(f"전송 도중 중단된 메시지 {recovered}개 재전송 대기")
+
+    def enqueue(self, deliveries):
+        """메시지 추가 (멱등 키가 이미 있으면 무시), 새로 추가된 개수 반환
+
+        deliveries: [{'key': ..., 'chat_id': ..., 'text': ..., 'priority': ...}]
+        """
+        now = time.time()
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO outbox "
+                "(idempotency_key, chat_id, text, priority, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (d['key'], str(d['chat_id']), d['text'], d.get('priority', 1), PENDING, now, now)
+                    for d in deliveries
+                ]
+            )
+            return self.conn.total_changes - before
+
+    def claim(self, limit_per_chat=None, batch_size=100, chat_limits=None):
+        """대기 중인 메시지를 우선순위 순으로 가져와 sending으로 표시
+
+        chat_limits: {chat_id: 개수} 채팅별로 limit_per_chat 대신 적용할 개수
+        """
+        limit_per_chat = limit_per_chat or batch_size
+        chat_limits = {str(chat_id): limit for chat_id, limit in (chat_limits or {}).items()}
+        max_limit = max([limit_per_chat] + list(chat_limits.values()))
+        rows = self.conn.execute("""
+            SELECT id, chat_id, text, priority, rank FROM (
+                SELECT id, chat_id, text, priority,
+                       ROW_NUMBER() OVER (PARTITION BY chat_id ORDER BY priority, id) AS rank
+                FROM outbox WHERE status = ?
+            ) WHERE rank <= ? ORDER BY priority, id
+        """, (PENDING, max_limit)).fetchall()
+        rows = [
+            row for row in rows if row[4] <= chat_limits.get(row[1], limit_per_chat)
+        ][:batch_size]
+
+        if rows:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE outbox SET status = ?, updated_at = ? WHERE id = ?",
+                    [(SENDING, now, row[0]) for row in rows]
+                )
+
+        return [
+            {'id': row[0], 'chat_id': row[1], 'text': row[2], 'priority': row[3]}
+            for row in rows
+        ]
+
+    def mark_sent(self, message_id):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (SENT, time.time(), message_id)
+            )
+
+    def mark_failed(self, message_id, error=None):
+        """실패 기록 (최대 시도 횟수 전까지는 다시 대기 상태로)"""
+        with self.conn:
+            self.conn.execute("""
+                UPDATE outbox SET
+                    attempts = attempts + 1,
+                    status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END,
+                    last_error = ?, updated_at = ?
+                WHERE id = ?
+            """, (self.max_attempts, FAILED, PENDING, error, time.time(), message_id))
+
+    def release(self, message_ids):
+        """가져왔지만 보내지 않은 메시지를 대기 상태로 되돌림"""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE outbox SET status = ? WHERE id = ? AND status = ?",
+                [(PENDING, message_id, SENDING) for message_id in message_ids]
+            )
+
+    def drain(self, send_batch, limit_per_chat=None, batch_size=100, chat_limits=None):
+        """대기 메시지 전송 (채팅당 limit_per_chat개까지), (성공, 실패) 개수 반환
+
+        send_batch(deliveries, on_result)는 메시지마다 결과가 나오는 즉시
+        on_result(index, success)를 호출해야 합니다.
+        """
+        batch = self.claim(limit_per_chat, batch_size, chat_limits)
+        if not batch:
+            return 0, 0
+
+        counts = {'sent': 0, 'failed': 0}
+        reported = set()
+
+        def on_result(index, success):
+            reported.add(index)
+            if success:
+                self.mark_sent(batch[index]['id'])
+                counts['sent'] += 1
+            else:
+                self.mark_failed(batch[index]['id'], '전송 실패')
+                counts['failed'] += 1
+
+        try:
+            send_batch(batch, on_result)
+        finally:
+            unreported = [m['id'] for i, m in enumerate(batch) if i not in reported]
+            if unreported:
+                self.release(unreported)
+
+        return counts['sent'], counts['failed']
+
+    def pending_count(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM outbox WHERE status = ?", (PENDING,)
+        ).fetchone()[0]
+
+    def chat_stats(self):
+        """채팅별 상태별 메시지 수 {chat_id: {status: count}}"""
+        stats = {}
+        for chat_id, status, count in self.conn.execute(
+            "SELECT chat_id, status, COUNT(*) FROM outbox GROUP BY chat_id, status"
+        ):
+            stats.setdefault(chat_id, {})[status] = count
+        return stats
+
+    def purge(self):
+        """보관 기간이 지난 전송 완료·실패 메시지 삭제"""
+        if not self.retention_days:
+            return 0
+        cutoff = time.time() - self.retention_days * 86400
+        with self.conn:
+            return self.conn.execute(
+                "DELETE FROM outbox WHERE status IN (?, ?) AND updated_at < ?",
+                (SENT, FAILED, cutoff)
+            ).rowcount
+
+    def close(self):
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.close()
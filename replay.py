@@ -0,0 +1,202 @@
+"""
+재실행 모듈 - 저장해 둔 헤드라인 페이지로 파싱·중복 제거·포맷 단계를 다시 실행
+
+파싱이나 중복 제거 규칙을 바꾼 뒤 과거 페이지에서 어떤 알림이 나갔을지 확인하는 용도입니다.
+디렉터리 또는 tar 묶음(.tar, .tar.gz 등)의 HTML 파일(.gz 압축 가능)을 이름 순(tar는 묶음 순서)으로
+읽어 프로세스 풀에서 파싱하고, 결과는 원래 순서대로 monitor_news와 같은 중복 제거·키워드 필터·
+메시지 포맷을 거칩니다. 텔레그램 전송, 발신함 기록, 본문 보강은 하지 않습니다.
+
+연도·날짜가 빠진 게재 시각과 알림 기간(monitoring.max_article_age_hours), 유사 제목 비교 기간은
+현재 시각 대신 페이지 저장 시각(파일 이름의 날짜·시각, 없으면 파일 수정 시각)을 기준으로 판단합니다.
+
+페이지는 제너레이터로 하나씩 읽고 동시에 처리 중인 페이지 수를 제한하며,
+알림은 JSON Lines 파일로 바로 기록하므로 묶음 크기와 관계없이 메모리 사용량이 일정합니다.
+중복 제거 기록은 임시 SQLite 저장소에 두고 storage.max_stored_articles·article_ttl_days를
+페이지 저장 시각 기준으로 그대로 적용합니다 (처리 시각도 페이지 저장 시각으로 기록).
+"""
+
+import copy
+import gzip
+import json
+import logging
+import os
+import re
+import tarfile
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from article import KST
+
+SNAPSHOT_SUFFIXES = ('.html', '.htm', '.html.gz', '.htm.gz')
+DEFAULT_SOURCE_ID = 'replay'
+
+# 파일 이름의 저장 시각 (20240809T103000, 2024-08-09_10-30, 202408091030 등, 시간대가 없으면 한국 표준시)
+SNAPSHOT_TIME_PATTERN = re.compile(
+    r'(?<!\d)(\d{4})-?(\d{2})-?(\d{2})[T_ -]?(\d{2})[:.-]?(\d{2})(?:[:.-]?(\d{2}))?(?!\d)'
+)
+
+
+def is_snapshot(name):
+    return name.lower().endswith(SNAPSHOT_SUFFIXES)
+
+
+def snapshot_source_id(name):
+    """상위 디렉터리 이름을 소스 이름으로 사용 (archive/<소스>/<시각>.html)"""
+    return os.path.basename(os.path.dirname(name)) or DEFAULT_SOURCE_ID
+
+
+def snapshot_time(name, mtime=None):
+    """페이지 저장 시각 (파일 이름의 날짜·시각, 없으면 수정 시각, 둘 다 없으면 None)"""
+    match = SNAPSHOT_TIME_PATTERN.search(os.path.basename(name))
+    if match:
+        try:
+            return datetime(*(int(part or 0) for part in match.groups()), tzinfo=KST)
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(mtime, KST) if mtime else None
+
+
+def iter_snapshots(path):
+    """(이름, 내용 bytes, 저장 시각)을 하나씩 반환 (디렉터리는 경로 이름 순, tar 묶음은 묶음 순서)"""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if is_snapshot(filename):
+                    full_path = os.path.join(root, filename)
+                    with open(full_path, 'rb') as f:
+                        content = f.read()
+                    yield (os.path.relpath(full_path, path), content,
+                           snapshot_time(filename, os.path.getmtime(full_path)))
+        return
+
+    # 스트림 모드로 열어 묶음 전체 목록을 메모리에 두지 않음
+    with tarfile.open(path, 'r|*') as archive:
+        for member in archive:
+            if member.isfile() and is_snapshot(member.name):
+                yield member.name, archive.extractfile(member).read(), snapshot_time(member.name, member.mtime)
+
+
+def parse_snapshot(name, content, backend, now=None):
+    """프로세스 풀 작업: 페이지 파싱 후 (이름, 기사 목록, 파싱 초, 저장 시각) 반환"""
+    from headline_parser import parse_headlines
+
+    started = time.perf_counter()
+    if name.lower().endswith('.gz'):
+        content = gzip.decompress(content)
+    articles = parse_headlines(content, backend, now)
+    return name, articles, time.perf_counter() - started, now
+
+
+def iter_parsed(snapshots, backend, workers):
+    """파싱 결과를 원래 순서대로 반환 (처리 중인 페이지는 workers × 2개까지)"""
+    if workers <= 1:
+        for name, content, now in snapshots:
+            yield parse_snapshot(name, content, backend, now)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for name, content, now in snapshots:
+            pending.append(pool.submit(parse_snapshot, name, content, backend, now))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def replay_config(config):
+    """재실행용 설정 (임시 저장소, 메모리 발신함, 네트워크를 쓰는 기능 끔)"""
+    config = copy.deepcopy(config)
+    config['telegram'] = dict({'bot_token': None, 'chat_id': None}, **config.get('telegram', {}))
+    config['enrichment'] = dict(config.get('enrichment', {}), enabled=False)
+    config['search'] = dict(config.get('search', {}), enabled=False)
+    config['outbox'] = dict(config.get('outbox', {}), file=':memory:')
+    fetching = config.setdefault('fetching', {})
+    fetching['cache'] = dict(fetching.get('cache', {}), enabled=False)
+    return config
+
+
+def replay(config, path, report_file, workers=None):
+    """path의 페이지들을 재실행하고 알림을 report_file(JSON Lines)에 기록, 요약 dict 반환
+
+    요약은 report_file 마지막 줄에도 {"summary": ...}로 기록됩니다.
+    """
+    from yonhap_news_monitor import YonhapNewsMonitor
+
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    counts = {'snapshots': 0, 'empty_snapshots': 0, 'collected': 0, 'new': 0, 'alerts': 0, 'messages': 0}
+    timings = {'parse': 0.0, 'dedup': 0.0, 'route': 0.0}
+    slowest = (0.0, None)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        config = replay_config(config)
+        config.setdefault('storage', {})['processed_articles_file'] = os.path.join(workdir, 'replay.db')
+        monitor = YonhapNewsMonitor(config)
+        try:
+            with open(report_file, 'w', encoding='utf-8') as report:
+                for name, articles, parse_seconds, now in iter_parsed(
+                        iter_snapshots(path), monitor.parser_backend, workers):
+                    counts['snapshots'] += 1
+                    counts['collected'] += len(articles)
+                    timings['parse'] += parse_seconds
+                    if parse_seconds > slowest[0]:
+                        slowest = (parse_seconds, name)
+                    if not articles:
+                        counts['empty_snapshots'] += 1
+                        logging.warning(f"[{name}] 기사를 찾지 못했습니다")
+                        continue
+
+                    source_id = snapshot_source_id(name)
+                    for article in articles:
+                        article['source_id'] = source_id
+
+                    t0 = time.perf_counter()
+                    new_articles = monitor.filter_new_articles(articles, now)
+                    # 처리 시각·LRU·TTL도 페이지 저장 시각 기준
+                    monitor.processed_articles.flush(now.timestamp() if now else None)
+                    t1 = time.perf_counter()
+                    counts['new'] += len(new_articles)
+
+                    for article in monitor.apply_keyword_filter(new_articles):
+                        message = monitor.format_article_message(article)
+                        chats = [monitor.subscriber_chats[s] for s in article['subscribers']
+                                 if monitor.subscriber_chats.get(s)]
+                        counts['alerts'] += 1
+                        counts['messages'] += len(chats)
+                        report.write(json.dumps({
+                            'snapshot': name,
+                            'title': article['title'],
+                            'link': article['link'],
+                            'source_id': source_id,
+                            'priority': monitor.article_priority(article),
+                            'chats': [str(chat_id) for chat_id in chats],
+                            'message': message,
+                        }, ensure_ascii=False) + '\n')
+                    timings['dedup'] += t1 - t0
+                    timings['route'] += time.perf_counter() - t1
+
+                    # 상주 모드와 같은 기준으로 유사 제목 색인 크기 제한
+                    if (monitor.near_duplicate_index is not None
+                            and len(monitor.near_duplicate_index) > 2 * max(len(monitor.processed_articles), 1000)):
+                        monitor.near_duplicate_index = None
+
+                elapsed = time.perf_counter() - started
+                summary = {
+                    'path': path,
+                    'workers': workers,
+                    'parser_backend': monitor.parser_backend,
+                    **counts,
+                    'elapsed_seconds': round(elapsed, 3),
+                    'snapshots_per_second': round(counts['snapshots'] / elapsed, 1) if elapsed else 0.0,
+                    'stage_seconds': {stage: round(seconds, 3) for stage, seconds in timings.items()},
+                    'slowest_parse': {'snapshot': slowest[1], 'seconds': round(slowest[0], 3)},
+                }
+                report.write(json.dumps({'summary': summary}, ensure_ascii=False) + '\n')
+        finally:
+            monitor.close()
+
+    return summary
@@ -0,0 +1,232 @@
+"""
+검색 색인 모듈 - 처리된 기사 제목(선택적으로 본문)의 문자 bigram 역색인
+
+제목을 단어로 나눠 단어 안의 글자 bigram(한 글자 단어는 그대로)을 토큰으로 쓰고,
+(토큰, 문서 번호) 게시 목록을 처리된 기사 저장소의 SQLite 파일에 함께 저장합니다.
+문서 번호는 색인한 순서대로 늘어나므로 번호가 클수록 최신 기사입니다.
+문서마다 제목·링크·처리 시각을 따로 보관하므로 중복 제거 저장소에서 정리된 기사도 검색되며,
+색인은 자체 보관 기간(ttl_days)과 최대 문서 수(max_documents)로 정리합니다.
+
+검색은 질의 토큰을 모두 포함한 기사를 최신 순으로 찾고(가장 드문 토큰의 게시 목록을 따라가며
+나머지 토큰은 기본 키로 확인), 모자라면 일부만 맞는 기사를 IDF 가중치 합 순으로 채웁니다.
+두 단계 모두 SQLite 안에서 처리하고 게시 목록을 읽는 양에 상한을 두므로 색인이 커져도 빠르게 응답합니다.
+"""
+
+import math
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+TOKEN_PATTERN = re.compile(r'[0-9a-z가-힣一-龥]+')
+# 토큰 하나에서 읽을 최대 게시 수 (문서 빈도 계산과 전체 일치 검색의 상한)
+MAX_POSTINGS_SCAN = 100000
+# 일부 일치 검색에 쓸 토큰의 최대 문서 빈도 (이보다 흔한 토큰은 순위에 거의 영향이 없음)
+MAX_PARTIAL_FREQUENCY = 20000
+
+
+def tokenize(text):
+    """단어 안 문자 bigram 집합 (한 글자 단어는 글자 그대로)"""
+    tokens = set()
+    for word in TOKEN_PATTERN.findall((text or '').lower()):
+        if len(word) == 1:
+            tokens.add(word)
+        else:
+            tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class SearchIndex:
+    """processed_articles와 같은 SQLite 파일에 두는 역색인"""
+
+    def __init__(self, conn, filename, max_documents=None, ttl_days=None):
+        self.conn = conn
+        self.filename = filename
+        self.max_documents = max_documents
+        self.ttl_days = ttl_days
+        self._reader = None
+        self._reader_lock = threading.Lock()
+
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_documents'"
+        ).fetchone()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_documents (
+                id INTEGER PRIMARY KEY,
+                hash TEXT NOT NULL UNIQUE,
+                title TEXT,
+                link TEXT,
+                processed_at TEXT
+            )
+        """)
+        self._migrate()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_postings (
+                token TEXT NOT NULL,
+                doc INTEGER NOT NULL,
+                PRIMARY KEY (token, doc)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_search_postings_doc ON search_postings (doc)")
+        # 보관 기간 정리용 (이전 버전 색인은 _migrate에서 열을 추가한 뒤 생성)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_search_documents_processed ON search_documents (processed_at)")
+        self.created = exists is None
+
+    def _migrate(self):
+        """이전 버전 색인: 문서 메타데이터 열 추가 후 처리된 기사 저장소에서 채움"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(search_documents)")}
+        if 'title' in columns:
+            return
+        for column in ('title', 'link', 'processed_at'):
+            self.conn.execute(f"ALTER TABLE search_documents ADD COLUMN {column} TEXT")
+        self.conn.execute("""
+            UPDATE search_documents SET (title, link, processed_at) = (
+                SELECT a.title, a.link, a.processed_at FROM processed_articles AS a
+                WHERE a.hash = search_documents.hash
+            )
+        """)
+
+    def _document_id(self, article_hash, info):
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO search_documents (hash, title, link, processed_at) VALUES (?, ?, ?, ?)",
+            (article_hash, info.get('title'), info.get('link'), info.get('processed_at'))
+        )
+        if cursor.rowcount:
+            return cursor.lastrowid
+        return self.conn.execute("SELECT id FROM search_documents WHERE hash = ?", (article_hash,)).fetchone()[0]
+
+    def add(self, documents, records=None):
+        """(기사 해시, 텍스트) 목록 색인 (호출 측 트랜잭션 안에서 실행)
+
+        records: {해시: 메타데이터}, 새 문서의 제목·링크·처리 시각으로 보관
+        """
+        records = records or {}
+        postings = []
+        for article_hash, text in documents:
+            tokens = tokenize(text)
+            if tokens:
+                doc = self._document_id(article_hash, records.get(article_hash) or {})
+                postings.extend((token, doc) for token in tokens)
+        self.conn.executemany("INSERT OR IGNORE INTO search_postings (token, doc) VALUES (?, ?)", postings)
+
+    def remove(self, hashes):
+        for article_hash in hashes:
+            row = self.conn.execute("SELECT id FROM search_documents WHERE hash = ?", (article_hash,)).fetchone()
+            if row:
+                self.conn.execute("DELETE FROM search_postings WHERE doc = ?", row)
+                self.conn.execute("DELETE FROM search_documents WHERE id = ?", row)
+
+    def prune(self, now):
+        """보관 기간이 지났거나 최대 문서 수를 넘은 오래된 문서 삭제 (호출 측 트랜잭션 안에서 실행)
+
+        문서 번호가 색인 순서이므로 기준 번호 이하를 한 번에 지웁니다. 삭제한 문서 수 반환.
+        매 flush마다 실행되므로 색인 크기와 관계없이 인덱스 조회만 합니다: 보관 기간은 processed_at 인덱스로
+        새로 만료된 문서만 보고, 최대 문서 수는 최근 max_documents개 번호 범위만 남깁니다
+        (개별 삭제로 빈 번호가 있으면 그만큼 적게 남음).
+        """
+        boundary = 0
+        if self.ttl_days:
+            cutoff = datetime.fromtimestamp(now - self.ttl_days * 86400).isoformat()
+            row = self.conn.execute(
+                "SELECT MAX(id) FROM search_documents INDEXED BY idx_search_documents_processed"
+                " WHERE processed_at < ?", (cutoff,)
+            ).fetchone()
+            boundary = row[0] or 0
+        if self.max_documents:
+            row = self.conn.execute("SELECT MAX(id) FROM search_documents").fetchone()
+            boundary = max(boundary, (row[0] or 0) - self.max_documents)
+        if not boundary:
+            return 0
+        self.conn.execute("DELETE FROM search_postings WHERE doc <= ?", (boundary,))
+        return self.conn.execute("DELETE FROM search_documents WHERE id <= ?", (boundary,)).rowcount
+
+    def rebuild(self):
+        """저장된 제목 전체 다시 색인 (처리 순서대로 문서 번호 부여)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM search_postings")
+            self.conn.execute("DELETE FROM search_documents")
+            rows = self.conn.execute(
+                "SELECT hash, title, link, processed_at FROM processed_articles ORDER BY last_seen"
+            ).fetchall()
+            self.add(
+                [(h, title) for h, title, _, _ in rows],
+                {h: {'title': title, 'link': link, 'processed_at': processed_at}
+                 for h, title, link, processed_at in rows}
+            )
+
+    def _reader_conn(self):
+        """검색 전용 연결 (봇 명령 스레드에서 쓰므로 쓰기 연결과 분리, WAL이라 동시에 읽기 가능)"""
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.filename, check_same_thread=False)
+        return self._reader
+
+    def search(self, query, limit=10):
+        """질의와 맞는 기사 [{'hash', 'title', 'link', 'processed_at', 'score'}]
+
+        모든 토큰이 맞는 기사(score 1.0)를 최신 순으로, 그다음 일부만 맞는 기사를 점수 순으로 반환합니다.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._reader_lock:
+            conn = self._reader_conn()
+            frequencies = {
+                token: conn.execute(
+                    "SELECT COUNT(*) FROM (SELECT 1 FROM search_postings WHERE token = ? LIMIT ?)",
+                    (token, MAX_POSTINGS_SCAN)
+                ).fetchone()[0]
+                for token in tokens
+            }
+            if not any(frequencies.values()):
+                return []
+            ordered = sorted(tokens, key=frequencies.get)
+
+            scores = {}
+            if frequencies[ordered[0]]:
+                # 전체 일치: 가장 드문 토큰의 최신 게시부터 나머지 토큰 포함 여부 확인
+                probes = ''.join(
+                    " AND EXISTS (SELECT 1 FROM search_postings WHERE token = ? AND doc = p.doc)"
+                    for _ in ordered[1:]
+                )
+                rows = conn.execute(
+                    "SELECT p.doc FROM (SELECT doc FROM search_postings WHERE token = ? "
+                    "ORDER BY doc DESC LIMIT ?) AS p WHERE 1" + probes + " LIMIT ?",
+                    [ordered[0], MAX_POSTINGS_SCAN, *ordered[1:], limit]
+                )
+                scores = {doc: 1.0 for (doc,) in rows}
+
+            partial = [t for t in ordered if 0 < frequencies[t] <= MAX_PARTIAL_FREQUENCY]
+            if len(scores) < limit and len(tokens) > 1 and partial:
+                # 일부 일치: 드문 토큰일수록 큰 IDF 가중치, 맞은 가중치 비율을 점수로
+                total = conn.execute("SELECT COALESCE(MAX(id), 0) FROM search_documents").fetchone()[0] or 1
+                weights = {t: math.log(1 + total / max(frequencies[t], 1)) for t in tokens}
+                weight_sum = sum(weights.values())
+                values = ', '.join('(?, ?)' for _ in partial)
+                rows = conn.execute(
+                    f"WITH query (token, weight) AS (VALUES {values}) "
+                    "SELECT p.doc, SUM(q.weight) AS score FROM query AS q "
+                    "JOIN search_postings AS p ON p.token = q.token "
+                    "GROUP BY p.doc ORDER BY score DESC, p.doc DESC LIMIT ?",
+                    [value for t in partial for value in (t, weights[t])] + [limit * 2]
+                )
+                for doc, score in rows:
+                    if len(scores) >= limit:
+                        break
+                    scores.setdefault(doc, round(min(score / weight_sum, 0.999), 3))
+
+            # 점수가 같으면 문서 번호가 큰(최신) 기사 우선
+            results = []
+            for doc, score in sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True):
+                row = conn.execute(
+                    "SELECT hash, title, link, processed_at FROM search_documents WHERE id = ?", (doc,)
+                ).fetchone()
+                if row:
+                    results.append({'hash': row[0], 'title': row[1], 'link': row[2],
+                                    'processed_at': row[3], 'score': score})
+        return results
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
@@ -0,0 +1,156 @@
+"""
+샤드 모드 모듈 - 뉴스 소스를 여러 작업 프로세스에 나눠 수집
+
+작업 프로세스마다 소스 일부를 맡아 수집·파싱·중복 제거를 하고, 새 기사는 공유 발신함에 먼저 넣은 뒤
+같은 SQLite(WAL) 처리 기사 저장소에 기록합니다 (ProcessedArticleStore.claim).
+같은 기사를 여러 프로세스가 동시에 발견해도 발신함 멱등 키(채팅, 기사 해시)가 같아 한 번만 전송되고,
+기록 전에 작업 프로세스가 종료되면 다음 실행에서 다시 새 기사로 처리하므로 알림을 잃지 않습니다.
+
+텔레그램 전송은 상위 프로세스 하나가 공유 발신함에서 처리해 봇 전송 속도 제한을 한곳에서 지킵니다.
+유사 제목 감지는 작업 프로세스 안에서만 비교합니다.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from news_sources import load_news_sources
+from article_store import is_sqlite_path
+from log_pipeline import listen, start_worker_logging
+
+# 상주 모드에서 상위 프로세스가 발신함을 확인하는 기본 간격
+DEFAULT_DRAIN_INTERVAL_SECONDS = 60
+
+# 상위 프로세스의 SQLite 연결과 스레드를 물려받지 않도록 새 인터프리터로 시작
+_context = multiprocessing.get_context('spawn')
+
+
+def shard_sources(sources, count):
+    """소스를 count개 묶음으로 번갈아 배분 (빈 묶음 제외)"""
+    return [sources[i::count] for i in range(count) if sources[i::count]]
+
+
+def shard_summary_file(summary_file, shard_index):
+    """작업 프로세스별 지표 요약 파일 이름 (yonhap_metrics.json -> yonhap_metrics.shard1.json)"""
+    root, ext = os.path.splitext(summary_file)
+    return f"{root}.shard{shard_index}{ext}"
+
+
+def run_shard(config, shard_index, source_names, daemon, log_queue=None):
+    """작업 프로세스: 맡은 소스만 수집해 공유 저장소와 발신함에 기록 (로그는 상위 프로세스 큐로)"""
+    from yonhap_news_monitor import YonhapNewsMonitor
+    from utils import setup_logging
+
+    if log_queue is not None:
+        start_worker_logging(log_queue, config.get('logging', {}))
+    elif not logging.getLogger().handlers:
+        setup_logging(config.get('logging'))
+    logger = logging.getLogger(__name__)
+
+    monitor = YonhapNewsMonitor(config, shard_worker=True)
+    try:
+        monitor.sources = [source for source in monitor.sources if source.name in source_names]
+        logger.info(f"샤드 {shard_index} 시작: {', '.join(source_names)}")
+
+        if daemon:
+            monitor.run_schedule()
+            return
+
+        monitor.monitor_news()
+        summary_file = monitor.metrics_config.get('summary_file')
+        if summary_file:
+            monitor.metrics_config['summary_file'] = shard_summary_file(summary_file, shard_index)
+            monitor.write_metrics_summary()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.close()
+
+
+class ShardRunner:
+    """작업 프로세스 시작·감시와 공유 발신함 전송을 맡는 상위 프로세스"""
+
+    def __init__(self, monitor, shard_count):
+        self.monitor = monitor
+        self.config = monitor.config
+        self.logger = logging.getLogger(__name__)
+
+        storage_file = monitor.processed_articles_file
+        if not is_sqlite_path(storage_file):
+            raise ValueError(f"샤드 모드는 SQLite 처리 기사 저장소(.db)가 필요합니다: {storage_file}")
+
+        sources = load_news_sources(self.config)
+        self.shards = [
+            [source.name for source in shard]
+            for shard in shard_sources(sources, max(1, min(shard_count, len(sources))))
+        ]
+        self.processes = {}
+
+        # 작업 프로세스 로그를 받아 상위 프로세스의 로그 파일 하나에 기록
+        self.log_queue = _context.Queue()
+        self.log_listener = listen(self.log_queue)
+
+        shards_config = self.config.get('monitoring', {}).get('shards', {})
+        self.drain_interval = shards_config.get('drain_interval_seconds', DEFAULT_DRAIN_INTERVAL_SECONDS)
+
+    def start(self, shard_index, daemon):
+        process = _context.Process(
+            target=run_shard,
+            args=(self.config, shard_index, self.shards[shard_index - 1], daemon,
+                  self.log_queue if self.log_listener else None),
+            name=f'shard-{shard_index}'
+        )
+        process.start()
+        self.processes[shard_index] = process
+
+    def run_once(self):
+        """단일 실행: 모든 샤드 수집이 끝난 뒤 발신함 전송, 실패한 샤드 수 반환"""
+        started = time.perf_counter()
+        # 상위 프로세스의 모니터가 저장소와 발신함 스키마를 먼저 만들어 둔 뒤 시작
+        for shard_index in range(1, len(self.shards) + 1):
+            self.start(shard_index, daemon=False)
+
+        failed = 0
+        for shard_index, process in self.processes.items():
+            process.join()
+            if process.exitcode != 0:
+                failed += 1
+                self.logger.error(f"샤드 {shard_index} 비정상 종료 (종료 코드 {process.exitcode})")
+
+        self.logger.info(f"샤드 {len(self.shards)}개 수집 완료 ({time.perf_counter() - started:.2f}초)")
+        self.monitor.drain_outbox()
+        self.stop()
+        return failed
+
+    def run_daemon(self):
+        """상주 모드: 작업 프로세스를 계속 실행하고(종료되면 다시 시작) 주기적으로 발신함 전송"""
+        # 헤드라인 API는 수집하는 프로세스에만 기사가 모이므로 샤드 모드에서는 제공하지 않음
+        if self.monitor.api_config.get('port'):
+            self.logger.warning("샤드 모드에서는 헤드라인 API를 제공하지 않습니다")
+        self.monitor.start_services(api=False)
+
+        for shard_index in range(1, len(self.shards) + 1):
+            self.start(shard_index, daemon=True)
+        self.logger.info(f"샤드 모드 시작: 작업 프로세스 {len(self.shards)}개, "
+                         f"발신함 확인 {self.drain_interval}초 간격")
+
+        try:
+            while True:
+                for shard_index, process in list(self.processes.items()):
+                    if not process.is_alive():
+                        self.logger.error(f"샤드 {shard_index} 종료됨 (종료 코드 {process.exitcode}), 다시 시작")
+                        self.start(shard_index, daemon=True)
+                self.monitor.drain_outbox()
+                time.sleep(self.drain_interval)
+        finally:
+            self.stop()
+
+    def stop(self):
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(5)
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            self.log_listener = None
@@ -0,0 +1,409 @@
+"""
+스냅샷 저장소 모듈 - GitHub Actions 아티팩트로 주고받는 압축 바이너리 처리 기사 저장소
+
+파일 구조 (리틀 엔디언, 버전 2):
+- 헤더 64바이트: 매직, 버전, 압축 방식, 기사 수, 메타데이터·부가 상태 구역의 위치와 길이, 생성 시각
+- 다이제스트 구역: 정렬된 16바이트 MD5 다이제스트 × 기사 수 (압축하지 않음)
+- 최근 확인 시각 구역: 다이제스트 순서의 u32 epoch 초 × 기사 수
+- MinHash 서명 구역: 다이제스트 순서의 120바이트 서명 × 기사 수 (서명이 없으면 0으로 채움, 버전 2부터)
+- 메타데이터 구역: 다이제스트 순서의 기사 정보 행 (압축한 JSON)
+- 부가 상태 구역: store_metadata (압축한 JSON, 조건부 요청 검증자 등)
+
+파일을 mmap으로 열어 중복 확인은 다이제스트 구역 이진 탐색으로 처리하므로 기사 수와 관계없이
+시작 시 읽는 양이 헤더뿐이며, 메타데이터는 제목이 필요할 때나 기사가 추가·삭제될 때만 압축을 풉니다.
+새 기사 없이 최근 확인 시각만 바뀐 실행은 메타데이터 구역을 그대로 복사합니다.
+MinHash 서명은 고정 길이로 저장해 유사 제목 색인을 만들 때 다시 계산하지 않으며, 검색 색인은 저장하지 않습니다.
+버전 1 파일(서명 구역 없음)도 읽을 수 있고, 다음 저장 때 버전 2로 바뀝니다.
+"""
+
+import os
+import json
+import lzma
+import mmap
+import time
+import zlib
+import struct
+import logging
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime
+from digest_set import DIGEST_SIZE, to_digest
+from near_duplicate import NUM_PERM
+
+SNAPSHOT_SUFFIXES = ('.snap',)
+MAGIC = b'YHSNAP\x00\x00'
+VERSION = 2
+READABLE_VERSIONS = (1, 2)
+SIGNATURE_SIZE = NUM_PERM * 4
+EMPTY_SIGNATURE = bytes(SIGNATURE_SIZE)
+HEADER = struct.Struct('<8sHHIQQQQd')
+HEADER_SIZE = 64
+
+CODECS = {
+    1: (zlib.compress, zlib.decompress),
+    2: (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+CODEC_IDS = {'zlib': 1, 'lzma': 2}
+
+# 메타데이터 행의 필드 순서 (파일에 함께 기록)
+ROW_FIELDS = ('title', 'source', 'processed_at', 'source_id', 'link')
+
+
+class SnapshotFormatError(ValueError):
+    """스냅샷 파일을 읽을 수 없음 (매직, 버전, 크기 불일치)"""
+
+
+def is_snapshot_path(filename):
+    """스냅샷 저장소 경로인지 확인"""
+    return str(filename).lower().endswith(SNAPSHOT_SUFFIXES)
+
+
+class SnapshotArticleStore(MutableMapping):
+    """처리된 기사 해시 저장소 (해시 -> 기사 메타데이터), 키는 32자리 16진수 해시"""
+
+    def __init__(self, filename, max_articles=None, ttl_days=None, compression='lzma'):
+        self.filename = filename
+        self.max_articles = max_articles
+        self.ttl_days = ttl_days
+        self.codec = CODEC_IDS.get(compression, CODEC_IDS['lzma'])
+
+        self._file = None
+        self._mm = None
+        self._count = 0
+        self._signature_offset = None
+        self._rows = None     # 압축을 푼 메타데이터 행 (필요할 때만)
+        self._state = None    # 압축을 푼 부가 상태 (필요할 때만)
+
+        # 아직 저장되지 않은 변경 사항
+        self._pending = {}    # 다이제스트 -> 기사 정보 (새 기사 또는 덮어쓰기)
+        self._deleted = set()
+        self._touched = {}    # 다이제스트 -> 최근 확인 시각
+        self._state_changed = False
+
+        if os.path.exists(filename):
+            self._open()
+        else:
+            self._import_legacy()
+
+    def _open(self):
+        self._file = open(self.filename, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER_SIZE:
+            self._file.close()
+            self._file = None
+            raise SnapshotFormatError(f"스냅샷 파일이 너무 작습니다: {size}바이트")
+
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, codec, count, meta_offset, meta_length,
+         state_offset, state_length, _) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._close_file()
+            raise SnapshotFormatError("스냅샷 파일 형식이 아닙니다")
+        if version not in READABLE_VERSIONS or codec not in CODECS:
+            self._close_file()
+            raise SnapshotFormatError(f"지원하지 않는 스냅샷 버전 {version} (압축 방식 {codec})")
+        signature_size = SIGNATURE_SIZE if version >= 2 else 0
+        if max(meta_offset + meta_length, state_offset + state_length,
+               HEADER_SIZE + count * (DIGEST_SIZE + 4 + signature_size)) > size:
+            self._close_file()
+            raise SnapshotFormatError("스냅샷 파일이 잘렸습니다")
+
+        self._count = count
+        self._signature_offset = HEADER_SIZE + count * (DIGEST_SIZE + 4) if signature_size else None
+        self._file_codec = codec
+        self._meta_span = (meta_offset, meta_length)
+        self._state_span = (state_offset, state_length)
+
+    def _close_file(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._count = 0
+
+    def _import_legacy(self):
+        """같은 이름의 SQLite(.db) 또는 JSON 저장소가 있으면 가져오기"""
+        base = os.path.splitext(self.filename)[0]
+        if os.path.exists(base + '.db'):
+            from article_store import ProcessedArticleStore
+
+            legacy = ProcessedArticleStore(base + '.db')
+            try:
+                for h, title, source, processed_at, last_seen, source_id, link, signature in legacy.conn.execute(
+                    "SELECT hash, title, source, processed_at, last_seen, source_id, link, minhash "
+                    "FROM processed_articles"
+                ):
+                    digest = to_digest(h)
+                    self._pending[digest] = {'title': title, 'source': source, 'processed_at': processed_at,
+                                             'source_id': source_id, 'link': link, 'minhash': signature}
+                    self._touched[digest] = last_seen
+                self._state = {key: json.loads(value) for key, value in legacy.conn.execute(
+                    "SELECT key, value FROM store_metadata"
+                )}
+                self._state_changed = True
+            finally:
+                legacy.close()
+            logging.info(f"기존 처리 기사 {len(self._pending)}개 가져옴: {base}.db")
+        elif os.path.exists(base + '.json'):
+            with open(base + '.json', 'r', encoding='utf-8') as f:
+                for h, info in json.load(f).items():
+                    if isinstance(info, dict):
+                        self[h] = info
+            logging.info(f"기존 처리 기사 {len(self._pending)}개 가져옴: {base}.json")
+
+    def _digest_at(self, index):
+        offset = HEADER_SIZE + index * DIGEST_SIZE
+        return self._mm[offset:offset + DIGEST_SIZE]
+
+    def _find(self, digest):
+        """파일에 있는 다이제스트의 위치 (없으면 None)"""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._digest_at(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._digest_at(lo) == digest:
+            return lo
+        return None
+
+    def _signature_bytes(self, index):
+        """파일 안 위치의 서명 (버전 1 파일이면 빈 서명)"""
+        if self._signature_offset is None:
+            return EMPTY_SIGNATURE
+        offset = self._signature_offset + index * SIGNATURE_SIZE
+        return self._mm[offset:offset + SIGNATURE_SIZE]
+
+    @staticmethod
+    def _pending_signature(info):
+        """새 기사 정보의 16진수 서명(minhash)을 고정 길이 바이트로 (없거나 형식이 다르면 빈 서명)"""
+        try:
+            signature = bytes.fromhex(info.get('minhash') or '')
+        except (TypeError, ValueError):
+            return EMPTY_SIGNATURE
+        return signature if len(signature) == SIGNATURE_SIZE else EMPTY_SIGNATURE
+
+    def _last_seen(self):
+        offset = HEADER_SIZE + self._count * DIGEST_SIZE
+        values = array('I')
+        values.frombytes(self._mm[offset:offset + self._count * 4])
+        return values
+
+    def _read_block(self, span):
+        offset, length = span
+        if not length:
+            return None
+        return json.loads(CODECS[self._file_codec][1](self._mm[offset:offset + length]))
+
+    def _load_rows(self):
+        if self._rows is None:
+            block = self._read_block(self._meta_span) if self._mm is not None else None
+            if block is None:
+                self._rows = []
+            else:
+                fields = block['fields']
+                self._rows = [dict(zip(fields, row)) for row in block['rows']]
+        return self._rows
+
+    def _load_state(self):
+        if self._state is None:
+            self._state = (self._read_block(self._state_span) if self._mm is not None else None) or {}
+        return self._state
+
+    def __contains__(self, article_hash):
+        digest = to_digest(article_hash)
+        if digest in self._pending:
+            return True
+        if digest in self._deleted or self._mm is None:
+            return False
+        return self._find(digest) is not None
+
+    def __getitem__(self, article_hash):
+        digest = to_digest(article_hash)
+        if digest in self._pending:
+            return self._pending[digest]
+        index = None if digest in self._deleted or self._mm is None else self._find(digest)
+        if index is None:
+            raise KeyError(article_hash)
+        return dict(self._load_rows()[index])
+
+    def __setitem__(self, article_hash, info):
+        digest = to_digest(article_hash)
+        self._deleted.discard(digest)
+        self._pending[digest] = info
+
+    def __delitem__(self, article_hash):
+        if article_hash not in self:
+            raise KeyError(article_hash)
+        digest = to_digest(article_hash)
+        self._pending.pop(digest, None)
+        self._touched.pop(digest, None)
+        self._deleted.add(digest)
+
+    def _iter_digests(self):
+        for index in range(self._count):
+            digest = self._digest_at(index)
+            if digest not in self._deleted and digest not in self._pending:
+                yield digest
+        yield from self._pending
+
+    def __iter__(self):
+        for digest in self._iter_digests():
+            yield digest.hex()
+
+    def __len__(self):
+        # 파일에 있던 항목 중 덮어쓰거나 삭제한 것은 빼고 새 항목만 더함
+        changed = [digest for digest in self._deleted.union(self._pending)
+                   if self._mm is not None and self._find(digest) is not None]
+        return self._count - len(changed) + len(self._pending)
+
+    def iter_titles(self, since=None):
+        """(해시, 제목, 저장된 MinHash 서명(16진수), 처리 시각 epoch 초) 순회 (since 이후 처리한 기사만)"""
+        rows = self._load_rows() if self._count else []
+        entries = (
+            (self._digest_at(index), rows[index], self._signature_bytes(index))
+            for index in range(self._count)
+        )
+        pending = ((digest, info, self._pending_signature(info)) for digest, info in self._pending.items())
+
+        for source in (entries, pending):
+            for digest, info, signature in source:
+                if source is entries and (digest in self._deleted or digest in self._pending):
+                    continue
+                processed_at = self._timestamp(info.get('processed_at'), None)
+                if since is not None and (processed_at is None or processed_at < since):
+                    continue
+                yield (digest.hex(), info.get('title'),
+                       signature.hex() if signature != EMPTY_SIGNATURE else None, processed_at)
+
+    def iter_arrivals(self):
+        """(수집 소스 이름, 처리 시각 epoch 초) 순회"""
+        for article_hash in self:
+            info = self[article_hash]
+            if info.get('source_id'):
+                yield info['source_id'], self._timestamp(info.get('processed_at'), None)
+
+    def get_metadata(self, key, default=None):
+        """부가 상태 조회 (없으면 default)"""
+        return self._load_state().get(key, default)
+
+    def set_metadata(self, key, value):
+        """부가 상태 기록 (바로 파일에 저장)"""
+        self._load_state()[key] = value
+        self._state_changed = True
+        self.flush()
+
+    def touch(self, article_hash):
+        """최근 확인 시각 갱신 (LRU)"""
+        self._touched[to_digest(article_hash)] = time.time()
+
+    def flush(self):
+        """변경 사항이 있으면 보관 정책을 적용해 새 스냅샷 파일로 교체"""
+        if self._mm is not None and not (self._pending or self._deleted or self._touched or self._state_changed):
+            return True
+
+        now = time.time()
+        last_seen = self._last_seen() if self._mm is not None else array('I')
+
+        # (다이제스트, 최근 확인 시각, 파일 안 위치 또는 None)
+        entries = []
+        for index in range(self._count):
+            digest = self._digest_at(index)
+            if digest in self._deleted or digest in self._pending:
+                continue
+            entries.append((digest, self._touched.get(digest, last_seen[index]), index))
+        for digest, info in self._pending.items():
+            seen = self._touched.get(digest) or self._timestamp(info.get('processed_at'), now)
+            entries.append((digest, seen, None))
+
+        kept = self._apply_retention(entries, now)
+        rewrite_rows = bool(self._pending or self._deleted) or len(kept) != len(entries)
+        kept.sort(key=lambda entry: entry[0])
+
+        codec = self.codec if rewrite_rows or self._mm is None else self._file_codec
+        compress = CODECS[codec][0]
+        if rewrite_rows or self._mm is None:
+            rows = self._load_rows() if any(index is not None for _, _, index in kept) else []
+            meta = compress(json.dumps({
+                'fields': ROW_FIELDS,
+                'rows': [
+                    [(self._pending[digest] if index is None else rows[index]).get(field) for field in ROW_FIELDS]
+                    for digest, _, index in kept
+                ],
+            }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        else:
+            # 기사 구성이 그대로면 압축된 메타데이터를 그대로 사용
+            offset, length = self._meta_span
+            meta = self._mm[offset:offset + length]
+
+        if self._state_changed or self._mm is None or codec != self._file_codec:
+            state = self._load_state()
+            state_block = compress(json.dumps(state, ensure_ascii=False).encode('utf-8')) if state else b''
+        else:
+            offset, length = self._state_span
+            state_block = self._mm[offset:offset + length]
+
+        signatures = b''.join(
+            self._pending_signature(self._pending[digest]) if index is None else self._signature_bytes(index)
+            for digest, _, index in kept
+        )
+
+        evicted = len(entries) - len(kept)
+        self._write(kept, signatures, meta, state_block, codec, now)
+
+        if evicted:
+            logging.info(f"처리된 기사 {evicted}개 정리")
+        return True
+
+    def _apply_retention(self, entries, now):
+        """TTL 만료 및 최대 개수 초과 항목 제외 (최근 확인 순으로 유지)"""
+        if self.ttl_days:
+            cutoff = now - self.ttl_days * 86400
+            entries = [entry for entry in entries if entry[1] >= cutoff]
+        if self.max_articles and len(entries) > self.max_articles:
+            entries = sorted(entries, key=lambda entry: entry[1], reverse=True)[:self.max_articles]
+        return list(entries)
+
+    def _write(self, entries, signatures, meta, state_block, codec, now):
+        """임시 파일에 쓴 뒤 원자적으로 교체하고 다시 열기"""
+        count = len(entries)
+        meta_offset = HEADER_SIZE + count * (DIGEST_SIZE + 4 + SIGNATURE_SIZE)
+        state_offset = meta_offset + len(meta)
+        header = HEADER.pack(MAGIC, VERSION, codec, count, meta_offset, len(meta),
+                             state_offset, len(state_block), now)
+
+        temp_file = self.filename + '.tmp'
+        with open(temp_file, 'wb') as f:
+            f.write(header.ljust(HEADER_SIZE, b'\x00'))
+            f.write(b''.join(digest for digest, _, _ in entries))
+            f.write(array('I', (min(int(seen), 0xFFFFFFFF) for _, seen, _ in entries)).tobytes())
+            f.write(signatures)
+            f.write(meta)
+            f.write(state_block)
+        self._close_file()
+        os.replace(temp_file, self.filename)
+
+        self._rows = None
+        self._pending.clear()
+        self._deleted.clear()
+        self._touched.clear()
+        self._state_changed = False
+        self._open()
+
+    @staticmethod
+    def _timestamp(iso_string, default):
+        """ISO 시각 문자열을 epoch 초로 변환"""
+        if not iso_string:
+            return default
+        try:
+            return datetime.fromisoformat(iso_string).timestamp()
+        except (TypeError, ValueError):
+            return default
+
+    def close(self):
+        """변경 사항 저장 후 파일 닫기"""
+        self.flush()
+        self._close_file()
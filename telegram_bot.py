@@ -3,21 +3,71 @@
 """
 
 import logging
+import re
 import requests
 import time
 from urllib.parse import quote
+from telegram_dispatcher import TelegramDispatcher
+
+# 텔레그램 메시지 최대 길이 (UTF-16 코드 단위)
+MAX_MESSAGE_LENGTH = 4096
+# 묶음 메시지 머리말과 기사 사이 구분자
+DIGEST_HEADER = "🗞 <b>연합뉴스 헤드라인 {count}건</b>"
+DIGEST_HEADER_RESERVE = 64
+DIGEST_SEPARATOR = "\n\n"
+# 잘린 메시지 끝 표시와 닫는 태그를 붙일 여유
+TRUNCATION_MARK = "..."
+TRUNCATION_RESERVE = 32
+HTML_TAG = re.compile(r'<(/?)([a-zA-Z-]+)[^>]*>')
+
+
+def message_length(text):
+    """텔레그램 기준 메시지 길이 (UTF-16 코드 단위, 태그 포함이라 실제보다 길게 셈)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def truncate_message(text, limit=MAX_MESSAGE_LENGTH):
+    """HTML 메시지를 limit 안으로 자르기 (태그·엔티티가 중간에 끊기지 않도록)
+
+    메시지의 각 줄은 태그가 닫혀 있으므로 먼저 줄 경계에서 자르고, 첫 줄부터 너무 길면
+    마지막 완전한 태그·엔티티까지 되돌린 뒤 열린 태그를 닫습니다.
+    """
+    if message_length(text) <= limit:
+        return text
+
+    limit -= TRUNCATION_RESERVE
+    # 코드 단위 기준으로 자르고 반쪽 서로게이트는 버림
+    head = text.encode('utf-16-le')[:limit * 2].decode('utf-16-le', errors='ignore')
+    line_end = head.rfind('\n')
+    if line_end > 0:
+        return head[:line_end].rstrip() + '\n' + TRUNCATION_MARK
+
+    if head.rfind('<') > head.rfind('>'):
+        head = head[:head.rfind('<')]
+    if head.rfind('&') > head.rfind(';'):
+        head = head[:head.rfind('&')]
+    open_tags = []
+    for match in HTML_TAG.finditer(head):
+        if not match.group(1):
+            open_tags.append(match.group(2))
+        elif open_tags and open_tags[-1] == match.group(2):
+            open_tags.pop()
+    return head + TRUNCATION_MARK + ''.join(f'</{tag}>' for tag in reversed(open_tags))
 
 class TelegramBot:
-    def __init__(self, config):
+    def __init__(self, config, metrics=None):
         self.bot_token = config['telegram']['bot_token']
         self.chat_id = config['telegram']['chat_id']
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        api_url = config['telegram'].get('api_url', 'https://api.telegram.org')
+        self.base_url = f"{api_url}/bot{self.bot_token}"
+        
+        # 연결 풀과 전송 속도 제한을 공유하는 디스패처
+        self.dispatcher = TelegramDispatcher(self.base_url, config.get('delivery', {}), metrics)
         
     def test_connection(self):
         """텔레그램 봇 연결 테스트"""
         try:
-            url = f"{self.base_url}/getMe"
-            response = requests.get(url, timeout=10)
+            response = self.dispatcher.request('getMe', timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -33,54 +83,117 @@ class TelegramBot:
             logging.error(f"텔레그램 봇 연결 테스트 오류: {e}")
             return False
     
+    def build_payload(self, message, chat_id=None, parse_mode='HTML'):
+        """sendMessage 요청 본문 생성"""
+        return {
+            'chat_id': chat_id or self.chat_id,
+            'text': truncate_message(message),
+            'parse_mode': parse_mode,
+            'disable_web_page_preview': False
+        }
+    
     def send_message(self, message, parse_mode='HTML'):
         """텔레그램 메시지 전송"""
         try:
-            url = f"{self.base_url}/sendMessage"
-            
-            # 메시지 길이 제한 (4096자)
-            if len(message) > 4090:
-                message = message[:4090] + "..."
-            
-            payload = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': parse_mode,
-                'disable_web_page_preview': False
-            }
-            
-            response = requests.post(url, json=payload, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('ok'):
-                    logging.info("텔레그램 메시지 전송 성공")
-                    return True
-                else:
-                    logging.error(f"텔레그램 메시지 전송 실패: {data.get('description', 'Unknown error')}")
-            else:
-                logging.error(f"텔레그램 API 오류: {response.status_code} - {response.text}")
-                
-            return False
+            return self.dispatcher.dispatch([self.build_payload(message, parse_mode=parse_mode)])[0]
             
         except Exception as e:
             logging.error(f"텔레그램 메시지 전송 오류: {e}")
             return False
     
+    def send_messages(self, messages, parse_mode='HTML'):
+        """여러 메시지를 속도 제한에 맞춰 일괄 전송 (메시지별 성공 여부 목록 반환)"""
+        return self.send_batch([{'text': message} for message in messages], parse_mode=parse_mode)
+    
+    def send_batch(self, deliveries, on_result=None, parse_mode='HTML'):
+        """여러 채팅으로 일괄 전송
+        
+        deliveries: [{'text': ..., 'chat_id': ..., 'priority': ...}] (chat_id 생략 시 기본 채팅,
+        priority 값이 작을수록 먼저 전송)
+        on_result(index, success): 메시지마다 결과가 나오는 즉시 호출
+        """
+        try:
+            payloads = [
+                self.build_payload(delivery['text'], chat_id=delivery.get('chat_id'), parse_mode=parse_mode)
+                for delivery in deliveries
+            ]
+            priorities = [delivery.get('priority', 0) for delivery in deliveries]
+            return self.dispatcher.dispatch(payloads, priorities, on_result)
+            
+        except Exception as e:
+            logging.error(f"텔레그램 일괄 전송 오류: {e}")
+            return [False] * len(deliveries)
+    
+    def get_updates(self, offset=None, timeout=30):
+        """getUpdates 롱 폴링 (메시지 업데이트 목록, 오류 시 빈 목록)"""
+        payload = {'timeout': timeout, 'allowed_updates': ['message']}
+        if offset is not None:
+            payload['offset'] = offset
+        try:
+            response = self.dispatcher.request('getUpdates', payload, timeout=timeout + 10)
+            data = response.json()
+            if response.status_code == 200 and data.get('ok'):
+                return data.get('result', [])
+            logging.warning(f"텔레그램 업데이트 조회 실패: {response.status_code} - {data.get('description')}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logging.warning(f"텔레그램 업데이트 조회 오류: {e}")
+        return []
+    
+    def poll_commands(self, handlers, allowed_chats=None, stop_event=None, timeout=30):
+        """봇 명령 처리 루프 (getUpdates 롱 폴링)
+        
+        handlers: {'search': handler(인자 문자열) -> 답장 HTML}
+        allowed_chats: 명령을 받을 채팅 ID 목록 (None이면 모두)
+        시작 전에 쌓인 업데이트는 건너뜁니다.
+        """
+        allowed_chats = {str(chat_id) for chat_id in allowed_chats} if allowed_chats else None
+        
+        # 꺼져 있던 동안 쌓인 명령은 처리하지 않음
+        pending = self.get_updates(offset=-1, timeout=0)
+        offset = pending[-1]['update_id'] + 1 if pending else None
+        
+        while stop_event is None or not stop_event.is_set():
+            updates = self.get_updates(offset, timeout)
+            if not updates:
+                # 오류가 나면 바로 다시 요청하지 않음
+                time.sleep(1)
+                continue
+            
+            for update in updates:
+                offset = update['update_id'] + 1
+                message = update.get('message') or {}
+                text = message.get('text') or ''
+                chat_id = str(message.get('chat', {}).get('id', ''))
+                if not text.startswith('/') or (allowed_chats is not None and chat_id not in allowed_chats):
+                    continue
+                
+                # "/search@봇이름 검색어" 형태도 처리
+                command, _, argument = text[1:].partition(' ')
+                handler = handlers.get(command.split('@')[0].lower())
+                if handler is None:
+                    continue
+                
+                try:
+                    reply = handler(argument.strip())
+                    self.dispatcher.request('sendMessage', self.build_payload(reply, chat_id=chat_id))
+                except Exception as e:
+                    logging.error(f"봇 명령 처리 오류 ({command}): {e}")
+    
     def format_article(self, article):
         """기사 정보를 텔레그램 메시지 형식으로 변환 (간단 버전)"""
         title = article.get('title', 'No Title')
-        url = article.get('url', '')
+        url = article.get('link') or article.get('url', '')
         source = article.get('source', 'Unknown Source')
         
         # HTML 특수문자 이스케이프
         title = self.escape_html(title)
         source = self.escape_html(source)
+        url = self.escape_html(url)
         
         # 간단한 형식: 제목과 링크만
         message = f"📰 <b>{title}</b>\n"
         message += f"🌐 {source}\n"
-        message += f"🔗 <a href='{url}'>기사 읽기</a>"
+        message += f"🔗 <a href=\"{url}\">기사 읽기</a>"
         
         return message
     
@@ -97,40 +210,44 @@ class TelegramBot:
         
         return text
     
+    def pack_digest(self, messages, limit=MAX_MESSAGE_LENGTH - DIGEST_HEADER_RESERVE):
+        """메시지들을 limit 안에 들어가는 최소 개수의 묶음으로 나누기 (First-Fit Decreasing)
+        
+        묶음별 메시지 번호 목록을 반환하며, 묶음 안과 묶음 사이 순서는 원래 순서를 따릅니다.
+        limit보다 긴 메시지는 혼자 한 묶음이 됩니다.
+        """
+        sizes = [message_length(message) + len(DIGEST_SEPARATOR) for message in messages]
+        bins = []  # [남은 길이, 메시지 번호 목록]
+        
+        for index in sorted(range(len(messages)), key=lambda i: sizes[i], reverse=True):
+            for packed in bins:
+                if packed[0] >= sizes[index]:
+                    packed[0] -= sizes[index]
+                    packed[1].append(index)
+                    break
+            else:
+                bins.append([limit - sizes[index], [index]])
+        
+        return sorted((sorted(indices) for _, indices in bins), key=lambda indices: indices[0])
+    
+    def format_digest(self, messages):
+        """여러 기사 메시지를 머리말을 붙여 하나로 합치기 (1개면 그대로)"""
+        if len(messages) == 1:
+            return messages[0]
+        return DIGEST_SEPARATOR.join([DIGEST_HEADER.format(count=len(messages))] + list(messages))
+    
     def send_news_notification(self, articles):
-        """뉴스 기사들을 텔레그램으로 전송 (간단 형식)"""
+        """뉴스 기사들을 4096자 안에서 가능한 적은 수의 메시지로 묶어 전송"""
         if not articles:
             return True
         
         try:
-            success_count = 0
-            
-            # 헤더 메시지 (한 번만 전송)
-            header = f"🚨 <b>새로운 비트코인 뉴스 {len(articles)}개 발견!</b>\n\n"
-            
-            # 모든 기사를 하나의 메시지로 합치기
-            full_message = header
-            for i, article in enumerate(articles, 1):
-                full_message += f"<b>{i}.</b> " + self.format_article(article) + "\n\n"
-            
-            # 메시지 길이가 너무 길면 분할 전송
-            if len(full_message) > 4000:
-                # 각 기사를 개별 메시지로 전송
-                self.send_message(header)
-                time.sleep(1)
-                
-                for i, article in enumerate(articles, 1):
-                    try:
-                        message = f"<b>{i}.</b> " + self.format_article(article)
-                        if self.send_message(message):
-                            success_count += 1
-                        time.sleep(1)
-                    except Exception as e:
-                        logging.error(f"기사 전송 오류 ({i}번째): {e}")
-            else:
-                # 한 번에 전송
-                if self.send_message(full_message):
-                    success_count = len(articles)
+            messages = [self.format_article(article) for article in articles]
+            bins = self.pack_digest(messages)
+            results = self.send_messages([
+                self.format_digest([messages[i] for i in indices]) for indices in bins
+            ])
+            success_count = sum(len(indices) for indices, sent in zip(bins, results) if sent)
             
             logging.info(f"텔레그램 알림 전송 완료: {success_count}/{len(articles)}개 성공")
             return success_count > 0
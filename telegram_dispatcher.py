@@ -0,0 +1,202 @@
+"""
+텔레그램 전송 디스패처 모듈 - asyncio 기반 메시지 일괄 전송
+
+하나의 requests.Session(연결 풀)을 공유하고, 텔레그램 제한에 맞춘 토큰 버킷
+(전체 초당 30개, 채팅별 초당 1개)으로 전송 속도를 조절합니다.
+429 응답의 retry_after를 따르고, 일시적인 오류는 지수 백오프로 재시도합니다.
+여러 채팅으로 보낼 때는 우선순위 큐로 속보를 먼저 보내고, 채팅별 순서는 유지합니다.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+GLOBAL_MESSAGES_PER_SECOND = 30
+CHAT_MESSAGES_PER_SECOND = 1
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기 (단일 이벤트 루프 전용)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def delay(self):
+        """토큰을 얻기까지 기다려야 하는 시간 (초)"""
+        self._refill()
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self._refill()
+        self.tokens -= 1
+
+    def penalize(self, seconds):
+        """retry_after가 지날 때까지 토큰 지급 중단"""
+        self._refill()
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class TelegramDispatcher:
+    """텔레그램 sendMessage 비동기 디스패처"""
+
+    def __init__(self, base_url, delivery_config=None, metrics=None):
+        delivery_config = delivery_config or {}
+        self.base_url = base_url
+        self.metrics = metrics
+        self.max_retries = delivery_config.get('max_retries', 3)
+        self.backoff_seconds = delivery_config.get('backoff_seconds', 1.0)
+        self.timeout = delivery_config.get('timeout', 10)
+        self.chat_rate = delivery_config.get('per_chat_per_second', CHAT_MESSAGES_PER_SECOND)
+        self.max_in_flight = delivery_config.get('max_in_flight', GLOBAL_MESSAGES_PER_SECOND)
+
+        self.global_bucket = TokenBucket(
+            delivery_config.get('global_per_second', GLOBAL_MESSAGES_PER_SECOND)
+        )
+        self.chat_buckets = {}
+
+        # 연결 풀 공유
+        pool_size = delivery_config.get('pool_size', 10)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _chat_bucket(self, chat_id):
+        if chat_id not in self.chat_buckets:
+            self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, capacity=1)
+        return self.chat_buckets[chat_id]
+
+    async def _acquire(self, chat_id):
+        """전체 및 채팅별 토큰 확보"""
+        chat_bucket = self._chat_bucket(chat_id)
+        while True:
+            wait = max(self.global_bucket.delay(), chat_bucket.delay())
+            if wait <= 0:
+                self.global_bucket.consume()
+                chat_bucket.consume()
+                return
+            await asyncio.sleep(wait)
+
+    def request(self, method, payload=None, timeout=None):
+        """Bot API 호출 (지연과 응답 상태 코드를 지표에 기록)"""
+        url = f"{self.base_url}/{method}"
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            if payload is None:
+                response = self.session.get(url, timeout=timeout)
+            else:
+                response = self.session.post(url, json=payload, timeout=timeout)
+            status = response.status_code
+            return response
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe('telegram_request_seconds', time.perf_counter() - started, method=method)
+                self.metrics.inc('telegram_responses_total', method=method, status=status)
+
+    def _post(self, payload):
+        return self.request('sendMessage', payload)
+
+    def _backoff(self, attempt):
+        """지수 백오프 + 지터"""
+        return self.backoff_seconds * (2 ** attempt) * (0.5 + random.random())
+
+    async def send(self, payload):
+        """메시지 1개 전송 (성공 여부 반환)"""
+        loop = asyncio.get_running_loop()
+        chat_id = payload['chat_id']
+
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(chat_id)
+            try:
+                response = await loop.run_in_executor(None, self._post, payload)
+            except requests.exceptions.RequestException as e:
+                logging.warning(f"텔레그램 전송 네트워크 오류 (시도 {attempt + 1}): {e}")
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+
+            if response.status_code == 200 and data.get('ok'):
+                logging.info("텔레그램 메시지 전송 성공")
+                return True
+
+            if response.status_code == 429:
+                retry_after = data.get('parameters', {}).get('retry_after', 1)
+                logging.warning(f"텔레그램 전송 제한: {retry_after}초 후 재시도")
+                self._chat_bucket(chat_id).penalize(retry_after)
+                continue
+
+            if response.status_code >= 500:
+                logging.warning(f"텔레그램 API 오류: {response.status_code} (시도 {attempt + 1})")
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            # 그 밖의 4xx는 재시도해도 결과가 같음
+            logging.error(f"텔레그램 메시지 전송 실패: {response.status_code} - "
+                          f"{data.get('description', response.text)}")
+            return False
+
+        logging.error(f"텔레그램 메시지 전송 포기: {self.max_retries + 1}회 시도 실패")
+        return False
+
+    async def send_all(self, payloads, priorities=None, on_result=None):
+        """여러 메시지 전송 (우선순위 값이 작을수록 먼저, 채팅당 동시에 1개, 채팅 간 병렬)
+
+        on_result(index, success)가 있으면 메시지마다 결과가 나오는 즉시 호출합니다.
+        """
+        results = [False] * len(payloads)
+        priorities = priorities or [0] * len(payloads)
+        queue = [(priorities[index], index) for index in range(len(payloads))]
+        heapq.heapify(queue)
+
+        busy_chats = set()
+        in_flight = {}
+
+        while queue or in_flight:
+            # 바쁘지 않은 채팅의 메시지를 우선순위 순으로 시작
+            deferred = []
+            while queue and len(in_flight) < self.max_in_flight:
+                priority, index = heapq.heappop(queue)
+                chat_id = payloads[index]['chat_id']
+                if chat_id in busy_chats:
+                    deferred.append((priority, index))
+                    continue
+                busy_chats.add(chat_id)
+                in_flight[asyncio.ensure_future(self.send(payloads[index]))] = index
+            for item in deferred:
+                heapq.heappush(queue, item)
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = in_flight.pop(task)
+                busy_chats.discard(payloads[index]['chat_id'])
+                results[index] = task.result()
+                if on_result is not None:
+                    on_result(index, results[index])
+
+        return results
+
+    def dispatch(self, payloads, priorities=None, on_result=None):
+        """동기 코드에서 일괄 전송"""
+        if not payloads:
+            return []
+        return asyncio.run(self.send_all(payloads, priorities, on_result))
@@ -0,0 +1,16 @@
+from adaptive_scheduler import AdaptiveScheduler
+
+
+def test_jittered_interval_stays_within_bounds():
+    scheduler = AdaptiveScheduler(['busy', 'quiet', 'broken'], {
+        'min_interval_minutes': 5, 'max_interval_minutes': 60, 'jitter': 0.5
+    })
+    now = 1_700_000_000.0
+    for i in range(200):
+        now += 60
+        intervals = [
+            scheduler.record('busy', 'ok', new_articles=20, now=now),
+            scheduler.record('quiet', 'ok', now=now),
+            scheduler.record('broken', 'error', now=now),
+        ]
+        assert all(5 * 60 <= interval <= 60 * 60 for interval in intervals)
@@ -0,0 +1,51 @@
+import time
+from datetime import datetime
+
+from article_store import ProcessedArticleStore
+
+
+def _info(i, processed_at):
+    return {'title': f'기사 {i}', 'link': f'https://example.com/{i}', 'source': '연합뉴스',
+            'processed_at': datetime.fromtimestamp(processed_at).isoformat()}
+
+
+def test_lru_evicts_least_recently_seen_over_cap_across_reopen(tmp_path):
+    filename = str(tmp_path / 'store.db')
+    base = time.time() - 3600
+    store = ProcessedArticleStore(filename, max_articles=5)
+    for i in range(5):
+        store[f'h{i}'] = _info(i, base + i)
+    store.flush(base + 10)
+    assert len(store) == 5
+    store.close()
+
+    # 다시 열면 전체 해시를 읽지 않고 기본 키로 확인, 행 수는 그대로 이어짐
+    store = ProcessedArticleStore(filename, max_articles=5)
+    assert len(store) == 5
+    assert 'h0' in store and 'missing' not in store
+    store.touch('h0')
+    store.flush(base + 20)
+
+    store['h5'] = _info(5, base + 30)
+    assert len(store) == 6
+    store.flush(base + 30)
+    assert len(store) == 5
+    assert 'h1' not in store
+    assert {'h0', 'h2', 'h3', 'h4', 'h5'} <= set(store)
+    store.close()
+
+
+def test_ttl_and_delete_keep_count_in_sync(tmp_path):
+    store = ProcessedArticleStore(str(tmp_path / 'store.db'), max_articles=10, ttl_days=1)
+    now = time.time()
+    store['old'] = _info('old', now - 2 * 86400)
+    store['new'] = _info('new', now)
+    store['gone'] = _info('gone', now)
+    store.flush(now)
+    assert len(store) == 2 and 'old' not in store
+
+    del store['gone']
+    assert len(store) == 1
+    assert store.claim({'other': _info('other', now), 'new': _info('new', now)}) == {'other'}
+    assert len(store) == 2
+    store.close()
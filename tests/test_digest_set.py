@@ -0,0 +1,63 @@
+import random
+
+from digest_set import DIGEST_SIZE, EMPTY_SLOT, DigestSet
+
+
+def _digest(slot, tag):
+    """시작 슬롯(하위 비트)을 정한 다이제스트"""
+    return slot.to_bytes(8, 'little') + tag.to_bytes(8, 'little')
+
+
+def test_discard_shifts_cluster_back():
+    digests = DigestSet()  # 64 슬롯
+    cluster = [_digest(10, 1), _digest(10, 2), _digest(11, 3), _digest(10, 4), _digest(13, 5)]
+    for digest in cluster:
+        digests.add(digest)
+
+    digests.discard(cluster[0])
+    assert cluster[0] not in digests
+    assert all(digest in digests for digest in cluster[1:])
+    # 뒤 항목을 당겨 채웠으므로 클러스터 끝 슬롯이 비어 있어야 함
+    assert bytes(digests.table[14 * DIGEST_SIZE:15 * DIGEST_SIZE]) == EMPTY_SLOT
+    assert len(digests) == 4
+
+
+def test_discard_across_table_wraparound():
+    digests = DigestSet()
+    last = digests.capacity - 1
+    wrapped = [_digest(last, 1), _digest(last, 2), _digest(0, 3), _digest(last, 4)]
+    for digest in wrapped:
+        digests.add(digest)
+
+    digests.discard(wrapped[1])
+    assert [digest in digests for digest in wrapped] == [True, False, True, True]
+    digests.discard(wrapped[0])
+    assert [digest in digests for digest in wrapped] == [False, False, True, True]
+
+
+def test_random_add_discard_matches_set():
+    rng = random.Random(4)
+    digests = DigestSet(bloom_bits_per_item=10)
+    reference = set()
+    # 좁은 슬롯 범위로 긴 클러스터를 만들어 역방향 이동을 많이 일으킴
+    pool = [_digest(rng.randrange(16), tag) for tag in range(300)] + [EMPTY_SLOT]
+    for _ in range(5000):
+        digest = rng.choice(pool)
+        if rng.random() < 0.6:
+            digests.add(digest)
+            reference.add(digest)
+        else:
+            digests.discard(digest)
+            reference.discard(digest)
+        assert len(digests) == len(reference)
+
+    assert set(digests) == reference
+    assert all((digest in digests) == (digest in reference) for digest in pool)
+
+
+def test_hex_hashes_and_strings():
+    digests = DigestSet.from_hashes(['0123456789abcdef0123456789abcdef', '제목 해시'])
+    assert '0123456789abcdef0123456789abcdef' in digests
+    assert bytes.fromhex('0123456789abcdef0123456789abcdef') in digests
+    assert '제목 해시' in digests
+    assert '다른 제목' not in digests
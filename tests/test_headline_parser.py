@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+import headline_parser
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+def _load(name):
+    with open(os.path.join(FIXTURE_DIR, f'{name}.html'), 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('fixture', ['headline_list', 'item_box', 'article_tags'])
+def test_strainer_matches_soup(fixture):
+    content = _load(fixture)
+    strainer = headline_parser.parse_with_strainer(content)
+    assert strainer is not None
+    assert strainer == headline_parser.parse_with_soup(content)
+    assert len(strainer) == headline_parser.MAX_ITEMS
+
+
+@pytest.mark.skipif(headline_parser.etree is None, reason='lxml 없음')
+def test_strainer_finds_nothing_without_reparsing_text_only_pages():
+    # 항목 선택자가 모두 없는 레이아웃: soup 파싱 없이 빈 목록 (parse_headlines는 텍스트 추출로 넘어감)
+    assert headline_parser.parse_with_strainer(_load('text_only')) == []
+    assert headline_parser.parse_with_strainer(b'  ') is None
@@ -0,0 +1,87 @@
+import os
+import sqlite3
+
+import pytest
+
+from article import Article
+from yonhap_news_monitor import YonhapNewsMonitor
+
+
+def _config(tmp_path):
+    return {
+        'telegram': {'bot_token': 'test', 'chat_id': '1', 'api_url': 'http://127.0.0.1:9'},
+        'storage': {'processed_articles_file': os.path.join(tmp_path, 'processed.db')},
+        'outbox': {'file': os.path.join(tmp_path, 'outbox.db')},
+        'dedup': {'near_duplicate': True},
+    }
+
+
+def _monitor(tmp_path, shard_worker=False):
+    monitor = YonhapNewsMonitor(_config(tmp_path), shard_worker=shard_worker)
+    monitor.drain_outbox = lambda: None
+    monitor.get_yonhap_headlines = lambda sources=None: _headlines()
+    return monitor
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    monitor = _monitor(tmp_path)
+    yield monitor
+    monitor.close()
+
+
+def _headlines():
+    return [Article(f'정부 반도체 지원책 {i}차 발표', f'https://www.yna.co.kr/view/AKR{i}') for i in range(3)]
+
+
+def test_outbox_failure_keeps_articles_new(monitor):
+    enqueue = monitor.outbox.enqueue
+
+    def locked(deliveries):
+        raise sqlite3.OperationalError('database is locked')
+
+    monitor.outbox.enqueue = locked
+    monitor.monitor_news()
+    assert len(monitor.processed_articles) == 0
+    assert monitor.outbox.pending_count() == 0
+
+    monitor.outbox.enqueue = enqueue
+    monitor.monitor_news()
+    assert len(monitor.processed_articles) == 3
+    assert monitor.outbox.pending_count() == 3
+
+
+def test_shard_worker_dying_before_claim_loses_nothing(tmp_path):
+    YonhapNewsMonitor(_config(tmp_path)).close()  # 상위 프로세스가 스키마 생성
+    worker = _monitor(tmp_path, shard_worker=True)
+
+    def die(records):
+        raise RuntimeError('worker killed')
+
+    worker.processed_articles.claim = die
+    worker.monitor_news()
+    assert worker.outbox.pending_count() == 3
+    worker.close()
+
+    worker = _monitor(tmp_path, shard_worker=True)
+    worker.monitor_news()
+    hashes = [worker.generate_article_hash(article) for article in _headlines()]
+    assert worker.processed_articles.find_recorded(hashes) == set(hashes)
+    assert worker.outbox.pending_count() == 3
+    worker.close()
+
+
+def test_shard_workers_enqueue_shared_article_once(tmp_path):
+    YonhapNewsMonitor(_config(tmp_path)).close()
+    first, second = _monitor(tmp_path, shard_worker=True), _monitor(tmp_path, shard_worker=True)
+    first_new = first.filter_new_articles(_headlines())
+    second_new = second.filter_new_articles(_headlines())
+    assert len(first_new) == len(second_new) == 3
+    for worker, articles in ((first, first_new), (second, second_new)):
+        worker.enqueue_articles(articles)
+        worker.record_claims()
+
+    assert first.outbox.pending_count() == 3
+    assert second.filter_new_articles(_headlines()) == []
+    first.close()
+    second.close()
@@ -0,0 +1,73 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from article_enricher import ArticleEnricher
+from fetch_policy import OPEN, CircuitOpenError
+from news_sources import NewsSource, SourceFetcher
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    delay = 3.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = b'late'
+        try:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def hung_origin():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('hedge', [False, True])
+def test_hung_origin_opens_breaker(hung_origin, hedge):
+    """헤지 예산이 바닥나 첫 요청만 기다리다 시간 초과해도 헤지하지 않은 경우처럼 실패로 기록"""
+    config = {
+        'circuit_breaker': {'failure_threshold': 2, 'open_seconds': 60},
+        # 예산 1을 첫 수집에서 쓰고 나면 이후에는 헤지하지 않음
+        'hedge': {'enabled': hedge, 'initial_delay_seconds': 0.2, 'max_ratio': 0},
+    }
+    fetcher = SourceFetcher(config)
+    source = NewsSource('hung', hung_origin, timeout=1.0)
+    try:
+        errors = [fetcher.fetch(source).error for _ in range(3)]
+    finally:
+        fetcher.close()
+
+    assert isinstance(errors[0], Exception) and not isinstance(errors[0], CircuitOpenError)
+    assert isinstance(errors[2], CircuitOpenError)
+    assert fetcher._breaker(source.host).state == OPEN
+
+
+def test_article_fetches_share_the_host_breaker(hung_origin):
+    """기사 본문 수집 실패도 같은 호스트의 회로 차단기에 기록되어 헤드라인 수집을 멈춤"""
+    fetcher = SourceFetcher({'circuit_breaker': {'failure_threshold': 2, 'open_seconds': 60}})
+    enricher = ArticleEnricher({'enabled': True, 'timeout': 0.5, 'process_workers': 0}, fetcher)
+    articles = [{'link': f'{hung_origin}article/{i}'} for i in range(2)]
+    try:
+        enricher.enrich(articles)
+        result = fetcher.fetch(NewsSource('hung', hung_origin, timeout=1.0))
+    finally:
+        enricher.close()
+        fetcher.close()
+
+    assert not any(article.get('lead') for article in articles)
+    assert isinstance(result.error, CircuitOpenError)
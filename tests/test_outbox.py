@@ -0,0 +1,54 @@
+from outbox import FAILED, PENDING, SENDING, SENT, Outbox
+
+
+def _deliveries(count, chat_id='1'):
+    return [{'key': f'{chat_id}:{i}', 'chat_id': chat_id, 'text': f'메시지 {i}', 'priority': 1}
+            for i in range(count)]
+
+
+def _statuses(outbox):
+    return dict(outbox.conn.execute("SELECT idempotency_key, status FROM outbox"))
+
+
+def test_interrupted_sends_are_recovered(tmp_path):
+    filename = str(tmp_path / 'outbox.db')
+    outbox = Outbox(filename)
+    assert outbox.enqueue(_deliveries(3)) == 3
+    claimed = outbox.claim(batch_size=2)
+    outbox.mark_sent(claimed[0]['id'])
+    outbox.conn.close()  # 전송 도중 중단 (claimed[1]은 sending으로 남음)
+
+    # 전송하지 않는 프로세스(샤드 작업 프로세스)는 전송 중 상태를 건드리지 않음
+    worker = Outbox(filename, recover=False)
+    assert _statuses(worker) == {'1:0': SENT, '1:1': SENDING, '1:2': PENDING}
+    worker.close()
+
+    outbox = Outbox(filename)
+    assert _statuses(outbox) == {'1:0': SENT, '1:1': PENDING, '1:2': PENDING}
+    assert outbox.pending_count() == 2
+    outbox.close()
+
+
+def test_enqueue_is_idempotent(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.db'))
+    assert outbox.enqueue(_deliveries(3)) == 3
+    assert outbox.enqueue(_deliveries(4)) == 1
+    outbox.mark_sent(outbox.claim()[0]['id'])
+    # 보낸 메시지도 보관 기간 동안은 다시 들어가지 않음
+    assert outbox.enqueue(_deliveries(4)) == 0
+    outbox.close()
+
+
+def test_drain_retries_until_max_attempts(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.db'), max_attempts=2)
+    outbox.enqueue(_deliveries(2))
+
+    def send_batch(messages, on_result):
+        for index, message in enumerate(messages):
+            on_result(index, message['text'] == '메시지 0')
+
+    assert outbox.drain(send_batch) == (1, 1)
+    assert _statuses(outbox) == {'1:0': SENT, '1:1': PENDING}
+    assert outbox.drain(send_batch) == (0, 1)
+    assert _statuses(outbox) == {'1:0': SENT, '1:1': FAILED}
+    outbox.close()
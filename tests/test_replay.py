@@ -0,0 +1,82 @@
+import os
+import shutil
+from datetime import datetime
+
+from article import KST
+from replay import replay, snapshot_time
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'benchmarks', 'fixtures', 'headline_list.html')
+
+
+def _config(tmp_path):
+    # 픽스처의 게재 시각은 "08-09 09:00"처럼 연도가 없음
+    return {
+        'telegram': {'chat_id': '1'},
+        'monitoring': {'max_article_age_hours': 24},
+        'outbox': {'file': str(tmp_path / 'outbox.db')},
+    }
+
+
+def test_snapshot_time_from_name_or_mtime():
+    assert snapshot_time('yna/20240809T103000.html') == datetime(2024, 8, 9, 10, 30, tzinfo=KST)
+    assert snapshot_time('yna/2024-08-09_10-30.html.gz') == datetime(2024, 8, 9, 10, 30, tzinfo=KST)
+    assert snapshot_time('yna/page.html', 1723167000) == datetime(2024, 8, 9, 10, 30, tzinfo=KST)
+    assert snapshot_time('yna/page.html') is None
+
+
+def test_replay_judges_age_at_snapshot_time(tmp_path):
+    archive = tmp_path / 'archive' / 'yna'
+    archive.mkdir(parents=True)
+    shutil.copy(FIXTURE, archive / '20240809T100000.html')
+    shutil.copy(FIXTURE, archive / 'undated.html')
+    os.utime(archive / 'undated.html', (1723167000, 1723167000))
+
+    summary = replay(_config(tmp_path), str(tmp_path / 'archive'), str(tmp_path / 'report.jsonl'), workers=1)
+    assert summary['snapshots'] == 2
+    # 지금 시각 기준이면 2년 전 기사라 모두 알림 기간 밖
+    assert summary['new'] == 10
+
+
+def _page(titles):
+    items = ''.join(
+        f'<div class="headline-list"><a href="https://www.yna.co.kr/view/{link}">{title}</a></div>'
+        for title, link in titles
+    )
+    return f'<html><body>{items}</body></html>'
+
+
+def _words(rng, count):
+    return ' '.join(''.join(chr(rng.randrange(0xAC00, 0xD7A4)) for _ in range(2)) for _ in range(count))
+
+
+def test_replay_near_duplicate_window_survives_index_rebuild(tmp_path):
+    import random
+    from datetime import timedelta
+
+    rng = random.Random(20)
+    archive = tmp_path / 'archive' / 'yna'
+    archive.mkdir(parents=True)
+    start = datetime(2024, 8, 9, 10, 0)
+
+    def write(at, titles):
+        (archive / f'{at:%Y%m%dT%H%M%S}.html').write_text(_page(titles), encoding='utf-8')
+
+    first = ('정부, 반도체 수출 지원 대책 발표…기업 세액공제 대폭 확대', 'FIRST')
+    write(start, [first])
+    # 첫 기사는 계속 목록에 남고(LRU 갱신), 서로 다른 제목 2250개가 쌓여 유사 제목 색인이
+    # 저장소 기준으로 다시 구성되는 동안 36시간 진행
+    for n in range(250):
+        write(start + timedelta(minutes=10 + n * 9),
+              [first] + [(f'{_words(rng, 5)} {n}-{i}', f'FILL{n}-{i}') for i in range(9)])
+    # 36시간 뒤 비슷한 제목: 비교 기간(24시간) 밖이므로 알림
+    write(start + timedelta(hours=40), [('정부, 반도체 수출 지원 대책 발표…기업 세액공제 확대', 'SECOND')])
+
+    config = dict(_config(tmp_path), dedup={'near_duplicate': True, 'window_hours': 24},
+                  monitoring={}, storage={'max_stored_articles': 500})
+    report = tmp_path / 'report.jsonl'
+    summary = replay(config, str(tmp_path / 'archive'), str(report), workers=1)
+
+    assert summary['snapshots'] == 252
+    links = report.read_text(encoding='utf-8')
+    assert 'view/FIRST' in links and 'view/SECOND' in links
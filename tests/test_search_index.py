@@ -0,0 +1,62 @@
+import time
+from datetime import datetime
+
+from article_store import ProcessedArticleStore
+
+
+def _info(i, processed_at=None):
+    return {'title': f'속보 반도체 수출 {i}번째 기사', 'link': f'https://example.com/{i}',
+            'source': '연합뉴스', 'processed_at': processed_at or datetime.now().isoformat()}
+
+
+def test_evicted_articles_stay_searchable(tmp_path):
+    store = ProcessedArticleStore(str(tmp_path / 'store.db'), max_articles=5, search_index=True)
+    for i in range(20):
+        store[f'h{i}'] = _info(i)
+        store.flush()
+
+    assert len(store) == 5
+    results = store.search('반도체 수출', limit=50)
+    assert len(results) == 20
+    assert results[0]['link'] == 'https://example.com/19'
+    assert 'h3' in {r['hash'] for r in store.search('3번째', limit=50)}
+    store.close()
+
+
+def test_index_has_its_own_retention(tmp_path):
+    store = ProcessedArticleStore(str(tmp_path / 'store.db'), search_index=True,
+                                  search_max_documents=10, search_ttl_days=30)
+    old = datetime.fromtimestamp(time.time() - 40 * 86400).isoformat()
+    store['old'] = _info('old', old)
+    store.flush()
+    assert [r['hash'] for r in store.search('old')] == []
+
+    for i in range(15):
+        store[f'h{i}'] = _info(i)
+    store.flush()
+    hashes = {r['hash'] for r in store.search('반도체', limit=50)}
+    assert hashes == {f'h{i}' for i in range(5, 15)}
+    assert 'old' in store
+    store.close()
+
+
+def test_upgrades_index_without_metadata_columns(tmp_path):
+    filename = str(tmp_path / 'store.db')
+    store = ProcessedArticleStore(filename)
+    store['h1'] = _info(1)
+    store.close()
+
+    import sqlite3
+    conn = sqlite3.connect(filename)
+    conn.executescript("""
+        CREATE TABLE search_documents (id INTEGER PRIMARY KEY, hash TEXT NOT NULL UNIQUE);
+        CREATE TABLE search_postings (token TEXT NOT NULL, doc INTEGER NOT NULL,
+                                      PRIMARY KEY (token, doc)) WITHOUT ROWID;
+        INSERT INTO search_documents (id, hash) VALUES (1, 'h1');
+        INSERT INTO search_postings (token, doc) VALUES ('반도', 1);
+    """)
+    conn.close()
+
+    store = ProcessedArticleStore(filename, search_index=True)
+    assert store.search('반도')[0]['link'] == 'https://example.com/1'
+    store.close()
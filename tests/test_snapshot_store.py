@@ -0,0 +1,86 @@
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from article_store import ProcessedArticleStore
+from near_duplicate import minhash, signature_to_hex
+from snapshot_store import SnapshotArticleStore, SnapshotFormatError
+
+
+def _hash(i):
+    return hashlib.md5(str(i).encode()).hexdigest()
+
+
+def _info(i, processed_at=None):
+    title = f'정부 반도체 지원책 {i}차 발표'
+    return {'title': title, 'source': '연합뉴스', 'source_id': 'yonhap_headlines',
+            'link': f'https://www.yna.co.kr/view/AKR{i:0>13}',
+            'processed_at': (processed_at or datetime.now()).isoformat(),
+            'minhash': signature_to_hex(minhash(title))}
+
+
+def test_round_trip(tmp_path):
+    filename = str(tmp_path / 'store.snap')
+    store = SnapshotArticleStore(filename)
+    for i in range(50):
+        store[_hash(i)] = _info(i)
+    store.set_metadata('http_validators', {'https://www.yna.co.kr/': {'etag': '"abc"'}})
+    store.close()
+
+    store = SnapshotArticleStore(filename)
+    assert len(store) == 50
+    assert _hash(7) in store and _hash(50) not in store
+    assert store[_hash(7)]['link'] == 'https://www.yna.co.kr/view/AKR0000000000007'
+    assert store.get_metadata('http_validators') == {'https://www.yna.co.kr/': {'etag': '"abc"'}}
+    signatures = {h: signature for h, _, signature, _ in store.iter_titles()}
+    assert signatures[_hash(7)] == _info(7)['minhash']
+
+    # 변경(추가·삭제·LRU 갱신)도 다시 열면 그대로
+    del store[_hash(0)]
+    store[_hash(100)] = _info(100)
+    store.touch(_hash(1))
+    store.close()
+
+    store = SnapshotArticleStore(filename)
+    assert len(store) == 50
+    assert _hash(0) not in store and _hash(100) in store
+    assert sorted(store) == sorted(_hash(i) for i in list(range(1, 50)) + [100])
+    signatures = {h: signature for h, _, signature, _ in store.iter_titles()}
+    assert signatures[_hash(100)] == _info(100)['minhash']
+    store.close()
+
+
+def test_retention_keeps_recent(tmp_path):
+    filename = str(tmp_path / 'store.snap')
+    store = SnapshotArticleStore(filename, max_articles=10, ttl_days=30)
+    now = datetime.now()
+    store[_hash('old')] = _info('old', now - timedelta(days=40))
+    for i in range(20):
+        store[_hash(i)] = _info(i, now - timedelta(minutes=i))
+    store.close()
+
+    store = SnapshotArticleStore(filename, max_articles=10, ttl_days=30)
+    assert len(store) == 10
+    assert _hash('old') not in store
+    assert all(_hash(i) in store for i in range(10))
+    store.close()
+
+
+def test_imports_legacy_sqlite_store(tmp_path):
+    legacy = ProcessedArticleStore(str(tmp_path / 'store.db'))
+    for i in range(5):
+        legacy[_hash(i)] = _info(i)
+    legacy.close()
+
+    store = SnapshotArticleStore(str(tmp_path / 'store.snap'))
+    assert len(store) == 5
+    assert {h: s for h, _, s, _ in store.iter_titles()}[_hash(3)] == _info(3)['minhash']
+    store.close()
+
+
+def test_rejects_corrupt_file(tmp_path):
+    filename = tmp_path / 'bad.snap'
+    filename.write_bytes(b'garbage' * 20)
+    with pytest.raises(SnapshotFormatError):
+        SnapshotArticleStore(str(filename))
@@ -0,0 +1,33 @@
+import re
+
+from telegram_bot import MAX_MESSAGE_LENGTH, message_length, truncate_message
+
+
+def _balanced(text):
+    tags = re.findall(r'<(/?)([a-z]+)', text)
+    return [name for closing, name in tags if not closing] == [name for closing, name in tags if closing]
+
+
+def test_long_digest_is_cut_at_a_line_boundary():
+    article = '📰 <b>반도체 &amp; 수출</b>\n🔗 <a href="https://example.com/?a=1&amp;b=2">기사 읽기</a>'
+    text = '\n\n'.join([article] * 200)
+
+    truncated = truncate_message(text)
+    assert message_length(truncated) <= MAX_MESSAGE_LENGTH
+    assert truncated.endswith('\n...')
+    assert text.startswith(truncated[:-len('\n...')])
+    assert _balanced(truncated)
+
+
+def test_single_long_line_keeps_tags_and_entities_whole():
+    for padding in range(8):
+        text = '📰 <b>' + '가' * padding + '&amp;한국 ' * 2000 + '</b>'
+        truncated = truncate_message(text)
+        assert message_length(truncated) <= MAX_MESSAGE_LENGTH
+        assert truncated.endswith('...</b>')
+        body = truncated[len('📰 <b>'):-len('...</b>')]
+        assert '<' not in body and re.sub('&amp;', '', body).count('&') == 0
+
+
+def test_short_message_is_unchanged():
+    assert truncate_message('📰 <b>제목</b>') == '📰 <b>제목</b>'
@@ -3,35 +3,27 @@
 """
 
 import os
+import sys
+import subprocess
 import logging
 import json
-from datetime import datetime
 import hashlib
 import re
+import sqlite3
+from article_store import ProcessedArticleStore, is_sqlite_path
+from snapshot_store import SnapshotArticleStore, SnapshotFormatError, is_snapshot_path
+from log_pipeline import start_logging
+from article import parse_datetime
 
 def setup_logging(logging_config=None):
-    """로깅 설정"""
+    """로깅 설정 (큐 기반, 파일 쓰기는 별도 스레드에서, 크기 기준 회전 기본 적용)
+    
+    logging_config: config.json의 logging 항목 (level, file, format, rotation, sample_warnings)
+    """
     if logging_config is None:
         logging_config = {'level': 'INFO', 'file': 'news_monitor.log'}
-        
-    log_level = getattr(logging, logging_config.get('level', 'INFO').upper())
-    log_file = logging_config.get('file', 'news_monitor.log')
-    
-    # 로그 포맷 설정
-    log_format = '%(asctime)s - %(levelname)s - %(message)s'
-    date_format = '%Y-%m-%d %H:%M:%S'
-    
-    # 로깅 설정
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        datefmt=date_format,
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
     
+    start_logging(logging_config)
     logging.info("로깅 시스템 초기화 완료")
 
 def clean_text(text):
@@ -80,32 +72,12 @@ def generate_content_hash(content):
     return hashlib.md5(content.encode('utf-8')).hexdigest()
 
 def format_datetime(dt_string, output_format='%Y-%m-%d %H:%M'):
-    """날짜시간 문자열 포맷팅"""
-    try:
-        # 다양한 입력 형식 시도
-        input_formats = [
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%d %H:%M:%S',
-            '%a, %d %b %Y %H:%M:%S %Z',
-            '%a, %d %b %Y %H:%M:%S %z'
-        ]
-        
-        dt = None
-        for fmt in input_formats:
-            try:
-                dt = datetime.strptime(dt_string, fmt)
-                break
-            except ValueError:
-                continue
-        
-        if dt:
-            return dt.strftime(output_format)
-        
-        return dt_string  # 파싱 실패시 원본 반환
-        
-    except Exception:
-        return dt_string
+    """날짜시간 문자열 포맷팅 (문자열 모양으로 형식을 판별하는 캐시된 파서 사용)"""
+    dt = parse_datetime(dt_string)
+    if dt:
+        return dt.strftime(output_format)
+    
+    return dt_string  # 파싱 실패시 원본 반환
 
 def save_json(data, filename, encoding='utf-8'):
     """JSON 파일 저장"""
@@ -147,6 +119,10 @@ def get_file_size(filename):
     except OSError:
         return 0
 
+def get_storage_size(filename):
+    """저장소 파일 크기 반환 (SQLite WAL·공유 메모리 파일 포함, 바이트)"""
+    return sum(get_file_size(filename + suffix) for suffix in ('', '-wal', '-shm'))
+
 def format_file_size(size_bytes):
     """파일 크기를 읽기 쉬운 형식으로 변환"""
     if size_bytes == 0:
@@ -176,14 +152,74 @@ def validate_telegram_config(bot_token, chat_id):
     
     return True, "설정이 유효합니다."
 
-def save_processed_articles(articles_dict, filename="processed_articles.json"):
+def save_processed_articles(articles_dict, filename="processed_articles.json", max_articles=None):
     """처리된 기사 정보 저장"""
+    # SQLite 저장소는 새 해시만 기록
+    if hasattr(articles_dict, 'flush'):
+        return articles_dict.flush()
+    
+    # JSON 파일은 최근 처리된 기사 max_articles개만 유지
+    if max_articles and len(articles_dict) > max_articles:
+        recent = sorted(
+            articles_dict.items(),
+            key=lambda item: item[1].get('processed_at', '') if isinstance(item[1], dict) else ''
+        )[-max_articles:]
+        articles_dict.clear()
+        articles_dict.update(recent)
+    
     return save_json(articles_dict, filename)
 
-def load_processed_articles(filename="processed_articles.json"):
-    """처리된 기사 정보 로드"""
+def load_processed_articles(filename="processed_articles.json", max_articles=None, ttl_days=None,
+                            bloom_bits_per_item=0, search_index=False, search_max_documents=None,
+                            search_ttl_days=None):
+    """처리된 기사 정보 로드 (.db 경로는 SQLite 저장소 사용)"""
+    if is_sqlite_path(filename):
+        try:
+            return ProcessedArticleStore(filename, max_articles=max_articles, ttl_days=ttl_days,
+                                         bloom_bits_per_item=bloom_bits_per_item,
+                                         search_index=search_index,
+                                         search_max_documents=search_max_documents,
+                                         search_ttl_days=search_ttl_days)
+        except sqlite3.Error as e:
+            logging.error(f"처리 기사 저장소 열기 실패 ({filename}): {e}")
+            return {}
+    
+    # .snap 경로는 압축 스냅샷 저장소 (GitHub Actions 아티팩트용)
+    if is_snapshot_path(filename):
+        try:
+            return SnapshotArticleStore(filename, max_articles=max_articles, ttl_days=ttl_days)
+        except (OSError, SnapshotFormatError) as e:
+            logging.error(f"처리 기사 스냅샷 열기 실패 ({filename}): {e}")
+            return {}
+    
     return load_json(filename, default={})
 
+def profile_startup(modules, top=15):
+    """새 인터프리터에서 모듈 import 시간 측정 (python -X importtime)
+    
+    (전체 ms, [(모듈, 누적 ms, 자체 ms)] 누적 시간 상위 top개) 반환.
+    앞서 import된 모듈은 다시 세지 않으므로 modules 순서대로 추가 비용이 측정됩니다.
+    """
+    code = '; '.join(f'import {module}' for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    
+    total_us = 0
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.strip() in modules and not name[1:].startswith(' '):
+            # 요청한 모듈의 최상위 import만 전체 시간에 합산 (인터프리터 시작 시 site 등 제외)
+            total_us += int(cumulative_us)
+        rows.append((name.strip(), int(cumulative_us) / 1000, int(self_us) / 1000))
+    
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return total_us / 1000, rows[:top]
+
 def get_system_info():
     """시스템 정보 반환"""
     info = {
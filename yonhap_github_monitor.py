@@ -12,12 +12,8 @@ from utils import setup_logging
 def main():
     """GitHub Actions에서 실행되는 메인 함수"""
     try:
-        # 로깅 설정
-        setup_logging()
         logger = logging.getLogger(__name__)
         
-        logger.info("연합뉴스 헤드라인 모니터링 시작 (GitHub Actions)")
-        
         # 설정 로드
         config_file = 'yonhap_config.json'
         if not os.path.exists(config_file):
@@ -27,6 +23,10 @@ def main():
         with open(config_file, 'r', encoding='utf-8') as f:
             config = json.load(f)
         
+        # 로깅 설정 (config의 logging 항목)
+        setup_logging(config.get('logging'))
+        logger.info("연합뉴스 헤드라인 모니터링 시작 (GitHub Actions)")
+        
         # 환경변수에서 텔레그램 설정 가져오기
         telegram_bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID')
@@ -35,28 +35,32 @@ def main():
             logger.error("텔레그램 환경변수가 설정되지 않았습니다")
             return
         
-        # 환경변수로 설정 오버라이드
-        config['telegram'] = {
+        # 환경변수로 설정 오버라이드 (api_url, mode 등 나머지 설정은 유지)
+        config.setdefault('telegram', {}).update({
             'bot_token': telegram_bot_token,
             'chat_id': telegram_chat_id
-        }
+        })
         
         # 처리된 기사 파일명 설정
         config['storage'] = config.get('storage', {})
-        config['storage']['processed_articles_file'] = 'yonhap_processed_articles.json'
+        config['storage'].setdefault('processed_articles_file', 'yonhap_processed_articles.db')
         
         # 연합뉴스 모니터 초기화 및 실행
         monitor = YonhapNewsMonitor(config)
         
-        # 텔레그램 봇 연결 테스트
-        if monitor.telegram_bot.test_connection():
-            logger.info("✅ 텔레그램 봇 연결 성공")
-        else:
-            logger.error("❌ 텔레그램 봇 연결 실패")
-            return
-        
-        # 뉴스 모니터링 실행
-        monitor.monitor_news()
+        try:
+            # 뉴스 모니터링 실행 (보낼 메시지가 없으면 텔레그램에 접속하지 않음)
+            monitor.monitor_news()
+            monitor.write_metrics_summary()
+            
+            # 전송이 실패했을 때만 봇 연결 상태 확인
+            if monitor.delivery_failures:
+                if monitor.telegram_bot.test_connection():
+                    logger.info("✅ 텔레그램 봇 연결 성공")
+                else:
+                    logger.error("❌ 텔레그램 봇 연결 실패")
+        finally:
+            monitor.close()
         
         logger.info("연합뉴스 헤드라인 모니터링 완료")
         
@@ -4,123 +4,177 @@
 시간대별 헤드라인 기사를 텔레그램으로 알림
 """
 
-import requests
 import json
 import time
 import logging
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-import trafilatura
-import re
 import hashlib
+import re
 import os
+import argparse
+import threading
 from telegram_bot import TelegramBot
-from utils import setup_logging, save_processed_articles, load_processed_articles
+from news_sources import load_news_sources, SourceFetcher
+from article_enricher import ArticleEnricher
+from keyword_filter import KeywordFilter, DEFAULT_SUBSCRIBER
+from outbox import Outbox
+from adaptive_scheduler import AdaptiveScheduler
+from metrics import Metrics, MetricsServer
+from headline_api import HeadlineFeed, HeadlineApiServer
+from near_duplicate import MinHashLSHIndex, minhash, signature_from_hex, signature_to_hex
+from near_duplicate import DEFAULT_THRESHOLD as DEFAULT_SIMILARITY_THRESHOLD
+from utils import setup_logging, save_processed_articles, load_processed_articles, get_storage_size
+from utils import profile_startup
+from article_store import ProcessedArticleStore
+from log_pipeline import new_cycle_id
+from article import newest_first
+
+# 제목 머리말로 속보 판별
+BREAKING_PATTERN = re.compile(r'^\s*[\[(<〈【]\s*(속보|1보|긴급)')
 
 class YonhapNewsMonitor:
-    def __init__(self, config):
+    def __init__(self, config, shard_worker=False):
         self.config = config
-        self.telegram_bot = TelegramBot(config)
-        self.processed_articles = load_processed_articles()
+        
+        # 샤드 작업 프로세스: 처리 기록은 공유 저장소에서 원자적으로 확인 후 추가하고,
+        # 전송은 상위 프로세스가 담당 (sharding.py)
+        self.shard_worker = shard_worker
+        
+        # 단계별 소요 시간과 카운터 (상주 모드는 HTTP 엔드포인트, 단일 실행은 JSON 요약 파일)
+        self.metrics = Metrics()
+        self.metrics_config = config.get('metrics', {})
+        self.metrics_server = None
+        
+        # 다른 도구에 기사를 제공하는 로컬 API (상주 모드에서 api.port 설정 시)
+        self.api_config = config.get('api', {})
+        self.headline_feed = None
+        self.api_server = None
+        
+        self.telegram_bot = TelegramBot(config, self.metrics)
+        
+        # 처리된 기사 저장소 (설정된 경로, 최대 개수, 보관 기간 적용)
+        storage = config.get('storage', {})
+        search = config.get('search', {})
+        self.processed_articles_file = storage.get('processed_articles_file', 'processed_articles.json')
+        self.max_stored_articles = storage.get('max_stored_articles')
+        self.processed_articles = load_processed_articles(
+            self.processed_articles_file,
+            max_articles=self.max_stored_articles,
+            ttl_days=storage.get('article_ttl_days'),
+            bloom_bits_per_item=storage.get('bloom_bits_per_article', 0),
+            search_index=search.get('enabled', False),
+            search_max_documents=search.get('max_documents'),
+            search_ttl_days=search.get('retention_days')
+        )
         self.logger = logging.getLogger(__name__)
         
-    def get_yonhap_headlines(self):
-        """연합뉴스 헤드라인 페이지에서 기사 수집"""
+        # 뉴스 소스 목록과 동시 수집기 (상주 모드에서 연결과 조건부 요청 상태 재사용)
+        self.sources = load_news_sources(config)
+        self.fetcher = SourceFetcher(config.get('fetching', {}), self.metrics)
+        self.load_http_validators()
+        
+        # 새 기사 본문 보강 (선택)
+        self.enricher = ArticleEnricher(config.get('enrichment', {}), self.fetcher)
+        
+        # 헤드라인 파서 백엔드 (strainer / soup)
+        self.parser_backend = config.get('parsing', {}).get('backend', 'strainer')
+        
+        # 구독 채팅 (기본 채팅 + subscribers)과 채팅별 전송 방식 (instant: 기사마다, digest: 묶어서)
+        self.subscriber_chats = {DEFAULT_SUBSCRIBER: self.telegram_bot.chat_id}
+        self.chat_modes = {str(self.telegram_bot.chat_id): config.get('telegram', {}).get('mode', 'instant')}
+        for subscriber in config.get('subscribers', []):
+            chat_id = str(subscriber.get('chat_id', ''))
+            if chat_id:
+                self.subscriber_chats[chat_id] = chat_id
+                self.chat_modes[chat_id] = subscriber.get('mode', 'instant')
+        
+        # 보낼 메시지는 발신함에 먼저 기록 (채팅별 전송 상태 보관)
+        outbox_config = config.get('outbox', {})
+        self.outbox = Outbox(
+            outbox_config.get('file', 'outbox.db'),
+            max_attempts=outbox_config.get('max_attempts', 5),
+            retention_days=outbox_config.get('retention_days', 7),
+            recover=not shard_worker
+        )
+        self.outbox_batch_size = outbox_config.get('batch_size', 500)
+        # digest 채팅은 한 번에 보낼 기사 수를 메시지 수 대신 따로 제한
+        self.digest_max_articles = outbox_config.get('digest_max_articles', 50)
+        monitoring = config.get('monitoring', {})
+        self.max_articles_per_run = monitoring.get('max_articles_per_run', config.get('max_articles_per_run', 5))
+        # 게재 시각이 이보다 오래된 기사는 알리지 않음 (0이면 끔)
+        self.max_article_age_hours = monitoring.get('max_article_age_hours', 0)
+        
+        # 포함/제외 키워드 필터 (Aho-Corasick, 구독자별)
+        self.keyword_filter = KeywordFilter.from_config(config)
+        self.match_body = config.get('keywords', {}).get('match_body', False)
+        
+        # 유사 제목 감지 (선택, 색인은 새 기사가 처음 나올 때 구성)
+        dedup = config.get('dedup', {})
+        self.near_duplicate_enabled = dedup.get('near_duplicate', False)
+        self.similarity_threshold = dedup.get('similarity_threshold', DEFAULT_SIMILARITY_THRESHOLD)
+        # 최근 window_hours 동안 처리한 기사와만 비교 (몇 주 전 비슷한 제목의 다른 소식은 통과)
+        self.near_duplicate_window_hours = dedup.get('window_hours', 24)
+        self.near_duplicate_index = None
+        
+        # 마지막 filter_new_articles에서 처리된 것으로 기록한 해시 (발신함 기록 실패 시 취소)
+        self.recorded_hashes = []
+        # 샤드 모드: 발신함 기록 후 공유 저장소에 기록할 {해시: 메타데이터}
+        self.pending_claims = {}
+        
+        # 마지막 전송에서 실패한 메시지 수
+        self.delivery_failures = 0
+        
+        # 마지막 수집의 소스별 결과 {소스 이름: {'status': ..., 'new': 새 기사 수}}
+        self.source_results = {}
+        
+    def get_yonhap_headlines(self, sources=None):
+        """설정된 연합뉴스 페이지들(또는 sources)에서 기사 동시 수집"""
+        sources = sources or self.sources
+        self.source_results = {}
         try:
-            url = "https://www.yna.co.kr/report/headline?site=wholemenu_headline"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            self.logger.info(f"연합뉴스 헤드라인 확인: {url}")
+            self.logger.info(f"연합뉴스 헤드라인 확인: {len(sources)}개 페이지")
             
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
             articles = []
+            seen_links = set()
             
-            # 헤드라인 기사 추출
-            headline_items = soup.find_all('div', class_='headline-list')
-            
-            if not headline_items:
-                # 다른 구조 시도
-                headline_items = soup.find_all('article')
-                if not headline_items:
-                    headline_items = soup.find_all('div', {'class': re.compile(r'.*item.*|.*news.*|.*article.*')})
+            with self.metrics.stage('fetch'):
+                results = self.fetcher.fetch_all(sources)
             
-            for item in headline_items[:10]:  # 최대 10개 기사
-                try:
-                    # 제목 추출
-                    title_elem = item.find('a') or item.find('h2') or item.find('h3')
-                    if not title_elem:
-                        continue
-                        
-                    title = title_elem.get_text(strip=True)
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    # 링크 추출
-                    link = title_elem.get('href', '')
-                    if link and not link.startswith('http'):
-                        link = 'https://www.yna.co.kr' + link
-                    
-                    # 시간 정보 추출
-                    time_elem = item.find('time') or item.find('span', {'class': re.compile(r'.*time.*|.*date.*')})
-                    published_time = ''
-                    if time_elem:
-                        published_time = time_elem.get_text(strip=True)
-                    
-                    if title and link:
-                        articles.append({
-                            'title': title,
-                            'link': link,
-                            'published_time': published_time,
-                            'source': '연합뉴스'
-                        })
-                        
-                except Exception as e:
-                    self.logger.warning(f"기사 파싱 오류: {e}")
+            for result in results:
+                source = result.source
+                self.source_results[source.name] = {'status': result.status, 'new': 0}
+                self.metrics.observe('fetch_seconds', result.elapsed, source=source.name)
+                self.metrics.inc('fetch_results_total', source=source.name, status=result.status)
+                
+                if result.status == 'not_modified':
+                    self.logger.info(f"[{source.name}] 페이지 변경 없음 (304)")
                     continue
+                
+                if result.status == 'error':
+                    self.logger.error(f"[{source.name}] 연합뉴스 스크래핑 오류: {result.error}")
+                    continue
+                
+                # 파서(bs4, lxml)는 페이지가 바뀌었을 때만 로드
+                with self.metrics.stage('parse'):
+                    from headline_parser import parse_headlines
+                    source_articles = parse_headlines(result.content, self.parser_backend)
+                self.logger.info(f"[{source.name}] {len(source_articles)}개 기사 ({result.elapsed:.2f}초)")
+                
+                # 여러 페이지에 걸친 같은 기사는 한 번만
+                for article in source_articles:
+                    if article['link'] in seen_links:
+                        continue
+                    seen_links.add(article['link'])
+                    article['source_id'] = source.name
+                    articles.append(article)
+                
+                if self.headline_feed is not None:
+                    self.headline_feed.set_current(source.name, source_articles)
             
-            # 일반 텍스트에서 기사 추출 (fallback)
-            if not articles:
-                text_content = trafilatura.extract(response.content)
-                if text_content:
-                    lines = text_content.split('\n')
-                    current_title = None
-                    current_link = None
-                    
-                    for line in lines:
-                        line = line.strip()
-                        if not line:
-                            continue
-                            
-                        # 헤드라인 패턴 찾기
-                        if '[연합뉴스 이 시각 헤드라인]' in line or '■' in line:
-                            if current_title and current_link:
-                                articles.append({
-                                    'title': current_title,
-                                    'link': current_link,
-                                    'published_time': '',
-                                    'source': '연합뉴스'
-                                })
-                            current_title = line.replace('■', '').strip()
-                            current_link = None
-                            
-                        elif line.startswith('전문보기:') or line.startswith('https://'):
-                            current_link = line.replace('전문보기:', '').strip()
-                            
-                        elif '시각' in line and ':' in line:
-                            # 시간 정보
-                            pass
-            
+            self.metrics.inc('articles_total', len(articles), stage='collected')
             self.logger.info(f"연합뉴스에서 {len(articles)}개 기사 수집")
             return articles
             
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"연합뉴스 스크래핑 오류: {e}")
-            return []
         except Exception as e:
             self.logger.error(f"연합뉴스 처리 중 오류: {e}")
             return []
@@ -134,107 +188,620 @@ class YonhapNewsMonitor:
         """이미 처리된 기사인지 확인"""
         return article_hash in self.processed_articles
     
-    def filter_new_articles(self, articles):
-        """새로운 기사만 필터링"""
+    def load_http_validators(self):
+        """이전 실행의 조건부 요청 검증자 복원 (단일 실행에서도 304 응답을 받도록)"""
+        if hasattr(self.processed_articles, 'get_metadata'):
+            self.fetcher.http_validators.update(self.processed_articles.get_metadata('http_validators', {}))
+    
+    def save_http_validators(self):
+        """조건부 요청 검증자 저장 (처리된 기사를 저장한 뒤에 호출)
+        
+        이 프로세스가 수집한 페이지의 검증자만 저장된 값에 덮어써 다른 샤드의 검증자는 유지합니다.
+        """
+        if hasattr(self.processed_articles, 'set_metadata'):
+            validators = self.processed_articles.get_metadata('http_validators', {})
+            validators.update(
+                (source.url, self.fetcher.http_validators[source.url])
+                for source in self.sources if source.url in self.fetcher.http_validators
+            )
+            self.processed_articles.set_metadata('http_validators', validators)
+    
+    def near_duplicate_since(self, now=None):
+        """유사 제목 비교 기간의 시작 (epoch 초, now 기본 현재)"""
+        return (now or time.time()) - self.near_duplicate_window_hours * 3600
+    
+    def load_near_duplicate_index(self, now=None):
+        """최근 처리한 기사 제목으로 유사 제목 색인 구성 (now 기준 비교 기간, 기본 현재)"""
+        self.near_duplicate_index = MinHashLSHIndex(self.similarity_threshold)
+        since = self.near_duplicate_since(now)
+        if hasattr(self.processed_articles, 'iter_titles'):
+            rows = self.processed_articles.iter_titles(since)
+        else:
+            rows = (
+                (article_hash, info.get('title'), info.get('minhash'),
+                 ProcessedArticleStore._timestamp(info.get('processed_at'), None))
+                for article_hash, info in self.processed_articles.items()
+                if isinstance(info, dict)
+            )
+        
+        for article_hash, title, stored_signature, processed_at in rows:
+            if processed_at is None or processed_at < since:
+                continue
+            signature = signature_from_hex(stored_signature) if stored_signature else None
+            if signature is None:
+                signature = minhash(title)
+            self.near_duplicate_index.add(signature, title, processed_at)
+        
+        self.logger.info(f"유사 제목 색인: {len(self.near_duplicate_index)}개")
+    
+    def filter_new_articles(self, articles, now=None):
+        """새로운 기사만 필터링 (게재 시각 최신순으로 반환)
+        
+        now: 알림 기간·유사 제목 비교 기간의 기준 시각 (기본 현재, 재실행은 페이지 저장 시각)
+        """
         new_articles = []
+        claims = {}
+        recorded = []
+        expired = 0
+        now = now.timestamp() if now else time.time()
+        cutoff = now - self.max_article_age_hours * 3600 if self.max_article_age_hours else None
         for article in articles:
             article_hash = self.generate_article_hash(article)
-            if not self.is_processed(article_hash):
+            if self.is_processed(article_hash):
+                # 최근 확인 시각 갱신 (LRU 보관)
+                if hasattr(self.processed_articles, 'touch'):
+                    self.processed_articles.touch(article_hash)
+                continue
+            
+            # 게재 시각이 알림 기간을 지난 기사는 기록하지 않고 제외 (시각을 모르면 통과)
+            published_at = article.get('published_at')
+            if cutoff is not None and published_at is not None and published_at < cutoff:
+                expired += 1
+                continue
+            
+            article['hash'] = article_hash
+            record = {
+                'title': article['title'],
+                'processed_at': datetime.fromtimestamp(now).isoformat(),
+                'source': article['source'],
+                'source_id': article.get('source_id'),
+                'link': article['link']
+            }
+            
+            is_near_duplicate = False
+            if self.near_duplicate_enabled:
+                if self.near_duplicate_index is None:
+                    self.load_near_duplicate_index(now)
+                signature = minhash(article['title'])
+                match = self.near_duplicate_index.find(signature, since=self.near_duplicate_since(now))
+                if match:
+                    is_near_duplicate = True
+                    self.metrics.inc('articles_total', stage='near_duplicate')
+                    self.logger.info(f"유사 기사 제외 ({match[1]:.2f}): {article['title']} ≈ {match[0]}")
+                self.near_duplicate_index.add(signature, article['title'], now)
+                record['minhash'] = signature_to_hex(signature)
+            
+            # 유사 기사도 처리된 것으로 기록해 다음 실행에서 다시 비교하지 않음
+            if self.shard_worker:
+                claims[article_hash] = record
+            else:
+                self.processed_articles[article_hash] = record
+                recorded.append(article_hash)
+            if not is_near_duplicate:
                 new_articles.append(article)
-                self.processed_articles[article_hash] = {
-                    'title': article['title'],
-                    'processed_at': datetime.now().isoformat(),
-                    'source': article['source']
-                }
+        
+        # 샤드 모드: 같은 기사를 다른 작업 프로세스가 이미 기록했으면 제외
+        # (공유 저장소에는 발신함 기록 후 record_claims로 기록, 동시에 발견한 기사는 발신함 멱등 키로 한 번만 전송)
+        if claims:
+            claimed_elsewhere = self.processed_articles.find_recorded(claims)
+            if claimed_elsewhere:
+                self.metrics.inc('articles_total', len(claimed_elsewhere), stage='claimed_elsewhere')
+                self.logger.info(f"다른 작업 프로세스가 먼저 처리한 기사 {len(claimed_elsewhere)}개 제외")
+                new_articles = [article for article in new_articles if article['hash'] not in claimed_elsewhere]
+                claims = {h: record for h, record in claims.items() if h not in claimed_elsewhere}
+        self.pending_claims = claims
+        self.recorded_hashes = recorded
+        
+        if expired:
+            self.metrics.inc('articles_total', expired, stage='expired')
+            self.logger.info(f"게재 후 {self.max_article_age_hours}시간이 지난 기사 {expired}개 제외")
+        
+        # 채팅당 전송 개수 제한이 있으므로 최근 기사부터 발신함에 기록 (이미 파싱한 published_at으로 정렬)
+        new_articles.sort(key=newest_first)
+        self.metrics.inc('articles_total', len(new_articles), stage='new')
         return new_articles
     
+    def record_claims(self):
+        """샤드 모드: 발신함에 기록한 기사를 공유 저장소에 기록
+        
+        발신함 기록 뒤에 기록하므로 그 사이 작업 프로세스가 종료되면 다음 실행에서 다시 새 기사로 처리하고,
+        이미 발신함에 있는 메시지는 멱등 키로 다시 들어가지 않습니다.
+        """
+        if self.pending_claims:
+            self.processed_articles.claim(self.pending_claims)
+            self.pending_claims = {}
+    
+    def forget_articles(self, hashes):
+        """발신함에 기록하지 못한 기사의 처리 기록 취소 (다음 실행에서 다시 새 기사로 처리)"""
+        forgotten = len(hashes) + len(self.pending_claims)
+        self.pending_claims = {}
+        for article_hash in hashes:
+            try:
+                del self.processed_articles[article_hash]
+            except KeyError:
+                pass
+        if forgotten:
+            # 취소한 제목이 유사 기사로 걸리지 않도록 색인은 저장소 기준으로 다시 구성
+            self.near_duplicate_index = None
+            self.logger.warning(f"발신함 기록 실패로 기사 {forgotten}개 처리 기록 취소")
+    
+    def format_article_message(self, article):
+        """기사 알림 메시지 포맷 (심플하게)"""
+        escape = self.telegram_bot.escape_html
+        message = f"📰 <b>{escape(article['title'])}</b>\n\n"
+        
+        if article.get('lead'):
+            message += f"{escape(article['lead'])}\n\n"
+        
+        if article.get('published_time'):
+            message += f"⏰ {escape(article['published_time'])}\n"
+        
+        message += f"📍 {escape(article['source'])}\n"
+        message += f"🔗 <a href=\"{escape(article['link'])}\">기사 읽기</a>"
+        
+        return message
+    
     def send_article_notification(self, article):
         """개별 기사 텔레그램 알림 전송"""
         try:
-            # 메시지 포맷 (심플하게)
-            message = f"📰 <b>{article['title']}</b>\n\n"
-            
-            if article.get('published_time'):
-                message += f"⏰ {article['published_time']}\n"
-            
-            message += f"📍 {article['source']}\n"
-            message += f"🔗 <a href='{article['link']}'>기사 읽기</a>"
-            
-            return self.telegram_bot.send_message(message)
+            return self.telegram_bot.send_message(self.format_article_message(article))
             
         except Exception as e:
             self.logger.error(f"텔레그램 알림 전송 오류: {e}")
             return False
     
-    def monitor_news(self):
-        """뉴스 모니터링 실행"""
+    def apply_keyword_filter(self, articles):
+        """키워드 필터 적용 (받을 구독자는 article['subscribers']에 기록)"""
+        routed = []
+        for article in articles:
+            text = article['title']
+            if self.match_body and article.get('lead'):
+                text += '\n' + article['lead']
+            
+            subscribers = self.keyword_filter.route(text)
+            if subscribers:
+                article['subscribers'] = subscribers
+                routed.append(article)
+            else:
+                self.metrics.inc('articles_total', stage='keyword_filtered')
+                self.logger.info(f"키워드 필터 제외: {article['title']}")
+        return routed
+    
+    def article_priority(self, article):
+        """전송 우선순위 (속보 0, 일반 1)"""
+        if BREAKING_PATTERN.search(article['title']) or 'breaking' in article.get('source_id', ''):
+            return 0
+        return 1
+    
+    def enqueue_articles(self, new_articles):
+        """새 기사 키워드 필터, 본문 보강 후 구독 채팅별 메시지를 발신함에 기록"""
+        # 본문까지 매칭하지 않으면 보강 전에 걸러서 불필요한 수집 방지
+        if not self.match_body:
+            new_articles = self.apply_keyword_filter(new_articles)
+        
+        if self.enricher.enabled:
+            with self.metrics.stage('enrich'):
+                self.enricher.enrich(new_articles)
+        
+        # 가져온 첫 문단도 검색 색인에 추가 (search.index_body)
+        if self.config.get('search', {}).get('index_body', False) and hasattr(self.processed_articles, 'index_text'):
+            for article in new_articles:
+                self.processed_articles.index_text(article['hash'], article.get('lead'))
+        
+        if self.match_body:
+            new_articles = self.apply_keyword_filter(new_articles)
+        
+        # 한 번 수집한 기사를 구독 채팅별로 분배 (메시지는 기사당 한 번만 포맷)
+        deliveries = []
+        for article in new_articles:
+            message = self.format_article_message(article)
+            priority = self.article_priority(article)
+            for subscriber in article['subscribers']:
+                chat_id = self.subscriber_chats.get(subscriber)
+                if chat_id:
+                    deliveries.append({
+                        'key': f"{chat_id}:{article['hash']}",
+                        'chat_id': chat_id,
+                        'text': message,
+                        'priority': priority
+                    })
+        
+        if deliveries:
+            added = self.outbox.enqueue(deliveries)
+            self.metrics.inc('messages_total', added, result='enqueued')
+            self.logger.info(f"발신함에 {added}개 메시지 추가")
+    
+    def send_deliveries(self, deliveries, on_result=None):
+        """발신함 메시지 전송 (digest 채팅은 기사들을 4096자 안의 최소 개수 메시지로 묶음)
+        
+        on_result(index, success)는 원래 메시지마다 호출되므로 묶어 보낸 기사도 각각 기록됩니다.
+        """
+        messages = []  # (전송할 메시지, 포함된 원래 메시지 번호 목록)
+        digest_chats = {}
+        
+        for index, delivery in enumerate(deliveries):
+            if self.chat_modes.get(str(delivery['chat_id'])) == 'digest':
+                digest_chats.setdefault(delivery['chat_id'], []).append(index)
+            else:
+                messages.append((delivery, [index]))
+        
+        for chat_id, indices in digest_chats.items():
+            texts = [deliveries[index]['text'] for index in indices]
+            for packed in self.telegram_bot.pack_digest(texts):
+                members = [indices[i] for i in packed]
+                messages.append(({
+                    'chat_id': chat_id,
+                    'text': self.telegram_bot.format_digest([texts[i] for i in packed]),
+                    'priority': min(deliveries[index].get('priority', 1) for index in members)
+                }, members))
+        
+        if len(messages) < len(deliveries):
+            self.logger.info(f"묶음 전송: 기사 {len(deliveries)}개 → 메시지 {len(messages)}개")
+        
+        def on_message_result(message_index, success):
+            if on_result is not None:
+                for index in messages[message_index][1]:
+                    on_result(index, success)
+        
+        return self.telegram_bot.send_batch([message for message, _ in messages], on_message_result)
+    
+    def search_articles(self, query):
+        """/search 명령 답장: 저장된 기사 검색 결과"""
+        if not query:
+            return "사용법: /search 검색어"
+        if not hasattr(self.processed_articles, 'search'):
+            return "검색은 SQLite 저장소에서만 사용할 수 있습니다."
+        
+        started = time.perf_counter()
+        results = self.processed_articles.search(query, self.config.get('search', {}).get('max_results', 10))
+        self.metrics.observe('search_seconds', time.perf_counter() - started)
+        
+        escape = self.telegram_bot.escape_html
+        if not results:
+            return f"🔎 '{escape(query)}' 검색 결과가 없습니다."
+        
+        lines = [f"🔎 <b>'{escape(query)}' 검색 결과 {len(results)}건</b>", ""]
+        for i, result in enumerate(results, 1):
+            processed_at = (result['processed_at'] or '')[:16].replace('T', ' ')
+            title = escape(result['title'])
+            if result['link']:
+                title = f"<a href=\"{escape(result['link'])}\">{title}</a>"
+            lines.append(f"{i}. {title} ({processed_at})")
+        return '\n'.join(lines)
+    
+    def start_command_listener(self):
+        """봇 명령(/search) 처리 스레드 시작 (구독 채팅에서 온 명령만 처리)"""
+        listener = threading.Thread(
+            target=self.telegram_bot.poll_commands,
+            args=({'search': self.search_articles}, list(self.subscriber_chats.values())),
+            name='telegram-commands',
+            daemon=True
+        )
+        listener.start()
+        self.logger.info("텔레그램 /search 명령 처리 시작")
+    
+    def drain_outbox(self):
+        """발신함의 대기 메시지 전송 (채팅당 max_articles_per_run개까지, 나머지는 다음 실행)"""
+        # 최대 5개까지만 알림 (스팸 방지)
+        with self.metrics.stage('send'):
+            sent, failed = self.outbox.drain(
+                self.send_deliveries,
+                limit_per_chat=self.max_articles_per_run,
+                batch_size=self.outbox_batch_size,
+                chat_limits={
+                    chat_id: self.digest_max_articles
+                    for chat_id, mode in self.chat_modes.items() if mode == 'digest'
+                }
+            )
+        self.delivery_failures = failed
+        self.metrics.inc('messages_total', sent, result='sent')
+        self.metrics.inc('messages_total', failed, result='failed')
+        self.metrics.set_gauge('outbox_pending', self.outbox.pending_count())
+        
+        if sent or failed:
+            self.logger.info(f"텔레그램 알림 전송 완료: {sent}/{sent + failed}개 성공, "
+                             f"대기 {self.outbox.pending_count()}개")
+        
+        self.outbox.purge()
+    
+    def monitor_news(self, sources=None):
+        """뉴스 모니터링 실행 (sources를 주면 해당 소스만 수집)"""
+        started = time.perf_counter()
+        cycle_id = new_cycle_id()
+        self.metrics.begin_cycle()
         try:
-            self.logger.info("연합뉴스 헤드라인 모니터링 시작...")
+            self.logger.info(f"연합뉴스 헤드라인 모니터링 시작... (cycle {cycle_id})")
             
             # 연합뉴스 헤드라인 수집
-            articles = self.get_yonhap_headlines()
+            articles = self.get_yonhap_headlines(sources)
+            new_articles = []
             
             if not articles:
                 self.logger.info("수집된 기사가 없습니다.")
-                return
-            
-            # 새로운 기사 필터링
-            new_articles = self.filter_new_articles(articles)
-            
-            if not new_articles:
-                self.logger.info("새로운 기사가 없습니다.")
-                return
-            
-            self.logger.info(f"새로운 기사 {len(new_articles)}개 발견")
-            
-            # 최대 5개까지만 알림 (스팸 방지)
-            max_articles = min(len(new_articles), self.config.get('max_articles_per_run', 5))
-            successful_notifications = 0
-            
-            for article in new_articles[:max_articles]:
-                if self.send_article_notification(article):
-                    successful_notifications += 1
-                    time.sleep(2)  # 2초 간격으로 전송
+            else:
+                # 새로운 기사 필터링
+                with self.metrics.stage('dedup'):
+                    new_articles = self.filter_new_articles(articles)
+                for article in new_articles:
+                    if article.get('source_id') in self.source_results:
+                        self.source_results[article['source_id']]['new'] += 1
+                
+                if new_articles:
+                    self.logger.info(f"새로운 기사 {len(new_articles)}개 발견")
+                    try:
+                        self.enqueue_articles(new_articles)
+                    except Exception:
+                        # 발신함 기록 전에는 처리된 것으로 남기지 않음 (발신함 잠김 등)
+                        self.forget_articles(self.recorded_hashes)
+                        raise
+                    if self.headline_feed is not None:
+                        self.headline_feed.publish(new_articles)
                 else:
-                    break
-            
-            self.logger.info(f"텔레그램 알림 전송 완료: {successful_notifications}/{max_articles}개 성공")
+                    self.logger.info("새로운 기사가 없습니다.")
+                
+                # 처리된 기사 정보 저장 (발신함 기록 후, 유사·제외 기사 기록과 LRU 갱신 포함)
+                with self.metrics.stage('store'):
+                    self.record_claims()
+                    save_processed_articles(
+                        self.processed_articles,
+                        self.processed_articles_file,
+                        max_articles=self.max_stored_articles
+                    )
+                    # 검증자는 기사 저장 후에 기록 (중간에 중단되면 다음 실행에서 페이지를 다시 받음)
+                    self.save_http_validators()
+                
+                # 저장소에서 정리된 기사가 쌓이면 유사 제목 색인을 다음에 다시 구성 (상주 모드 메모리 제한)
+                if (self.near_duplicate_index is not None
+                        and len(self.near_duplicate_index) > 2 * max(len(self.processed_articles), 1000)):
+                    self.near_duplicate_index = None
             
-            # 처리된 기사 정보 저장
-            save_processed_articles(self.processed_articles)
+            # 이번 실행의 새 기사와 이전 실행에서 밀린 메시지 전송 (샤드 작업 프로세스는 상위 프로세스가 전송)
+            if not self.shard_worker:
+                self.drain_outbox()
             
             self.logger.info(f"{len(new_articles)}개 기사 처리 완료")
             
         except Exception as e:
             self.logger.error(f"뉴스 모니터링 오류: {e}")
+        finally:
+            self.record_cycle_metrics(time.perf_counter() - started)
+    
+    def record_cycle_metrics(self, elapsed):
+        """모니터링 1회 소요 시간과 저장소 크기 기록"""
+        self.metrics.observe('cycle_seconds', elapsed)
+        self.metrics.set_gauge('last_run_timestamp_seconds', round(time.time(), 3))
+        self.metrics.set_gauge('store_articles', len(self.processed_articles))
+        self.metrics.set_gauge('store_bytes', get_storage_size(self.processed_articles_file))
+        
+        stages = ', '.join(f"{name} {seconds:.2f}초" for name, seconds in self.metrics.last_cycle.items())
+        self.logger.info(f"모니터링 소요 시간 {elapsed:.2f}초 ({stages})")
+    
+    def write_metrics_summary(self):
+        """단일 실행 지표를 JSON 요약 파일로 저장 (metrics.summary_file)"""
+        summary_file = self.metrics_config.get('summary_file')
+        if not summary_file:
+            return
+        try:
+            self.metrics.write_summary(summary_file)
+        except OSError as e:
+            self.logger.error(f"지표 요약 저장 실패 ({summary_file}): {e}")
+    
+    def close(self):
+        """수집기와 처리된 기사 저장소 정리"""
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+        if self.api_server is not None:
+            self.api_server.close()
+        self.fetcher.close()
+        self.enricher.close()
+        self.outbox.close()
+        if hasattr(self.processed_articles, 'close'):
+            self.processed_articles.close()
+    
+    def iter_arrivals(self):
+        """저장된 기사의 (수집 소스 이름, 처리 시각 epoch 초) 순회"""
+        if hasattr(self.processed_articles, 'iter_arrivals'):
+            yield from self.processed_articles.iter_arrivals()
+            return
+        
+        for info in self.processed_articles.values():
+            if not isinstance(info, dict) or not info.get('source_id'):
+                continue
+            try:
+                yield info['source_id'], datetime.fromisoformat(info['processed_at']).timestamp()
+            except (KeyError, TypeError, ValueError):
+                continue
+    
+    def run_adaptive(self, adaptive_config, interval):
+        """소스별 새 기사 발생률에 맞춰 확인 주기를 조절하며 반복"""
+        scheduler = AdaptiveScheduler([source.name for source in self.sources], adaptive_config, interval)
+        scheduler.seed(self.iter_arrivals())
+        sources_by_name = {source.name: source for source in self.sources}
+        
+        while True:
+            due = scheduler.due_sources()
+            if due:
+                self.monitor_news([sources_by_name[name] for name in due])
+                for name in due:
+                    # 수집 단계 전에 실패하면 결과가 없으므로 오류로 처리
+                    result = self.source_results.get(name, {'status': 'error', 'new': 0})
+                    next_interval = scheduler.record(name, result['status'], result['new'])
+                    self.metrics.set_gauge('poll_interval_seconds', round(next_interval, 1), source=name)
+                    self.logger.info(f"[{name}] 다음 확인까지 {next_interval / 60:.1f}분 "
+                                     f"(새 기사 {result['new']}개, {result['status']})")
+            time.sleep(max(1.0, scheduler.seconds_until_next()))
+    
+    def run_daemon(self):
+        """상주 모드: 설정된 간격으로 모니터링 반복 (monitoring.adaptive.enabled면 적응형 주기)"""
+        self.start_services()
+        self.run_schedule()
+    
+    def start_services(self, api=True):
+        """상주 모드 부가 서비스 시작 (지표 엔드포인트, /search 명령, 헤드라인 API)"""
+        # Prometheus 지표 엔드포인트 (metrics.port 설정 시)
+        if self.metrics_config.get('port'):
+            self.metrics_server = MetricsServer(
+                self.metrics,
+                host=self.metrics_config.get('host', '127.0.0.1'),
+                port=self.metrics_config['port']
+            )
+            self.metrics_server.start()
+        
+        # /search 봇 명령 (search.bot_command 설정 시)
+        search_config = self.config.get('search', {})
+        if search_config.get('enabled', False) and search_config.get('bot_command', False):
+            self.start_command_listener()
+        
+        # 헤드라인 API (api.port 설정 시)
+        if api and self.api_config.get('port'):
+            self.headline_feed = HeadlineFeed(self.api_config.get('max_items', 1000))
+            # 저장된 검증자로 첫 요청이 304가 되면 현재 헤드라인 목록이 비므로 첫 수집은 전체 페이지로
+            self.fetcher.http_validators.clear()
+            self.api_server = HeadlineApiServer(
+                self.headline_feed,
+                host=self.api_config.get('host', '127.0.0.1'),
+                port=self.api_config['port']
+            )
+            self.api_server.start()
+    
+    def run_schedule(self):
+        """설정된 간격 또는 적응형 주기로 모니터링 반복"""
+        monitoring = self.config.get('monitoring', {})
+        interval = monitoring.get('interval_minutes', 30)
+        adaptive_config = monitoring.get('adaptive', {})
+        
+        if adaptive_config.get('enabled', False):
+            self.logger.info(f"상주 모드 시작 (적응형 간격: {adaptive_config.get('min_interval_minutes', 5)}~"
+                             f"{adaptive_config.get('max_interval_minutes', max(interval, 60))}분)")
+            self.run_adaptive(adaptive_config, interval)
+            return
+        
+        import schedule
+        
+        self.logger.info(f"상주 모드 시작 (간격: {interval}분)")
+        schedule.every(interval).minutes.do(self.monitor_news)
+        
+        # 시작 직후 1회 실행
+        self.monitor_news()
+        
+        while True:
+            schedule.run_pending()
+            time.sleep(1)
+
+def resolve_telegram_config(config):
+    """환경변수 이름으로 지정된 텔레그램 설정 해석"""
+    telegram = config.setdefault('telegram', {})
+    if not telegram.get('bot_token'):
+        telegram['bot_token'] = os.getenv(telegram.get('bot_token_env', 'TELEGRAM_BOT_TOKEN'))
+    if not telegram.get('chat_id'):
+        telegram['chat_id'] = os.getenv(telegram.get('chat_id_env', 'TELEGRAM_CHAT_ID'))
+    return config
+
+def print_startup_profile():
+    """시작 시 import 시간과 필요할 때 로드하는 파서의 import 시간 출력"""
+    for title, modules in (
+        ('시작 시 로드', ['yonhap_news_monitor']),
+        ('필요할 때 로드 (페이지 변경 시 파서, fallback 추출, 상주 모드)',
+         ['headline_parser', 'trafilatura', 'schedule']),
+    ):
+        total_ms, rows = profile_startup(modules)
+        print(f"\n{title}: {total_ms:.1f}ms")
+        for name, cumulative_ms, self_ms in rows:
+            print(f"  {name:40} {cumulative_ms:9.1f}ms (자체 {self_ms:.1f}ms)")
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description='연합뉴스 헤드라인 모니터')
+    parser.add_argument('--daemon', action='store_true',
+                        help='monitoring.interval_minutes 간격으로 계속 실행')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='모듈별 import 시간을 출력하고 종료')
+    parser.add_argument('--store', metavar='PATH',
+                        help='처리된 기사 저장소 경로 (storage.processed_articles_file 대신, .snap은 압축 스냅샷)')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='저장된 헤드라인 페이지(디렉터리 또는 tar 묶음)를 전송 없이 재실행')
+    parser.add_argument('--replay-report', metavar='FILE', default='replay_report.jsonl',
+                        help='재실행 알림과 요약을 기록할 JSON Lines 파일')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='재실행 파싱 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--shards', type=int, default=0,
+                        help='뉴스 소스를 나눠 수집할 작업 프로세스 수 (SQLite 저장소 필요)')
+    args = parser.parse_args()
+    
+    if args.profile_startup:
+        print_startup_profile()
+        return
+    
+    logger = logging.getLogger(__name__)
+    monitor = None
+    
     try:
-        # 로깅 설정
-        setup_logging()
-        logger = logging.getLogger(__name__)
-        
         # 설정 로드
         with open('config.json', 'r', encoding='utf-8') as f:
-            config = json.load(f)
+            config = resolve_telegram_config(json.load(f))
+        
+        # 로깅 설정 (config.json의 logging 항목)
+        setup_logging(config.get('logging'))
+        if args.store:
+            config.setdefault('storage', {})['processed_articles_file'] = args.store
+        
+        if args.replay:
+            from replay import replay
+            summary = replay(config, args.replay, args.replay_report, args.workers)
+            logger.info(f"재실행 완료: 페이지 {summary['snapshots']}개, 새 기사 {summary['new']}개, "
+                        f"알림 {summary['alerts']}개 ({summary['elapsed_seconds']}초) → {args.replay_report}")
+            return
         
         # 연합뉴스 모니터 초기화
         monitor = YonhapNewsMonitor(config)
         
-        # 텔레그램 봇 연결 테스트
-        if monitor.telegram_bot.test_connection():
-            logger.info("✅ 텔레그램 봇 연결 성공")
-            monitor.telegram_bot.send_message("📰 연합뉴스 헤드라인 모니터링을 시작합니다.")
+        if args.daemon:
+            # 텔레그램 봇 연결 테스트
+            if monitor.telegram_bot.test_connection():
+                logger.info("✅ 텔레그램 봇 연결 성공")
+                monitor.telegram_bot.send_message("📰 연합뉴스 헤드라인 모니터링을 시작합니다.")
+            else:
+                logger.error("❌ 텔레그램 봇 연결 실패")
+                return
+            
+            if args.shards > 1:
+                from sharding import ShardRunner
+                ShardRunner(monitor, args.shards).run_daemon()
+            else:
+                monitor.run_daemon()
+        elif args.shards > 1:
+            # 소스를 작업 프로세스에 나눠 수집한 뒤 이 프로세스에서 한 번에 전송
+            from sharding import ShardRunner
+            ShardRunner(monitor, args.shards).run_once()
+            monitor.write_metrics_summary()
+            if monitor.delivery_failures and not monitor.telegram_bot.test_connection():
+                logger.error("❌ 텔레그램 봇 연결 실패")
         else:
-            logger.error("❌ 텔레그램 봇 연결 실패")
-            return
-        
-        # 단일 실행 (GitHub Actions용)
-        monitor.monitor_news()
+            # 단일 실행 (GitHub Actions용): 보낼 메시지가 없으면 텔레그램에 접속하지 않음
+            monitor.monitor_news()
+            monitor.write_metrics_summary()
+            
+            # 전송이 실패했을 때만 봇 연결 상태 확인 (토큰·채팅 설정 오류 진단)
+            if monitor.delivery_failures and not monitor.telegram_bot.test_connection():
+                logger.error("❌ 텔레그램 봇 연결 실패")
         
+    except KeyboardInterrupt:
+        logger.info("모니터링 종료")
     except Exception as e:
         logger.error(f"프로그램 실행 오류: {e}")
+    finally:
+        if monitor:
+            monitor.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file